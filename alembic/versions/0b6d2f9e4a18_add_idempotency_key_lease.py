@@ -0,0 +1,28 @@
+"""Add idempotency key lease
+
+Revision ID: 0b6d2f9e4a18
+Revises: f1a8c4e2d735
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d2f9e4a18'
+down_revision: Union[str, None] = 'f1a8c4e2d735'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotencykey', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotencykey', 'locked_until')
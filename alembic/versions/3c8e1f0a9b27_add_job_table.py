@@ -0,0 +1,60 @@
+"""Add job table for background jobs
+
+Revision ID: 3c8e1f0a9b27
+Revises: a17ed24870c1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f0a9b27'
+down_revision: Union[str, None] = 'a17ed24870c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job',
+    sa.Column('id', sa.Uuid(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('job_type', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('progress_message', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('worker_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_job_type'), ['job_type'], unique=False)
+        batch_op.create_index(batch_op.f('ix_job_status'), ['status'], unique=False)
+        batch_op.create_index('ix_job_queued', ['job_type', 'created_at'], unique=False, postgresql_where=sa.text("status = 'QUEUED'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_queued', postgresql_where=sa.text("status = 'QUEUED'"))
+        batch_op.drop_index(batch_op.f('ix_job_status'))
+        batch_op.drop_index(batch_op.f('ix_job_job_type'))
+        batch_op.drop_index(batch_op.f('ix_job_id'))
+
+    op.drop_table('job')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,35 @@
+"""Add job result page table
+
+Revision ID: 5e2c8a1f7b93
+Revises: 0b6d2f9e4a18
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2c8a1f7b93'
+down_revision: Union[str, None] = '0b6d2f9e4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobresultpage',
+    sa.Column('job_id', sa.Uuid(), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('items', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id', 'page')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('jobresultpage')
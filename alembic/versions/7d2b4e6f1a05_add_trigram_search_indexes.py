@@ -0,0 +1,51 @@
+"""Add pg_trgm extension and trigram indexes for global search
+
+Revision ID: 7d2b4e6f1a05
+Revises: 3c8e1f0a9b27
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b4e6f1a05'
+down_revision: Union[str, None] = '3c8e1f0a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя индекса, таблица, колонка)
+TRGM_INDEXES = [
+    ('ix_company_name_trgm', 'company', 'name'),
+    ('ix_point_name_trgm', 'point', 'name'),
+    ('ix_point_address_trgm', 'point', 'address'),
+    ('ix_server_name_trgm', 'server', 'name'),
+    ('ix_server_address_trgm', 'server', 'address'),
+    ('ix_server_iiko_uid_trgm', 'server', 'iiko_uid'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY не блокирует запись в большие таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRGM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    # Расширение не удаляем: им могут пользоваться другие объекты БД
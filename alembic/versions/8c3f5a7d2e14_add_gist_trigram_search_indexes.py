@@ -0,0 +1,53 @@
+"""Add GiST trigram indexes for ranked search and INN search
+
+Revision ID: 8c3f5a7d2e14
+Revises: 5e2c8a1f7b93
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f5a7d2e14'
+down_revision: Union[str, None] = '5e2c8a1f7b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя индекса, таблица, колонка). GIN (7d2b4e6f1a05) быстрее отбирает совпадения ILIKE,
+# но не умеет отдавать строки по возрастанию расстояния <->; GiST умеет и то, и другое,
+# поэтому для ИНН (новые колонки поиска) достаточно только его
+GIST_TRGM_INDEXES = [
+    ('ix_company_name_trgm_gist', 'company', 'name'),
+    ('ix_company_billing_inn_trgm_gist', 'company', 'billing_inn'),
+    ('ix_company_iiko_inn_trgm_gist', 'company', 'iiko_inn'),
+    ('ix_point_name_trgm_gist', 'point', 'name'),
+    ('ix_point_address_trgm_gist', 'point', 'address'),
+    ('ix_server_name_trgm_gist', 'server', 'name'),
+    ('ix_server_address_trgm_gist', 'server', 'address'),
+    ('ix_server_iiko_uid_trgm_gist', 'server', 'iiko_uid'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в большие таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, column in GIST_TRGM_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gist',
+                postgresql_ops={column: 'gist_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(GIST_TRGM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
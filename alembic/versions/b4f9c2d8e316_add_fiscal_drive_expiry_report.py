@@ -0,0 +1,119 @@
+"""Add fiscal drive expiry index and precomputed weekly counts
+
+Revision ID: b4f9c2d8e316
+Revises: 7d2b4e6f1a05
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f9c2d8e316'
+down_revision: Union[str, None] = '7d2b4e6f1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Счетчики поддерживаются триггером в той же транзакции, что и изменение ФР.
+# Компания определяется через workstation -> point; смена point_id у рабочей станции
+# или company_id у точки через API невозможна, для ручных правок есть полный пересчет
+# (задача rebuild_fiscal_drive_expiry_counts).
+CREATE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION fiscal_drive_expiry_count_add(p_workstation_id uuid, p_expiry date, p_delta integer)
+RETURNS void AS $$
+DECLARE
+    v_company_id uuid;
+    v_week date := date_trunc('week', p_expiry)::date;
+BEGIN
+    SELECT p.company_id INTO v_company_id
+    FROM workstation w JOIN point p ON p.id = w.point_id
+    WHERE w.id = p_workstation_id;
+    IF v_company_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO fiscaldriveexpirycount (company_id, week_start, count)
+    VALUES (v_company_id, v_week, p_delta)
+    ON CONFLICT (company_id, week_start)
+    DO UPDATE SET count = fiscaldriveexpirycount.count + EXCLUDED.count;
+
+    DELETE FROM fiscaldriveexpirycount
+    WHERE company_id = v_company_id AND week_start = v_week AND count <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fiscal_drive_expiry_count_trigger()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.fiscal_drive_expiry_date IS NOT NULL THEN
+        PERFORM fiscal_drive_expiry_count_add(OLD.workstation_id, OLD.fiscal_drive_expiry_date, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.fiscal_drive_expiry_date IS NOT NULL THEN
+        PERFORM fiscal_drive_expiry_count_add(NEW.workstation_id, NEW.fiscal_drive_expiry_date, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGERS = """
+CREATE TRIGGER fiscalregistrar_expiry_count_ins_del
+AFTER INSERT OR DELETE ON fiscalregistrar
+FOR EACH ROW EXECUTE FUNCTION fiscal_drive_expiry_count_trigger();
+
+CREATE TRIGGER fiscalregistrar_expiry_count_upd
+AFTER UPDATE OF fiscal_drive_expiry_date, workstation_id ON fiscalregistrar
+FOR EACH ROW
+WHEN (OLD.fiscal_drive_expiry_date IS DISTINCT FROM NEW.fiscal_drive_expiry_date
+      OR OLD.workstation_id IS DISTINCT FROM NEW.workstation_id)
+EXECUTE FUNCTION fiscal_drive_expiry_count_trigger();
+"""
+
+INITIAL_FILL = """
+INSERT INTO fiscaldriveexpirycount (company_id, week_start, count)
+SELECT p.company_id, date_trunc('week', fr.fiscal_drive_expiry_date)::date, count(*)
+FROM fiscalregistrar fr
+JOIN workstation w ON w.id = fr.workstation_id
+JOIN point p ON p.id = w.point_id
+WHERE fr.fiscal_drive_expiry_date IS NOT NULL
+GROUP BY 1, 2;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('fiscalregistrar', schema=None) as batch_op:
+        batch_op.create_index('ix_fiscalregistrar_expiry_date_id', ['fiscal_drive_expiry_date', 'id'], unique=False)
+
+    op.create_table('fiscaldriveexpirycount',
+    sa.Column('company_id', sa.Uuid(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id', 'week_start')
+    )
+    with op.batch_alter_table('fiscaldriveexpirycount', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_fiscaldriveexpirycount_week_start'), ['week_start'], unique=False)
+
+    op.execute(CREATE_FUNCTIONS)
+    op.execute(CREATE_TRIGGERS)
+    op.execute(INITIAL_FILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS fiscalregistrar_expiry_count_upd ON fiscalregistrar')
+    op.execute('DROP TRIGGER IF EXISTS fiscalregistrar_expiry_count_ins_del ON fiscalregistrar')
+    op.execute('DROP FUNCTION IF EXISTS fiscal_drive_expiry_count_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS fiscal_drive_expiry_count_add(uuid, date, integer)')
+
+    with op.batch_alter_table('fiscaldriveexpirycount', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_fiscaldriveexpirycount_week_start'))
+    op.drop_table('fiscaldriveexpirycount')
+
+    with op.batch_alter_table('fiscalregistrar', schema=None) as batch_op:
+        batch_op.drop_index('ix_fiscalregistrar_expiry_date_id')
@@ -0,0 +1,64 @@
+"""Convert connection_details and extra_equipment to JSONB with GIN indexes
+
+Revision ID: c6a1d3e5f702
+Revises: b4f9c2d8e316
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a1d3e5f702'
+down_revision: Union[str, None] = 'b4f9c2d8e316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, колонка, имя GIN-индекса)
+JSONB_COLUMNS = [
+    ('server', 'connection_details', 'ix_server_connection_details_gin'),
+    ('workstation', 'connection_details', 'ix_workstation_connection_details_gin'),
+    ('workstation', 'extra_equipment', 'ix_workstation_extra_equipment_gin'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Смена типа переписывает таблицу под эксклюзивной блокировкой - делается в транзакции
+    for table, column, _ in JSONB_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb',
+        )
+    # jsonb_path_ops: индекс меньше и быстрее стандартного, но поддерживает только @>
+    with op.get_context().autocommit_block():
+        for table, column, name in JSONB_COLUMNS:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'jsonb_path_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, _, name in reversed(JSONB_COLUMNS):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    for table, column, _ in reversed(JSONB_COLUMNS):
+        op.alter_column(
+            table, column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json',
+        )
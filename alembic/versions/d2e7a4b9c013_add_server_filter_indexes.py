@@ -0,0 +1,43 @@
+"""Add indexes for server list filters
+
+Revision ID: d2e7a4b9c013
+Revises: c6a1d3e5f702
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e7a4b9c013'
+down_revision: Union[str, None] = 'c6a1d3e5f702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя индекса, колонки)
+SERVER_INDEXES = [
+    ('ix_server_license_type_server_type_id', ['license_type', 'server_type', 'id']),
+    ('ix_server_server_type_id', ['server_type', 'id']),
+    ('ix_server_updated_at_id', ['updated_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in SERVER_INDEXES:
+            op.create_index(
+                name, 'server', columns, unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(SERVER_INDEXES):
+            op.drop_index(name, table_name='server', postgresql_concurrently=True, if_exists=True)
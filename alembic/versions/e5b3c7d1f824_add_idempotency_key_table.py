@@ -0,0 +1,45 @@
+"""Add idempotency key table
+
+Revision ID: e5b3c7d1f824
+Revises: d2e7a4b9c013
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b3c7d1f824'
+down_revision: Union[str, None] = 'd2e7a4b9c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotencykey',
+    sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('fingerprint', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response_headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('response_body', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'key')
+    )
+    with op.batch_alter_table('idempotencykey', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_idempotencykey_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('idempotencykey', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_idempotencykey_expires_at'))
+
+    op.drop_table('idempotencykey')
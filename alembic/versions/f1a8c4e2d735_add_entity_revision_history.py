@@ -0,0 +1,69 @@
+"""Add entity revision history
+
+Revision ID: f1a8c4e2d735
+Revises: e5b3c7d1f824
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a8c4e2d735'
+down_revision: Union[str, None] = 'e5b3c7d1f824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Таблицы сущностей, для которых ведется история (app/db/history.py)
+TRACKED_TABLES = ('company', 'point', 'server', 'workstation', 'fiscalregistrar')
+
+# Enum-колонки хранятся в БД по имени, а в истории - по значению (как в API)
+ENUM_VALUES = {
+    'server': {
+        'server_type': {'RMS': 'RMS', 'CHAIN': 'Chain'},
+        'license_type': {'LIFETIME': 'Lifetime', 'CLOUD': 'Cloud'},
+    },
+}
+
+
+def _snapshot_sql(table: str) -> str:
+    """Начальный снимок существующих записей: все колонки, кроме ключа истории и updated_at."""
+    snapshot = "to_jsonb(t) - 'id' - 'revision' - 'updated_at'"
+    enum_columns = ENUM_VALUES.get(table, {})
+    if enum_columns:
+        pairs = []
+        for column, values in enum_columns.items():
+            cases = " ".join(f"WHEN '{name}' THEN '{value}'" for name, value in values.items())
+            pairs.append(f"'{column}', CASE t.{column}::text {cases} END")
+        snapshot = f"({snapshot}) || jsonb_build_object({', '.join(pairs)})"
+    return (
+        "INSERT INTO entityrevision (entity, entity_id, revision, op, snapshot, changed_at) "
+        f"SELECT '{table}', t.id, t.revision, 'snapshot', {snapshot}, t.updated_at FROM {table} t"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('entityrevision',
+    sa.Column('entity', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('entity_id', sa.Uuid(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('op', sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+    sa.Column('changes', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('entity', 'entity_id', 'revision')
+    )
+    # Без начального снимка as_of для уже существующих записей восстанавливать не из чего
+    for table in TRACKED_TABLES:
+        op.execute(_snapshot_sql(table))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('entityrevision')
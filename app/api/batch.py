@@ -0,0 +1,43 @@
+# app/api/batch.py
+# Общая реализация POST /<entity>/batch-get: получить до BATCH_GET_MAX_IDS записей
+# одним запросом вместо серии GET /<entity>/{id} (например, после дельта-синхронизации).
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.codecs import render
+from app.api.fields import pick_fields
+from app.core.config import settings
+from app.crud.base import CRUDBase
+from app.schemas.batch import BatchGetRequest, BatchGetResult
+
+
+async def batch_get(
+    request: Request,
+    db: AsyncSession,
+    crud_obj: CRUDBase[Any, Any, Any],
+    read_schema: Any,
+    batch_in: BatchGetRequest,
+    fields: Optional[List[str]] = None,
+) -> Any:
+    """
+    Найденные записи в порядке запроса и список отсутствующих ID; поддерживает ?fields=
+    и бинарные форматы ответа (app/api/codecs.py).
+    """
+    if len(batch_in.ids) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Too many ids: {len(batch_in.ids)} (max {settings.BATCH_GET_MAX_IDS})",
+        )
+    items, missing = await crud_obj.get_many(db, batch_in.ids, fields=fields)
+    if fields is None:
+        return render(request, {"items": items, "missing": missing}, BatchGetResult[read_schema])
+    # Урезанные объекты не проходят response_model - сериализуем сами
+    content = {"items": [pick_fields(obj, fields) for obj in items], "missing": missing}
+    rendered = render(request, content)
+    if rendered is not content:
+        return rendered
+    return JSONResponse(content=jsonable_encoder(content))
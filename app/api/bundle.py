@@ -0,0 +1,66 @@
+# app/api/bundle.py
+# GET /servers/by-uid/{iiko_uid}/bundle: пакет синхронизации сервера из кеша
+# сериализованных ответов (app/crud/bundle_cache.py) с ETag / If-None-Match.
+# Формат ответа - по Accept (app/api/codecs.py).
+import hashlib
+from typing import Any, Dict
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api.codecs import CODECS, JSON, accepted_codec
+from app.core.metrics import registry
+from app.crud.bundle_cache import CachedBundle, bundle_cache
+from app.crud.crud_server import bundle_stamp
+
+BUNDLE_REQUESTS = registry.counter(
+    "server_bundle_requests_total", "Server bundle requests, by cache outcome (hit/miss/stale)",
+)
+
+
+def _serialize(bundle: Dict[str, Any]) -> CachedBundle:
+    model = schemas.ServerBundle.model_validate(bundle)
+    body = model.model_dump_json().encode()
+    bodies = {JSON: body}
+    if CODECS:
+        payload = model.model_dump()
+        bodies.update({media_type: codec.encode(payload) for media_type, codec in CODECS.items()})
+    objects = [bundle["server"], *bundle["points"], *bundle["workstations"], *bundle["fiscal_registrars"]]
+    # Метка версии - максимальная ревизия, хеш тела различает удаления и переносы записей
+    etag = f'"{bundle["revision"]}-{hashlib.sha1(body).hexdigest()[:16]}"'
+    return CachedBundle(
+        bodies=bodies, etag=etag, revision=bundle["revision"],
+        members=frozenset(obj.id for obj in objects), stamp=bundle_stamp(objects),
+    )
+
+
+async def server_bundle(request: Request, db: AsyncSession, iiko_uid: str) -> Response:
+    cached = bundle_cache.get(iiko_uid)
+    outcome = "miss"
+    # Записи могли изменить в другом процессе - сверяем отпечаток с БД (один запрос по индексам)
+    if cached is not None and await crud.server.get_bundle_stamp(db, iiko_uid=iiko_uid) != cached.stamp:
+        bundle_cache.discard(iiko_uid)
+        cached, outcome = None, "stale"
+    if cached is None:
+        BUNDLE_REQUESTS.inc(outcome=outcome)
+        version = bundle_cache.begin_build()
+        try:
+            bundle = await crud.server.get_bundle(db, iiko_uid=iiko_uid)
+            if bundle is None:
+                raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Server not found")
+            cached = _serialize(bundle)
+            bundle_cache.put(iiko_uid, version, cached)
+        finally:
+            bundle_cache.end_build(version)
+    else:
+        BUNDLE_REQUESTS.inc(outcome="hit")
+
+    codec = accepted_codec(request)
+    media_type = codec.media_type if codec is not None else JSON
+    # У каждого представления свой ETag
+    etag = cached.etag if codec is None else f'{cached.etag[:-1]}-{media_type.split("/")[1]}"'
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.bodies[media_type], media_type=media_type, headers=headers)
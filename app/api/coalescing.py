@@ -0,0 +1,113 @@
+# app/api/coalescing.py
+# Объединение одинаковых одновременных GET-запросов (single-flight).
+# Первый запрос ("лидер") выполняет обработчик: открывает сессию, делает запрос в БД
+# и сериализует ответ. Одинаковые запросы, пришедшие пока лидер работает, не идут
+# в БД, а получают копию готового тела ответа.
+#
+# Включается для конкретного эндпоинта декоратором @coalesce, роутер должен
+# использовать route_class=CoalescingRoute:
+#
+#     router = APIRouter(route_class=CoalescingRoute)
+#
+#     @router.get("/{server_id}", ...)
+#     @coalesce
+#     async def read_server(...): ...
+#
+# Ответ не зависит от клиента, поэтому объединяются запросы разных клиентов (у каждого
+# агента свой токен). Токен каждого запроса проверяется до объединения; запросы без
+# валидного токена выполняются обработчиком отдельно и получают свой 401.
+import asyncio
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request, Response
+from app.api.codecs import BinaryRoute
+from app.core.metrics import registry
+from app.core.security import bearer_subject
+
+COALESCE_LEADERS = registry.counter("coalesce_leaders_total", "Coalescable requests executed by the handler, by route")
+COALESCE_FOLLOWERS = registry.counter("coalesce_followers_total", "Requests served from another in-flight request, by route")
+
+# Снимок ответа лидера: статус, тело и заголовки
+_Snapshot = Tuple[int, bytes, List[Tuple[bytes, bytes]]]
+
+
+class _NotShared(Exception):
+    """Ответ лидера нельзя разделить (лидер отменен или ответ потоковый)."""
+
+
+def coalesce(endpoint: Callable) -> Callable:
+    """Пометить эндпоинт как допускающий объединение одинаковых запросов."""
+    endpoint.__coalesce__ = True
+    return endpoint
+
+
+def _request_key(request: Request) -> Tuple[Any, ...]:
+    # Токена в ключе нет: каждый запрос проверяет свой токен сам (см. coalescing_handler)
+    query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    return (
+        request.url.path,
+        query,
+        request.headers.get("accept"),
+    )
+
+
+def _retrieve_exception(fut: asyncio.Future) -> None:
+    # Исключение лидера могут не забрать (нет ожидающих) - не пишем предупреждение в лог
+    if not fut.cancelled():
+        fut.exception()
+
+
+class CoalescingRoute(BinaryRoute):
+    # Наследует BinaryRoute: POST этих роутеров принимают тела в msgpack/CBOR
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if not getattr(self.endpoint, "__coalesce__", False):
+            return handler
+
+        route_name = self.path_format
+        in_flight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+
+        async def coalescing_handler(request: Request) -> Response:
+            if request.method != "GET" or bearer_subject(request.headers.get("authorization")) is None:
+                return await handler(request)
+
+            key = _request_key(request)
+            leader = in_flight.get(key)
+            if leader is not None:
+                try:
+                    status_code, body, raw_headers = await asyncio.shield(leader)
+                except _NotShared:
+                    return await handler(request)
+                except Exception:
+                    COALESCE_FOLLOWERS.inc(route=route_name)
+                    raise
+                COALESCE_FOLLOWERS.inc(route=route_name)
+                response = Response(content=body, status_code=status_code)
+                response.raw_headers = list(raw_headers)
+                return response
+
+            fut: asyncio.Future = asyncio.get_running_loop().create_future()
+            fut.add_done_callback(_retrieve_exception)
+            in_flight[key] = fut
+            COALESCE_LEADERS.inc(route=route_name)
+            try:
+                response = await handler(request)
+            except asyncio.CancelledError:
+                fut.set_exception(_NotShared())
+                raise
+            except BaseException as e:
+                # Ошибка (например, 404) одинакова для всех ожидающих
+                fut.set_exception(e)
+                raise
+            finally:
+                in_flight.pop(key, None)
+
+            body = getattr(response, "body", None)
+            if body is None:
+                fut.set_exception(_NotShared())
+            else:
+                fut.set_result((response.status_code, bytes(body), list(response.raw_headers)))
+            return response
+
+        return coalescing_handler
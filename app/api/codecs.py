@@ -0,0 +1,193 @@
+# app/api/codecs.py
+# Бинарные форматы MessagePack и CBOR для массовых эндпоинтов (sync, batch, экспорт).
+#
+# Ответ выбирается по заголовку Accept (application/msgpack, application/cbor),
+# тело запроса - по Content-Type. В бинарных форматах:
+#   - UUID - 16 байт,
+#   - datetime - целое число миллисекунд с начала эпохи (UTC),
+#   - date - строка ISO, Enum - значение.
+# На входе такие значения понимает валидация pydantic (16 байт -> UUID, число -> datetime).
+#
+# Библиотеки необязательные (pip install msgpack cbor2): без них формат не предлагается,
+# ответ отдается в JSON, а тело запроса в этом формате отклоняется с 415.
+import enum
+import importlib
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+JSON = "application/json"
+# Распространенные альтернативные названия тех же форматов
+ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+@dataclass(frozen=True)
+class Codec:
+    media_type: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _epoch_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc) # Наивные datetime в приложении - UTC
+    return int(value.timestamp() * 1000)
+
+
+def _binary_default(value: Any) -> Any:
+    """Значения, которых нет в модели данных msgpack/CBOR."""
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    if isinstance(value, datetime):
+        return _epoch_ms(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _to_primitives(value: Any) -> Any:
+    # cbor2 кодирует UUID и datetime собственными тегами раньше, чем вызывает default,
+    # поэтому для CBOR значения приводятся заранее
+    if isinstance(value, dict):
+        return {k: _to_primitives(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_primitives(v) for v in value]
+    if isinstance(value, (str, int, float, bool, bytes)) or value is None:
+        return value
+    return _binary_default(value)
+
+
+def _optional_module(name: str) -> Optional[Any]:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _load_codecs() -> Dict[str, Codec]:
+    codecs = {}
+    msgpack = _optional_module("msgpack")
+    if msgpack is not None:
+        codecs[MSGPACK] = Codec(
+            MSGPACK,
+            encode=lambda data: msgpack.packb(data, default=_binary_default),
+            decode=lambda body: msgpack.unpackb(body, raw=False),
+        )
+    cbor2 = _optional_module("cbor2")
+    if cbor2 is not None:
+        codecs[CBOR] = Codec(
+            CBOR,
+            encode=lambda data: cbor2.dumps(_to_primitives(data)),
+            decode=cbor2.loads,
+        )
+    return codecs
+
+
+CODECS = _load_codecs()
+BINARY_TYPES = {MSGPACK, CBOR}
+
+
+def _media_type(value: str) -> str:
+    media = value.split(";", 1)[0].strip().lower()
+    return ALIASES.get(media, media)
+
+
+def accepted_codec(request: Request) -> Optional[Codec]:
+    """
+    Бинарный формат, предпочтенный клиентом в Accept (с учетом q), или None - JSON.
+    При равных q выигрывает указанный раньше.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return None
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media = _media_type(part)
+        if media not in CODECS and media not in (JSON, "application/*", "*/*"):
+            continue
+        q = 1.0
+        for param in part.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = CODECS.get(media), q
+    return best
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def render(request: Request, content: Any, schema: Any = None, status_code: int = status.HTTP_200_OK) -> Any:
+    """
+    Ответ в формате из Accept. Для JSON возвращает content как есть (дальше работает
+    response_model эндпоинта). Для бинарных форматов content проходит через schema
+    (как response_model) и кодируется без промежуточного JSON; schema=None - content
+    уже состоит из простых значений (например, урезанный ?fields= ответ).
+    """
+    codec = accepted_codec(request)
+    if codec is None:
+        return content
+    if schema is not None:
+        adapter = _adapter(schema)
+        content = adapter.dump_python(adapter.validate_python(content, from_attributes=True))
+    return Response(
+        content=codec.encode(content),
+        status_code=status_code,
+        media_type=codec.media_type,
+        headers={"Vary": "Accept"},
+    )
+
+
+class _DecodedRequest(Request):
+    """Запрос с бинарным телом, которое FastAPI читает как уже разобранный JSON."""
+    def __init__(self, request: Request, codec: Codec):
+        headers = [(k, v) for k, v in request.scope["headers"] if k != b"content-type"]
+        headers.append((b"content-type", JSON.encode()))
+        super().__init__({**request.scope, "headers": headers}, request.receive)
+        self._codec = codec
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = self._codec.decode(await self.body())
+        return self._json
+
+
+class BinaryRoute(APIRoute):
+    """
+    Маршрут, принимающий тело запроса в msgpack/CBOR (Content-Type) наравне с JSON:
+
+        router = APIRouter(route_class=BinaryRoute)
+    """
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type")
+            media = _media_type(content_type) if content_type else None
+            if media in BINARY_TYPES:
+                codec = CODECS.get(media)
+                if codec is None:
+                    raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=f"{media} is not supported")
+                request = _DecodedRequest(request, codec)
+            return await handler(request)
+
+        return route_handler
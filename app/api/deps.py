@@ -6,6 +6,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.profiling import is_profiling_admin
 from app.core.security import decode_token
 from app.schemas.token import TokenPayload
 from app.db.session import get_async_session # Импортируем зависимость сессии БД
@@ -52,4 +53,9 @@ async def ensure_token_is_valid(token_payload: TokenPayload = Depends(verify_tok
     Использует verify_token, но ничего не возвращает явно.
     Удобно использовать в Depends([...]), когда payload не нужен.
     """
-    pass # Если verify_token не выбросил исключение, значит токен валиден
\ No newline at end of file
+    pass # Если verify_token не выбросил исключение, значит токен валиден
+
+async def ensure_profiling_admin(token_payload: TokenPayload = Depends(verify_token)):
+    """Доступ к отчетам профилирования (app/core/profiling.py) - только для PROFILING_ADMINS."""
+    if not is_profiling_admin(token_payload.sub):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
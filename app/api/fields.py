@@ -0,0 +1,76 @@
+# app/api/fields.py
+# Выборка полей (?fields=id,revision,name) для GET-эндпоинтов сущностей.
+#
+# Запрошенные поля проверяются по схеме чтения (допустимы только поля схемы,
+# которые являются колонками таблицы), в SELECT попадают только они (load_only),
+# а ответ содержит только их. id возвращается всегда.
+#
+#     @router.get("/", response_model=List[schemas.ServerRead], ...)
+#     async def read_servers(..., fields: Optional[List[str]] = Depends(fields_param(schemas.ServerRead, Server))):
+#         servers = await crud.server.get_multi(db, fields=fields)
+#         return prune(servers, fields, response)
+#
+# При выборке полей ответ отдается как JSONResponse в обход response_model:
+# урезанный объект по определению не проходит валидацию полной схемой.
+from typing import Any, Callable, List, Optional, Sequence, Type
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlmodel import SQLModel
+
+ALWAYS_INCLUDED = ("id",)
+
+
+def selectable_fields(read_schema: Type[BaseModel], model: Type[SQLModel]) -> List[str]:
+    """Поля схемы чтения, которые можно запросить: есть в схеме и являются колонками модели."""
+    columns = set(model.__table__.columns.keys())
+    return [name for name in read_schema.model_fields if name in columns]
+
+
+def fields_param(read_schema: Type[BaseModel], model: Type[SQLModel]) -> Callable[..., Optional[List[str]]]:
+    """Зависимость FastAPI: разобрать и проверить параметр ?fields=."""
+    allowed = selectable_fields(read_schema, model)
+    allowed_set = set(allowed)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated fields to return (id is always included). Allowed: {', '.join(allowed)}",
+        ),
+    ) -> Optional[List[str]]:
+        if not fields:
+            return None
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in allowed_set]
+        if unknown:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+            )
+        selected = list(ALWAYS_INCLUDED)
+        selected.extend(name for name in requested if name not in selected)
+        return selected
+
+    return dependency
+
+
+def pick_fields(obj: Any, fields: Sequence[str]) -> dict:
+    return {name: getattr(obj, name) for name in fields}
+
+
+def prune(data: Any, fields: Optional[Sequence[str]], response: Optional[Response] = None) -> Any:
+    """
+    Оставить в ответе только выбранные поля. Без выборки возвращает data как есть
+    (дальше работает response_model). Заголовки, выставленные через параметр
+    response эндпоинта (например, X-Total-Count), переносятся в ответ.
+    """
+    if fields is None:
+        return data
+    if isinstance(data, (list, tuple)):
+        content = [pick_fields(obj, fields) for obj in data]
+    else:
+        content = pick_fields(data, fields)
+    headers = dict(response.headers) if response is not None else None
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
@@ -0,0 +1,52 @@
+# app/api/history.py
+# Общая реализация истории изменений для эндпоинтов сущностей:
+# GET /<entity>/{id}/history и GET /<entity>/{id}?as_of=<время>.
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.crud.base import CRUDBase
+
+AsOfQuery = Query(None, description="Return the entity as it was at this time (from the revision history)")
+
+
+async def read_history(
+    db: AsyncSession, crud_obj: CRUDBase[Any, Any, Any], id: uuid.UUID, skip: int, limit: int
+) -> List[Dict[str, Any]]:
+    """Ревизии сущности от новой к старой. 404 - нет ни сущности, ни истории."""
+    revisions = await crud.history.get_history(
+        db, entity=crud_obj.model.__tablename__, entity_id=id, skip=skip, limit=limit
+    )
+    if not revisions and skip == 0 and await crud_obj.get(db, id=id, fields=["id"]) is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Entity not found")
+    return [
+        {
+            "revision": r.revision,
+            "op": r.op,
+            "changed_at": r.changed_at,
+            "changes": r.changes if r.changes is not None else (r.snapshot or {}),
+        }
+        for r in revisions
+    ]
+
+
+async def read_as_of(
+    db: AsyncSession,
+    crud_obj: CRUDBase[Any, Any, Any],
+    id: uuid.UUID,
+    as_of: datetime,
+    fields: Optional[List[str]] = None,
+) -> Any:
+    """Состояние сущности на момент as_of; поддерживает ?fields=."""
+    state = await crud.history.get_as_of(db, entity=crud_obj.model.__tablename__, entity_id=id, as_of=as_of)
+    if state is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Entity did not exist at this time")
+    if fields is None:
+        return state
+    return JSONResponse(content=jsonable_encoder({name: state.get(name) for name in fields}))
@@ -0,0 +1,42 @@
+# app/api/pagination.py
+# Общее число записей для постраничных списков: заголовок X-Total-Count.
+# Клиент выбирает режим параметром ?total=exact|estimated|cached (см. CountMode);
+# без параметра количество не считается вовсе.
+from typing import Any, Optional
+
+from fastapi import Query, Response
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.schemas.pagination import CountMode
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_MODE_HEADER = "X-Total-Count-Mode"
+
+# Параметр запроса для списковых эндпоинтов
+TotalQuery = Query(
+    None,
+    description="Add X-Total-Count header: exact (count(*)), estimated (planner estimate) "
+                "or cached (exact, cached until the table changes)",
+)
+
+
+async def set_total_count(
+    response: Response,
+    db: AsyncSession,
+    crud_obj: CRUDBase[Any, Any, Any],
+    mode: Optional[CountMode],
+    statement: Optional[Select] = None,
+) -> None:
+    """Посчитать количество строк запроса statement выбранным способом и записать в заголовки."""
+    if mode is None:
+        return
+    if mode == CountMode.EXACT:
+        total = await crud_obj.get_count(db, statement)
+    elif mode == CountMode.ESTIMATED:
+        total = await crud_obj.get_count_estimate(db, statement)
+    else:
+        total = await crud_obj.get_count_cached(db, statement)
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_COUNT_MODE_HEADER] = mode.value
@@ -2,7 +2,7 @@
 from fastapi import APIRouter
 
 # Импортируем все роутеры эндпоинтов
-from .endpoints import auth, companies, points, servers, workstations, fiscal_registrars
+from .endpoints import auth, companies, points, servers, workstations, fiscal_registrars, jobs, search, resolve, reports, batch, sync, profiles
 
 api_router = APIRouter()
 
@@ -12,4 +12,11 @@ api_router.include_router(companies.router, prefix="/companies", tags=["Companie
 api_router.include_router(points.router, prefix="/points", tags=["Points"])
 api_router.include_router(servers.router, prefix="/servers", tags=["Servers"])
 api_router.include_router(workstations.router, prefix="/workstations", tags=["Workstations"])
-api_router.include_router(fiscal_registrars.router, prefix="/fiscal-registrars", tags=["Fiscal Registrars"])
\ No newline at end of file
+api_router.include_router(fiscal_registrars.router, prefix="/fiscal-registrars", tags=["Fiscal Registrars"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(resolve.router, prefix="/resolve", tags=["Search"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["Profiling"])
\ No newline at end of file
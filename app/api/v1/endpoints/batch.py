@@ -0,0 +1,34 @@
+# app/api/v1/endpoints/batch.py
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+from app.api.codecs import BinaryRoute, render
+from app.core.config import settings
+from app.crud.crud_batch import BatchOperationError
+
+# Ответы и тела запросов - JSON, msgpack или CBOR (app/api/codecs.py)
+router = APIRouter(route_class=BinaryRoute)
+
+@router.post("/", response_model=schemas.BatchResponse, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def execute_batch(*, request: Request, db: AsyncSession = Depends(deps.get_db), batch_in: schemas.BatchRequest) -> Any:
+    """
+    Выполнить упорядоченный список create/update/delete в одной транзакции.
+    На созданные в пакете объекты можно ссылаться через "$<ref>" (в id и полях *_id).
+    При ошибке любой операции не применяется ничего; detail.index - номер операции.
+    """
+    if not batch_in.operations:
+        return {"results": []}
+    if len(batch_in.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Too many operations: {len(batch_in.operations)} (max {settings.BATCH_MAX_OPERATIONS})",
+        )
+    try:
+        results = await crud.batch.execute(db, batch_in.operations)
+    except BatchOperationError as e:
+        raise HTTPException(e.status_code, detail={"index": e.index, "message": e.message})
+    return render(request, {"results": results}, schemas.BatchResponse)
@@ -1,15 +1,26 @@
 # app/api/v1/endpoints/companies.py
 import uuid
-from typing import List, Any
+from datetime import datetime
+from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.api import deps # Импортируем зависимости (сессия БД, проверка токена)
+from app.api.batch import batch_get
+from app.api.codecs import BinaryRoute
+from app.api.fields import fields_param, prune
+from app.api.history import AsOfQuery, read_as_of, read_history
+from app.api.pagination import TotalQuery, set_total_count
+from app.schemas.pagination import CountMode
 
-router = APIRouter()
+# BinaryRoute: тела запросов в msgpack/CBOR (POST /batch-get)
+router = APIRouter(route_class=BinaryRoute)
+
+# ?fields= для GET: только перечисленные поля в SELECT и в ответе
+CompanyFields = Depends(fields_param(schemas.CompanyRead, crud.company.model))
 
 @router.post(
     "/",
@@ -49,18 +60,35 @@ async def create_company(
     dependencies=[Depends(deps.ensure_token_is_valid)] # Требуем валидный токен
 )
 async def read_companies(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(100, ge=1, le=200, description="Maximum number of records to return"),
     # Можно добавить параметры для фильтрации/поиска
+    total: Optional[CountMode] = TotalQuery,
+    fields: Optional[List[str]] = CompanyFields,
 ) -> Any:
     """
     Получить список компаний с пагинацией. Требуется аутентификация.
     """
-    companies = await crud.company.get_multi(db, skip=skip, limit=limit)
-    # Можно добавить подсчет общего количества для заголовков пагинации, если нужно
-    # total_count = await crud.company.get_count(db)
-    return companies
+    companies = await crud.company.get_multi(db, skip=skip, limit=limit, fields=fields)
+    await set_total_count(response, db, crud.company, total)
+    return prune(companies, fields, response)
+
+@router.post(
+    "/batch-get",
+    response_model=schemas.BatchGetResult[schemas.CompanyRead],
+    dependencies=[Depends(deps.ensure_token_is_valid)] # Требуем валидный токен
+)
+async def batch_get_companies(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    batch_in: schemas.BatchGetRequest,
+    fields: Optional[List[str]] = CompanyFields,
+) -> Any:
+    """Получить несколько компаний по списку ID одним запросом (порядок запроса сохраняется)."""
+    return await batch_get(request, db, crud.company, schemas.CompanyRead, batch_in, fields)
 
 @router.get(
     "/{company_id}",
@@ -71,17 +99,39 @@ async def read_company(
     *,
     db: AsyncSession = Depends(deps.get_db),
     company_id: uuid.UUID,
+    as_of: Optional[datetime] = AsOfQuery,
+    fields: Optional[List[str]] = CompanyFields,
 ) -> Any:
     """
     Получить компанию по ID. Требуется аутентификация.
+    С as_of - состояние компании на этот момент из истории изменений.
     """
-    company = await crud.company.get(db=db, id=company_id)
+    if as_of is not None:
+        return await read_as_of(db, crud.company, company_id, as_of, fields)
+    company = await crud.company.get(db=db, id=company_id, fields=fields)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company not found",
         )
-    return company
+    return prune(company, fields)
+
+@router.get(
+    "/{company_id}/history",
+    response_model=List[schemas.EntityRevisionRead],
+    dependencies=[Depends(deps.ensure_token_is_valid)] # Требуем валидный токен
+)
+async def read_company_history(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    company_id: uuid.UUID,
+    skip: int = Query(0, ge=0, description="Number of revisions to skip"),
+    limit: int = Query(100, ge=1, le=200, description="Maximum number of revisions to return"),
+) -> Any:
+    """
+    История изменений компании (от новых ревизий к старым). Требуется аутентификация.
+    """
+    return await read_history(db, crud.company, company_id, skip, limit)
 
 @router.put(
     "/{company_id}",
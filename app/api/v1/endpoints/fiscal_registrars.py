@@ -1,14 +1,25 @@
 # app/api/v1/endpoints/fiscal_registrars.py
 import uuid
+from datetime import datetime
 from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.api import deps
+from app.api.batch import batch_get
+from app.api.codecs import BinaryRoute
+from app.api.fields import fields_param, prune
+from app.api.history import AsOfQuery, read_as_of, read_history
+from app.api.pagination import TotalQuery, set_total_count
+from app.schemas.pagination import CountMode
 
-router = APIRouter()
+# BinaryRoute: тела запросов в msgpack/CBOR (POST /batch-get)
+router = APIRouter(route_class=BinaryRoute)
+
+# ?fields= для GET: только перечисленные поля в SELECT и в ответе
+FiscalRegistrarFields = Depends(fields_param(schemas.FiscalRegistrarRead, crud.fiscal_registrar.model))
 
 @router.post("/", response_model=schemas.FiscalRegistrarRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def create_fiscal_registrar(*, db: AsyncSession = Depends(deps.get_db), fr_in: schemas.FiscalRegistrarCreate) -> Any:
@@ -28,25 +39,41 @@ async def create_fiscal_registrar(*, db: AsyncSession = Depends(deps.get_db), fr
 
 @router.get("/", response_model=List[schemas.FiscalRegistrarRead], dependencies=[Depends(deps.ensure_token_is_valid)])
 async def read_fiscal_registrars(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     workstation_id: Optional[uuid.UUID] = Query(None, description="Filter by workstation ID"),
+    total: Optional[CountMode] = TotalQuery,
+    fields: Optional[List[str]] = FiscalRegistrarFields,
 ) -> Any:
     """Получить список ФР (опционально фильтр по рабочей станции)."""
     if workstation_id:
-        frs = await crud.fiscal_registrar.get_multi_by_workstation(db, workstation_id=workstation_id, skip=skip, limit=limit)
+        frs = await crud.fiscal_registrar.get_multi_by_workstation(db, workstation_id=workstation_id, skip=skip, limit=limit, fields=fields)
     else:
-        frs = await crud.fiscal_registrar.get_multi(db, skip=skip, limit=limit)
-    return frs
+        frs = await crud.fiscal_registrar.get_multi(db, skip=skip, limit=limit, fields=fields)
+    await set_total_count(response, db, crud.fiscal_registrar, total, crud.fiscal_registrar.filtered_statement(workstation_id=workstation_id))
+    return prune(frs, fields, response)
+
+@router.post("/batch-get", response_model=schemas.BatchGetResult[schemas.FiscalRegistrarRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def batch_get_fiscal_registrars(*, request: Request, db: AsyncSession = Depends(deps.get_db), batch_in: schemas.BatchGetRequest, fields: Optional[List[str]] = FiscalRegistrarFields) -> Any:
+    """Получить несколько ФР по списку ID одним запросом (порядок запроса сохраняется)."""
+    return await batch_get(request, db, crud.fiscal_registrar, schemas.FiscalRegistrarRead, batch_in, fields)
 
 @router.get("/{fr_id}", response_model=schemas.FiscalRegistrarRead, dependencies=[Depends(deps.ensure_token_is_valid)])
-async def read_fiscal_registrar(*, db: AsyncSession = Depends(deps.get_db), fr_id: uuid.UUID) -> Any:
-    """Получить ФР по ID."""
-    fr = await crud.fiscal_registrar.get(db=db, id=fr_id)
+async def read_fiscal_registrar(*, db: AsyncSession = Depends(deps.get_db), fr_id: uuid.UUID, as_of: Optional[datetime] = AsOfQuery, fields: Optional[List[str]] = FiscalRegistrarFields) -> Any:
+    """Получить ФР по ID (с as_of - состояние на этот момент из истории изменений)."""
+    if as_of is not None:
+        return await read_as_of(db, crud.fiscal_registrar, fr_id, as_of, fields)
+    fr = await crud.fiscal_registrar.get(db=db, id=fr_id, fields=fields)
     if not fr:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Fiscal registrar not found")
-    return fr
+    return prune(fr, fields)
+
+@router.get("/{fr_id}/history", response_model=List[schemas.EntityRevisionRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_fiscal_registrar_history(*, db: AsyncSession = Depends(deps.get_db), fr_id: uuid.UUID, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=200)) -> Any:
+    """История изменений ФР (от новых ревизий к старым)."""
+    return await read_history(db, crud.fiscal_registrar, fr_id, skip, limit)
 
 @router.put("/{fr_id}", response_model=schemas.FiscalRegistrarRead, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def update_fiscal_registrar(*, db: AsyncSession = Depends(deps.get_db), fr_id: uuid.UUID, fr_in: schemas.FiscalRegistrarUpdate) -> Any:
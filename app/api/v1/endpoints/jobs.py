@@ -0,0 +1,50 @@
+# app/api/v1/endpoints/jobs.py
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+from app.api.codecs import render
+from app.jobs import registered_job_types
+from app.jobs.handlers import EXPORTABLE
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.JobRead, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def create_job(*, request: Request, db: AsyncSession = Depends(deps.get_db), job_in: schemas.JobCreate) -> Any:
+    """Поставить фоновую задачу в очередь. Статус - через GET /jobs/{job_id}."""
+    if job_in.job_type not in registered_job_types():
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=f"Unknown job type '{job_in.job_type}'")
+    job = await crud.job.create(db=db, obj_in=job_in)
+    # Если обработчик работает в этом же процессе - не ждем следующего тика опроса
+    runner = getattr(request.app.state, "job_runner", None)
+    if runner:
+        runner.wakeup()
+    return job
+
+@router.get("/{job_id}", response_model=schemas.JobRead, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_job(*, request: Request, db: AsyncSession = Depends(deps.get_db), job_id: uuid.UUID) -> Any:
+    """Получить статус и прогресс задачи по ID (msgpack/CBOR - по Accept)."""
+    job = await crud.job.get(db=db, id=job_id)
+    if not job:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return render(request, job, schemas.JobRead)
+
+@router.get("/{job_id}/result/{page}", response_model=schemas.JobResultPageRead, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_job_result_page(
+    *, request: Request, db: AsyncSession = Depends(deps.get_db), job_id: uuid.UUID, page: int
+) -> Any:
+    """Страница результата задачи (экспорт: result.pages страниц с нуля, msgpack/CBOR - по Accept)."""
+    result_page = await crud.job.get_result_page(db, job_id=job_id, page=page)
+    if not result_page:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Job result page not found")
+    # Записи экспорта хранятся в JSONB как JSON-значения; для бинарных форматов они
+    # снова проходят схему чтения сущности, чтобы UUID и даты ушли типизированными
+    job = await crud.job.get(db=db, id=job_id)
+    entity = (job.params or {}).get("entity") if job and job.job_type == "export" else None
+    if entity in EXPORTABLE:
+        return render(request, result_page, schemas.JobResultPageTyped[EXPORTABLE[entity][1]])
+    return render(request, result_page, schemas.JobResultPageRead)
@@ -1,14 +1,25 @@
 # app/api/v1/endpoints/points.py
 import uuid
+from datetime import datetime
 from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas # Используем schemas
 from app.api import deps
+from app.api.batch import batch_get
+from app.api.fields import fields_param, prune
+from app.api.history import AsOfQuery, read_as_of, read_history
+from app.api.pagination import TotalQuery, set_total_count
+from app.schemas.pagination import CountMode
+from app.api.coalescing import CoalescingRoute, coalesce
 
-router = APIRouter()
+# CoalescingRoute: одинаковые одновременные GET к эндпоинтам с @coalesce выполняются один раз
+router = APIRouter(route_class=CoalescingRoute)
+
+# ?fields= для GET: только перечисленные поля в SELECT и в ответе
+PointFields = Depends(fields_param(schemas.PointRead, crud.point.model))
 
 # --- Эндпоинты для Точек ---
 
@@ -41,18 +52,38 @@ async def create_point(
     response_model=List[schemas.PointRead],
     dependencies=[Depends(deps.ensure_token_is_valid)]
 )
+@coalesce
 async def read_points(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     company_id: Optional[uuid.UUID] = Query(None, description="Filter by company ID"),
+    total: Optional[CountMode] = TotalQuery,
+    fields: Optional[List[str]] = PointFields,
 ) -> Any:
     """Получить список точек (опционально фильтр по компании)."""
     if company_id:
-        points = await crud.point.get_multi_by_company(db, company_id=company_id, skip=skip, limit=limit)
+        points = await crud.point.get_multi_by_company(db, company_id=company_id, skip=skip, limit=limit, fields=fields)
     else:
-        points = await crud.point.get_multi(db, skip=skip, limit=limit)
-    return points
+        points = await crud.point.get_multi(db, skip=skip, limit=limit, fields=fields)
+    await set_total_count(response, db, crud.point, total, crud.point.filtered_statement(company_id=company_id))
+    return prune(points, fields, response)
+
+@router.post(
+    "/batch-get",
+    response_model=schemas.BatchGetResult[schemas.PointRead],
+    dependencies=[Depends(deps.ensure_token_is_valid)]
+)
+async def batch_get_points(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    batch_in: schemas.BatchGetRequest,
+    fields: Optional[List[str]] = PointFields,
+) -> Any:
+    """Получить несколько точек по списку ID одним запросом (порядок запроса сохраняется)."""
+    return await batch_get(request, db, crud.point, schemas.PointRead, batch_in, fields)
 
 @router.get(
     "/{point_id}",
@@ -63,12 +94,31 @@ async def read_point(
     *,
     db: AsyncSession = Depends(deps.get_db),
     point_id: uuid.UUID,
+    as_of: Optional[datetime] = AsOfQuery,
+    fields: Optional[List[str]] = PointFields,
 ) -> Any:
-    """Получить точку по ID."""
-    point = await crud.point.get(db=db, id=point_id)
+    """Получить точку по ID (с as_of - состояние на этот момент из истории изменений)."""
+    if as_of is not None:
+        return await read_as_of(db, crud.point, point_id, as_of, fields)
+    point = await crud.point.get(db=db, id=point_id, fields=fields)
     if not point:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Point not found")
-    return point
+    return prune(point, fields)
+
+@router.get(
+    "/{point_id}/history",
+    response_model=List[schemas.EntityRevisionRead],
+    dependencies=[Depends(deps.ensure_token_is_valid)]
+)
+async def read_point_history(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    point_id: uuid.UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+) -> Any:
+    """История изменений точки (от новых ревизий к старым)."""
+    return await read_history(db, crud.point, point_id, skip, limit)
 
 @router.put(
     "/{point_id}",
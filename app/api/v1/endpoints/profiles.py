@@ -0,0 +1,26 @@
+# app/api/v1/endpoints/profiles.py
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api import deps
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+@router.get("/", response_model=List[Dict[str, Any]], dependencies=[Depends(deps.ensure_profiling_admin)])
+async def list_profiles() -> Any:
+    """Отчеты профилирования (X-Profile: store), сохраненные этим процессом, начиная с последнего."""
+    return profile_store.list()
+
+@router.get("/{profile_id}", dependencies=[Depends(deps.ensure_profiling_admin)])
+async def read_profile(profile_id: str) -> Any:
+    """
+    Отчет профилирования по X-Profile-Id: дерево вызовов (wall time по сэмплам) и SQL-запросы.
+    Отчеты хранятся в памяти процесса, обработавшего запрос: при нескольких воркерах
+    удобнее X-Profile: inline.
+    """
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return report
@@ -0,0 +1,67 @@
+# app/api/v1/endpoints/reports.py
+import base64
+import uuid
+from datetime import date, timedelta
+from typing import Any, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+
+router = APIRouter()
+
+
+def _encode_cursor(expiry: date, id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{expiry.isoformat()}|{id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[date, uuid.UUID]:
+    try:
+        expiry, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return date.fromisoformat(expiry), uuid.UUID(id)
+    except ValueError:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("/fiscal-drive-expiry", response_model=schemas.FiscalDriveExpiryPage, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_fiscal_drive_expiry(
+    db: AsyncSession = Depends(deps.get_db),
+    date_from: Optional[date] = Query(None, description="Start of the expiry window (inclusive), default: today"),
+    date_to: Optional[date] = Query(None, description="End of the expiry window (inclusive), default: date_from + 30 days"),
+    company_id: Optional[uuid.UUID] = Query(None, description="Filter by company ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+) -> Any:
+    """Регистраторы, чей ФН истекает в заданном окне дат, с привязкой к точке, компании и серверу."""
+    date_from = date_from or date.today()
+    date_to = date_to or date_from + timedelta(days=30)
+    after = _decode_cursor(cursor) if cursor else None
+    items = await crud.fiscal_registrar.get_expiring(
+        db, date_from=date_from, date_to=date_to, company_id=company_id, after=after, limit=limit
+    )
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = _encode_cursor(last["fiscal_drive_expiry_date"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/fiscal-drive-expiry/summary", response_model=schemas.FiscalDriveExpirySummary, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_fiscal_drive_expiry_summary(
+    db: AsyncSession = Depends(deps.get_db),
+    date_from: Optional[date] = Query(None, description="Default: today"),
+    date_to: Optional[date] = Query(None, description="Default: date_from + 90 days"),
+    company_id: Optional[uuid.UUID] = Query(None, description="Filter by company ID"),
+    top_companies: int = Query(100, ge=1, le=1000),
+) -> Any:
+    """
+    Количество истекающих ФН по неделям и по компаниям (для дашборда).
+    Читается из предрасчитанной таблицы, окно округляется до целых недель.
+    """
+    date_from = date_from or date.today()
+    date_to = date_to or date_from + timedelta(days=90)
+    return await crud.fiscal_registrar.get_expiry_summary(
+        db, date_from=date_from, date_to=date_to, company_id=company_id, top_companies=top_companies
+    )
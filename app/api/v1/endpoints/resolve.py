@@ -0,0 +1,22 @@
+# app/api/v1/endpoints/resolve.py
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+
+router = APIRouter()
+
+@router.get("/{identifier}", response_model=schemas.ResolveResult, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def resolve_identifier(*, db: AsyncSession = Depends(deps.get_db), identifier: str) -> Any:
+    """
+    Найти сущность по одному идентификатору: ИНН, iiko_uid, ID (или ссылка) партнерского портала,
+    серийный номер, РНМ или номер ФН фискального регистратора.
+    Возвращает найденные сущности с цепочкой родителей (для ФР: рабочая станция, точка, компания, сервер).
+    """
+    result = await crud.resolve.resolve(db, identifier=identifier)
+    if not result["matches"]:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Nothing found for identifier '{identifier}'")
+    return result
@@ -0,0 +1,40 @@
+# app/api/v1/endpoints/search.py
+from typing import List, Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+
+router = APIRouter()
+
+# SQLSTATE query_canceled: сработал statement_timeout
+QUERY_CANCELED = "57014"
+# Короче трех символов у фрагмента нет ни одной триграммы для индекса
+MIN_QUERY_LENGTH = 3
+
+@router.get("/", response_model=List[schemas.SearchResult], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def search(
+    db: AsyncSession = Depends(deps.get_db),
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH, max_length=100, description="Fragment of a name, address, INN or iiko_uid"),
+    types: Optional[List[schemas.SearchResultType]] = Query(None, description="Restrict results to these types"),
+    limit: int = Query(20, ge=1, le=50),
+) -> Any:
+    """
+    Глобальный поиск по фрагменту среди компаний, точек и серверов.
+    Минимум 3 символа (без пробелов по краям): более короткие фрагменты не используют триграммный индекс.
+    """
+    q = q.strip()
+    if len(q) < MIN_QUERY_LENGTH:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Query must contain at least {MIN_QUERY_LENGTH} non-space characters",
+        )
+    try:
+        return await crud.search.search(db, q=q, types=types, limit=limit)
+    except DBAPIError as e:
+        if getattr(e.orig, "sqlstate", None) == QUERY_CANCELED:
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail="Search timed out, refine the query")
+        raise
@@ -1,14 +1,27 @@
 # app/api/v1/endpoints/servers.py
 import uuid
-from typing import List, Any
+from datetime import datetime
+from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.api import deps
+from app.api.batch import batch_get
+from app.api.bundle import server_bundle
+from app.api.fields import fields_param, prune
+from app.api.history import AsOfQuery, read_as_of, read_history
+from app.api.pagination import TotalQuery, set_total_count
+from app.schemas.pagination import CountMode
+from app.api.coalescing import CoalescingRoute, coalesce
+from app.models.enums import ConnectionType, LicenseType, ServerType
 
-router = APIRouter()
+# CoalescingRoute: одинаковые одновременные GET к эндпоинтам с @coalesce выполняются один раз
+router = APIRouter(route_class=CoalescingRoute)
+
+# ?fields= для GET: только перечисленные поля в SELECT и в ответе
+ServerFields = Depends(fields_param(schemas.ServerRead, crud.server.model))
 
 @router.post("/", response_model=schemas.ServerRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def create_server(*, db: AsyncSession = Depends(deps.get_db), server_in: schemas.ServerCreate) -> Any:
@@ -20,18 +33,62 @@ async def create_server(*, db: AsyncSession = Depends(deps.get_db), server_in: s
     return server
 
 @router.get("/", response_model=List[schemas.ServerRead], dependencies=[Depends(deps.ensure_token_is_valid)])
-async def read_servers(db: AsyncSession = Depends(deps.get_db), skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=200)) -> Any:
-    """Получить список серверов."""
-    servers = await crud.server.get_multi(db, skip=skip, limit=limit)
-    return servers
+async def read_servers(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=200),
+    connection_type: Optional[ConnectionType] = Query(None, description="Only servers with a connection of this type"),
+    server_type: Optional[ServerType] = Query(None, description="Filter by server type"),
+    license_type: Optional[LicenseType] = Query(None, description="Filter by license type"),
+    partner_portal_id: Optional[str] = Query(None, max_length=50, description="Filter by partner portal ID (exact)"),
+    address: Optional[str] = Query(None, min_length=3, max_length=512, description="Address fragment (case-insensitive)"),
+    updated_since: Optional[datetime] = Query(None, description="Only servers changed at or after this time, ordered by updated_at"),
+    total: Optional[CountMode] = TotalQuery,
+    fields: Optional[List[str]] = ServerFields,
+) -> Any:
+    """Получить список серверов с фильтрами (фильтрация на стороне БД)."""
+    filters = dict(
+        connection_type=connection_type,
+        server_type=server_type,
+        license_type=license_type,
+        partner_portal_id=partner_portal_id,
+        address=address,
+        updated_since=updated_since,
+    )
+    servers = await crud.server.get_multi_filtered(db, skip=skip, limit=limit, fields=fields, **filters)
+    await set_total_count(response, db, crud.server, total, crud.server.filtered_statement(**filters))
+    return prune(servers, fields, response)
+
+@router.post("/batch-get", response_model=schemas.BatchGetResult[schemas.ServerRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def batch_get_servers(*, request: Request, db: AsyncSession = Depends(deps.get_db), batch_in: schemas.BatchGetRequest, fields: Optional[List[str]] = ServerFields) -> Any:
+    """Получить несколько серверов по списку ID одним запросом (порядок запроса сохраняется)."""
+    return await batch_get(request, db, crud.server, schemas.ServerRead, batch_in, fields)
+
+@router.get("/by-uid/{iiko_uid}/bundle", response_model=schemas.ServerBundle, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_server_bundle(*, request: Request, db: AsyncSession = Depends(deps.get_db), iiko_uid: str) -> Any:
+    """
+    Пакет синхронизации сервера: сервер, его точки, их рабочие станции и ФР.
+    Ответ кешируется целиком и сбрасывается при изменении любой входящей записи;
+    с If-None-Match и тем же ETag возвращается 304.
+    """
+    return await server_bundle(request, db, iiko_uid)
 
 @router.get("/{server_id}", response_model=schemas.ServerRead, dependencies=[Depends(deps.ensure_token_is_valid)])
-async def read_server(*, db: AsyncSession = Depends(deps.get_db), server_id: uuid.UUID) -> Any:
-    """Получить сервер по ID."""
-    server = await crud.server.get(db=db, id=server_id)
+@coalesce
+async def read_server(*, db: AsyncSession = Depends(deps.get_db), server_id: uuid.UUID, as_of: Optional[datetime] = AsOfQuery, fields: Optional[List[str]] = ServerFields) -> Any:
+    """Получить сервер по ID (с as_of - состояние на этот момент из истории изменений)."""
+    if as_of is not None:
+        return await read_as_of(db, crud.server, server_id, as_of, fields)
+    server = await crud.server.get(db=db, id=server_id, fields=fields)
     if not server:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Server not found")
-    return server
+    return prune(server, fields)
+
+@router.get("/{server_id}/history", response_model=List[schemas.EntityRevisionRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_server_history(*, db: AsyncSession = Depends(deps.get_db), server_id: uuid.UUID, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=200)) -> Any:
+    """История изменений сервера (от новых ревизий к старым)."""
+    return await read_history(db, crud.server, server_id, skip, limit)
 
 @router.put("/{server_id}", response_model=schemas.ServerRead, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def update_server(*, db: AsyncSession = Depends(deps.get_db), server_id: uuid.UUID, server_in: schemas.ServerUpdate) -> Any:
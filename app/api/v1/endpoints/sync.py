@@ -0,0 +1,62 @@
+# app/api/v1/endpoints/sync.py
+import uuid
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api import deps
+from app.api.codecs import BinaryRoute, render
+from app.core.config import settings
+
+# Ответы и тела запросов - JSON, msgpack или CBOR (app/api/codecs.py)
+router = APIRouter(route_class=BinaryRoute)
+
+
+@router.get("/digests/{entity}", response_model=schemas.DigestResponse, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_digests(
+    request: Request,
+    entity: schemas.SyncEntity,
+    db: AsyncSession = Depends(deps.get_db),
+    prefix: str = Query(
+        "", max_length=32, pattern="^[0-9a-f]*$",
+        description="Lowercase hex prefix of the id (without dashes) to drill down into",
+    ),
+    depth: int = Query(2, ge=1, le=3, description="Hex digits added per level: 16^depth buckets"),
+    company_id: Optional[uuid.UUID] = Query(None, description="Only records belonging to this company"),
+    server_id: Optional[uuid.UUID] = Query(None, description="Only records belonging to this server"),
+) -> Any:
+    """
+    Контрольные суммы (id, revision) записей сущности по диапазонам ID.
+    Хеш записи - int(md5("<id>:<revision>")[:16], 16), сумма диапазона - XOR хешей.
+    Клиент сравнивает суммы со своими и запрашивает несовпавшие диапазоны с их prefix,
+    пока не получит список пар (items) - так 100k записей сверяются обменом в несколько КБ.
+    """
+    digests = await crud.sync.digests(
+        db, entity=entity, prefix=prefix, depth=depth, company_id=company_id, server_id=server_id
+    )
+    return render(request, digests, schemas.DigestResponse)
+
+
+@router.post("/reconcile", response_model=schemas.ReconcileResponse, dependencies=[Depends(deps.ensure_token_is_valid)])
+async def reconcile(*, request: Request, db: AsyncSession = Depends(deps.get_db), reconcile_in: schemas.ReconcileRequest) -> Any:
+    """
+    Сверка полного набора клиента: какие записи загрузить (new - нет у клиента,
+    changed - другая ревизия) и какие удалить у себя (deleted - нет на сервере
+    или вне области company_id/server_id). Сравнение целиком выполняется в БД.
+    """
+    if len(reconcile_in.ids) > settings.SYNC_RECONCILE_MAX_IDS:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Too many ids: {len(reconcile_in.ids)} (max {settings.SYNC_RECONCILE_MAX_IDS})",
+        )
+    result = await crud.sync.reconcile(
+        db,
+        entity=reconcile_in.entity,
+        ids=reconcile_in.ids,
+        revisions=reconcile_in.revisions,
+        company_id=reconcile_in.company_id,
+        server_id=reconcile_in.server_id,
+    )
+    return render(request, result, schemas.ReconcileResponse)
@@ -1,14 +1,27 @@
 # app/api/v1/endpoints/workstations.py
+import json
 import uuid
+from datetime import datetime
 from typing import List, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.api import deps
+from app.api.batch import batch_get
+from app.api.codecs import BinaryRoute
+from app.api.fields import fields_param, prune
+from app.api.history import AsOfQuery, read_as_of, read_history
+from app.api.pagination import TotalQuery, set_total_count
+from app.schemas.pagination import CountMode
+from app.models.enums import ConnectionType
 
-router = APIRouter()
+# BinaryRoute: тела запросов в msgpack/CBOR (POST /batch-get)
+router = APIRouter(route_class=BinaryRoute)
+
+# ?fields= для GET: только перечисленные поля в SELECT и в ответе
+WorkstationFields = Depends(fields_param(schemas.WorkstationRead, crud.workstation.model))
 
 @router.post("/", response_model=schemas.WorkstationRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def create_workstation(*, db: AsyncSession = Depends(deps.get_db), workstation_in: schemas.WorkstationCreate) -> Any:
@@ -26,25 +39,52 @@ async def create_workstation(*, db: AsyncSession = Depends(deps.get_db), worksta
 
 @router.get("/", response_model=List[schemas.WorkstationRead], dependencies=[Depends(deps.ensure_token_is_valid)])
 async def read_workstations(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     point_id: Optional[uuid.UUID] = Query(None, description="Filter by point ID"),
+    connection_type: Optional[ConnectionType] = Query(None, description="Only workstations with a connection of this type"),
+    equipment: Optional[str] = Query(
+        None,
+        description='JSON object that extra_equipment must contain, e.g. {"scale": {"model": "X"}}',
+    ),
+    total: Optional[CountMode] = TotalQuery,
+    fields: Optional[List[str]] = WorkstationFields,
 ) -> Any:
-    """Получить список рабочих станций (опционально фильтр по точке)."""
-    if point_id:
-        workstations = await crud.workstation.get_multi_by_point(db, point_id=point_id, skip=skip, limit=limit)
-    else:
-        workstations = await crud.workstation.get_multi(db, skip=skip, limit=limit)
-    return workstations
+    """Получить список рабочих станций (фильтры по точке, типу подключения и оборудованию)."""
+    equipment_filter = None
+    if equipment:
+        try:
+            equipment_filter = json.loads(equipment)
+        except ValueError:
+            equipment_filter = None
+        if not isinstance(equipment_filter, dict):
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail="equipment must be a JSON object")
+    filters = dict(point_id=point_id, connection_type=connection_type, equipment=equipment_filter)
+    workstations = await crud.workstation.get_multi_filtered(db, skip=skip, limit=limit, fields=fields, **filters)
+    await set_total_count(response, db, crud.workstation, total, crud.workstation.filtered_statement(**filters))
+    return prune(workstations, fields, response)
+
+@router.post("/batch-get", response_model=schemas.BatchGetResult[schemas.WorkstationRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def batch_get_workstations(*, request: Request, db: AsyncSession = Depends(deps.get_db), batch_in: schemas.BatchGetRequest, fields: Optional[List[str]] = WorkstationFields) -> Any:
+    """Получить несколько рабочих станций по списку ID одним запросом (порядок запроса сохраняется)."""
+    return await batch_get(request, db, crud.workstation, schemas.WorkstationRead, batch_in, fields)
 
 @router.get("/{workstation_id}", response_model=schemas.WorkstationRead, dependencies=[Depends(deps.ensure_token_is_valid)])
-async def read_workstation(*, db: AsyncSession = Depends(deps.get_db), workstation_id: uuid.UUID) -> Any:
-    """Получить рабочую станцию по ID."""
-    workstation = await crud.workstation.get(db=db, id=workstation_id)
+async def read_workstation(*, db: AsyncSession = Depends(deps.get_db), workstation_id: uuid.UUID, as_of: Optional[datetime] = AsOfQuery, fields: Optional[List[str]] = WorkstationFields) -> Any:
+    """Получить рабочую станцию по ID (с as_of - состояние на этот момент из истории изменений)."""
+    if as_of is not None:
+        return await read_as_of(db, crud.workstation, workstation_id, as_of, fields)
+    workstation = await crud.workstation.get(db=db, id=workstation_id, fields=fields)
     if not workstation:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Workstation not found")
-    return workstation
+    return prune(workstation, fields)
+
+@router.get("/{workstation_id}/history", response_model=List[schemas.EntityRevisionRead], dependencies=[Depends(deps.ensure_token_is_valid)])
+async def read_workstation_history(*, db: AsyncSession = Depends(deps.get_db), workstation_id: uuid.UUID, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=200)) -> Any:
+    """История изменений рабочей станции (от новых ревизий к старым)."""
+    return await read_history(db, crud.workstation, workstation_id, skip, limit)
 
 @router.put("/{workstation_id}", response_model=schemas.WorkstationRead, dependencies=[Depends(deps.ensure_token_is_valid)])
 async def update_workstation(*, db: AsyncSession = Depends(deps.get_db), workstation_id: uuid.UUID, workstation_in: schemas.WorkstationUpdate) -> Any:
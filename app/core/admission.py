@@ -0,0 +1,151 @@
+# app/core/admission.py
+# Контроль допуска (admission control) перед пулом соединений БД.
+# Запросы делятся на классы (reads, writes, auth); у каждого класса свой лимит
+# одновременных запросов и ограниченная очередь. Если ожидание в очереди
+# превысит бюджет задержки, запрос сразу получает 503 с Retry-After,
+# вместо того чтобы висеть на checkout из пула до таймаута.
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+ADMISSION_IN_FLIGHT = registry.gauge("admission_in_flight", "Requests currently admitted, by route class")
+ADMISSION_QUEUED = registry.gauge("admission_queued", "Requests waiting for admission, by route class")
+ADMISSION_REJECTED = registry.counter("admission_rejected_total", "Requests shed with 503, by route class and reason")
+ADMISSION_WAIT = registry.histogram("admission_wait_seconds", "Time spent waiting for admission, by route class")
+
+# Коэффициент сглаживания для оценки среднего времени обработки запроса
+EWMA_ALPHA = 0.2
+
+
+class AdmissionLimiter:
+    """
+    Ограничитель параллельности с FIFO-очередью и бюджетом ожидания.
+
+    Запрос отклоняется сразу, если очередь заполнена или ожидаемое время
+    ожидания (длина очереди * среднее время обработки / лимит) больше бюджета.
+    Иначе он ждет освобождения слота, но не дольше бюджета.
+    """
+    def __init__(self, name: str, *, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_service_time = 0.0
+
+    def expected_wait(self) -> float:
+        return (len(self._waiters) + 1) * self._avg_service_time / self.limit
+
+    async def acquire(self) -> Optional[str]:
+        """Занять слот. Возвращает None при успехе или причину отказа."""
+        if self.in_flight < self.limit and not self._waiters:
+            self._admit()
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+        if self.expected_wait() > self.max_wait:
+            return "latency_budget"
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        ADMISSION_QUEUED.inc(route_class=self.name)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            return "timeout"
+        except asyncio.CancelledError:
+            # Клиент ушел, но слот уже мог быть передан нам - вернем его
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        finally:
+            ADMISSION_QUEUED.dec(route_class=self.name)
+            ADMISSION_WAIT.observe(time.monotonic() - started, route_class=self.name)
+            try:
+                self._waiters.remove(fut)
+            except ValueError:
+                pass
+        return None
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.inc(route_class=self.name)
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        if service_time is not None:
+            self._avg_service_time += EWMA_ALPHA * (service_time - self._avg_service_time)
+        # Передаем слот первому живому ожидающему, иначе освобождаем
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec(route_class=self.name)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware: распределяет запросы к API по классам и ограничивает их.
+    Служебные пути (корень, /metrics, документация) не ограничиваются.
+    """
+    def __init__(self, app):
+        self.app = app
+        max_wait = settings.ADMISSION_MAX_WAIT_MS / 1000
+        self.limiters: Dict[str, AdmissionLimiter] = {
+            "reads": AdmissionLimiter("reads", limit=settings.ADMISSION_READ_CONCURRENCY, max_queue=settings.ADMISSION_MAX_QUEUE, max_wait=max_wait),
+            "writes": AdmissionLimiter("writes", limit=settings.ADMISSION_WRITE_CONCURRENCY, max_queue=settings.ADMISSION_MAX_QUEUE, max_wait=max_wait),
+            "auth": AdmissionLimiter("auth", limit=settings.ADMISSION_AUTH_CONCURRENCY, max_queue=settings.ADMISSION_MAX_QUEUE, max_wait=max_wait),
+        }
+        self.api_prefix = settings.API_V1_STR
+        self.auth_prefix = f"{settings.API_V1_STR}/auth"
+        self.openapi_path = f"{settings.API_V1_STR}/openapi.json"
+
+    def route_class(self, scope) -> Optional[str]:
+        path: str = scope["path"]
+        if not path.startswith(self.api_prefix) or path == self.openapi_path:
+            return None
+        if path.startswith(self.auth_prefix):
+            return "auth"
+        if scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return "reads"
+        return "writes"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        route_class = self.route_class(scope)
+        if route_class is None:
+            return await self.app(scope, receive, send)
+
+        limiter = self.limiters[route_class]
+        reason = await limiter.acquire()
+        if reason is not None:
+            ADMISSION_REJECTED.inc(route_class=route_class, reason=reason)
+            return await self._reject(send)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": "Service is overloaded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,4 +1,6 @@
 # app/core/config.py
+import logging
+
 from pydantic_core.core_schema import ValidationInfo
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, PostgresDsn, validator, field_validator
@@ -25,6 +27,104 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: Optional[str] = None
     POSTGRES_DB: Optional[str] = None
     DATABASE_URL: Optional[PostgresDsn] = None
+    # Пул соединений (на процесс)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0 # Секунды ожидания свободного соединения из пула
+
+    # Общий лимит соединений Postgres (max_connections) и резерв под миграции,
+    # админские сессии и app.worker. Используется app/run.py для расчета пула на воркер.
+    POSTGRES_MAX_CONNECTIONS: int = 100
+    DB_RESERVED_CONNECTIONS: int = 10
+    DB_WORKER_CONNECTIONS: int = 5 # Часть резерва под пул python -m app.worker (pool + overflow)
+
+    # Продакшн-запуск (python -m app.run)
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0 # 0 - по числу доступных CPU
+    WEB_KEEPALIVE: int = 5 # Секунды удержания keep-alive соединения
+    WEB_BACKLOG: int = 2048 # Очередь входящих соединений сокета
+    WEB_GRACEFUL_SHUTDOWN: int = 30 # Секунды на завершение запросов при остановке
+
+    # Глобальный поиск (GET /search)
+    SEARCH_TIMEOUT_MS: int = 200 # statement_timeout для поискового запроса
+
+    # In-memory индекс идентификаторов для GET /resolve (строится в фоне при старте)
+    RESOLVE_INDEX_ENABLED: bool = True
+
+    # Общее число записей в X-Total-Count (app/crud/count_cache.py)
+    COUNT_CACHE_TTL: float = 60.0 # Секунд; страхует от изменений из других процессов
+    COUNT_CACHE_MAX_ENTRIES: int = 1000
+
+    # Кеш пакетов синхронизации сервера (GET /servers/by-uid/{iiko_uid}/bundle)
+    BUNDLE_CACHE_TTL: float = 300.0 # Секунд; актуальность проверяется по БД на каждом попадании
+    BUNDLE_CACHE_MAX_ENTRIES: int = 1000
+
+    # Пакетное получение по ID (POST /<entity>/batch-get)
+    BATCH_GET_MAX_IDS: int = 500
+    # Операций в одном POST /batch (выполняются в одной транзакции)
+    BATCH_MAX_OPERATIONS: int = 1000
+
+    # Idempotency-Key для POST (app/core/idempotency.py)
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL: int = 86400 # Секунд хранения ответа
+    # Секунд, на которые запрос занимает ключ: если процесс упал, не завершив запрос,
+    # повтор с тем же ключом выполнится после истечения, а не получит 409 до конца TTL.
+    # Должно быть больше самого долгого POST-запроса
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 60
+    IDEMPOTENCY_CACHE_SIZE: int = 1000 # Ответов в памяти процесса
+    IDEMPOTENCY_MAX_BODY: int = 1048576 # Ответы больше не сохраняются (байт)
+
+    # История изменений сущностей (app/db/history.py)
+    HISTORY_SNAPSHOT_INTERVAL: int = 20 # Полный снимок каждые N ревизий, между ними - только diff
+
+    # Проверка синхронизации (GET /sync/digests)
+    SYNC_DIGEST_LEAF_SIZE: int = 64 # Диапазон с таким числом записей отдается списком (id, revision)
+    SYNC_RECONCILE_MAX_IDS: int = 200000 # Пар (id, revision) в одном POST /sync/reconcile
+
+    # Логирование (app/core/logging.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json" # json - одна строка JSON на запись, text - для чтения глазами
+    LOG_QUEUE_SIZE: int = 10000 # Записей в очереди до вывода; при переполнении новые отбрасываются
+    LOG_RATE_LIMIT_BURST: int = 10 # Одинаковых записей за окно без ограничения (0 - не ограничивать)
+    LOG_RATE_LIMIT_WINDOW: float = 60.0 # Секунд
+    LOG_RATE_LIMIT_SAMPLE: int = 100 # Сверх лимита выводится каждая N-я запись
+
+    # Задержка event loop (app/core/loop_monitor.py)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.25 # Секунды между замерами
+    LOOP_MONITOR_DEBUG: bool = False # Сторожевой поток со стеками блокирующего кода (для staging)
+    LOOP_BLOCK_THRESHOLD_MS: int = 100 # Остановка loop дольше этого попадает в лог со стеком
+
+    # Профилирование запроса по заголовку X-Profile (app/core/profiling.py)
+    PROFILING_ENABLED: bool = True
+    PROFILING_ADMINS: List[str] = [] # Subject токена; пусто - только INITIAL_API_LOGIN
+    PROFILING_SAMPLE_INTERVAL_MS: float = 1.0
+    PROFILING_MAX_REPORTS: int = 50 # Отчетов в памяти процесса
+    PROFILING_MAX_SQL: int = 1000 # SQL-запросов в отчете (остальные только считаются)
+
+    # Прогрев при старте (app/db/warmup.py)
+    DB_POOL_PREWARM: int = 2 # Сколько соединений открыть и прогреть до приема запросов (0 - выключено)
+    WARMUP_OPENAPI: bool = True # Строить схему OpenAPI при старте, а не на первом запросе к /docs
+
+    # Контроль допуска (app/core/admission.py). Сумма лимитов reads + writes
+    # не должна превышать DB_POOL_SIZE + DB_MAX_OVERFLOW, иначе запросы снова
+    # начнут копиться в ожидании соединения из пула.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_READ_CONCURRENCY: int = 10
+    ADMISSION_WRITE_CONCURRENCY: int = 5
+    ADMISSION_AUTH_CONCURRENCY: int = 4 # bcrypt нагружает CPU, держим мало
+    ADMISSION_MAX_QUEUE: int = 100 # Максимум ожидающих запросов на класс
+    ADMISSION_MAX_WAIT_MS: int = 500 # Бюджет ожидания в очереди
+    ADMISSION_RETRY_AFTER: int = 1 # Значение заголовка Retry-After (секунды)
+
+    # Фоновые задачи (app/jobs)
+    JOBS_IN_PROCESS: bool = True # Запускать обработчик задач внутри веб-процесса (иначе - python -m app.worker)
+    JOBS_POLL_INTERVAL: float = 1.0 # Секунды между опросами очереди
+    JOBS_DEFAULT_CONCURRENCY: int = 1 # Параллельных задач одного типа на процесс
+    JOBS_CONCURRENCY: Dict[str, int] = {} # Переопределения по типам, например {"export": 2}
+    JOBS_STALE_AFTER: int = 300 # Секунды без heartbeat, после которых задача возвращается в очередь
+    JOBS_MAX_ATTEMPTS: int = 3 # Задача, чей воркер пропал столько раз, помечается FAILED, а не возвращается в очередь
 
     @field_validator("DATABASE_URL", mode='before')
     @classmethod
@@ -59,11 +159,13 @@ class Settings(BaseSettings):
 
 settings = Settings() # type: ignore
 
-# Проверка, что секретный ключ не остался дефолтным (простая)
+# Проверка, что секретный ключ не остался дефолтным (простая).
+# Логирование к этому моменту еще не настроено: предупреждения уйдут в stderr обработчиком по умолчанию
+logger = logging.getLogger(__name__)
 if settings.SECRET_KEY == "your_super_secret_random_key_here":
-    print("WARNING: Default SECRET_KEY is used. Please generate and set a secure key in the .env file.")
+    logger.warning("Default SECRET_KEY is used. Please generate and set a secure key in the .env file.")
 # Проверка, что пароль не остался дефолтным
 if settings.INITIAL_API_PASSWORD == "changeme":
-    print("WARNING: Default INITIAL_API_PASSWORD is used. Please change it in the .env file.")
+    logger.warning("Default INITIAL_API_PASSWORD is used. Please change it in the .env file.")
 if not settings.DATABASE_URL:
-     print("ERROR: DATABASE_URL is not configured in the .env file.")
\ No newline at end of file
+    logger.error("DATABASE_URL is not configured in the .env file.")
@@ -0,0 +1,220 @@
+# app/core/idempotency.py
+# Заголовок Idempotency-Key для POST-запросов API.
+#
+# Клиент, повторяющий запрос после таймаута, передает тот же ключ - и получает
+# сохраненный ответ первого запроса, а сама запись повторно не выполняется.
+#   - ключ действует в пределах клиента (subject токена, а не сам токен: повтор
+#     после повторного входа с новым токеном - тот же клиент);
+#   - тот же ключ с другим запросом (метод, путь, query, тело) - 422;
+#   - запрос с этим ключом еще выполняется - 409 (повторить позже); если процесс
+#     упал посреди запроса, ключ освобождается через IDEMPOTENCY_LOCK_TIMEOUT;
+#   - ответы 5xx и упавшие запросы не сохраняются: повтор выполнится заново;
+#   - запросы к /auth ключ игнорируют: ответ входа - токен, его нельзя хранить
+#     в БД и отдавать повторно после истечения;
+#   - X-Profile: inline вместе с ключом - 400 до резервирования ключа: вместо ответа
+#     сохранился бы отчет профилировщика (app/core/profiling.py), X-Profile: store можно.
+# Ответы хранятся в таблице idempotencykey IDEMPOTENCY_TTL секунд, последние
+# IDEMPOTENCY_CACHE_SIZE - еще и в памяти процесса, чтобы повтор не ходил в БД.
+# Истекшие записи перезаписываются при повторном использовании ключа и удаляются
+# задачей purge_idempotency_keys.
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import INLINE, PROFILE_HEADER
+from app.core.security import bearer_subject
+from app.crud.crud_idempotency import idempotency
+from app.db.session import AsyncSessionFactory
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_REQUESTS = registry.counter(
+    "idempotency_requests_total", "POST requests with Idempotency-Key, by outcome (executed/replayed/conflict/mismatch)"
+)
+
+# Сохраненный ответ: отпечаток запроса, статус, заголовки, тело
+_Stored = Tuple[str, int, List[List[str]], bytes]
+
+
+class _ResponseCache:
+    """LRU готовых ответов с TTL."""
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, _Stored]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[_Stored]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Tuple[str, str], value: _Stored) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.api_prefix = settings.API_V1_STR
+        self.auth_prefix = f"{settings.API_V1_STR}/auth"
+        self.cache = _ResponseCache(settings.IDEMPOTENCY_CACHE_SIZE, settings.IDEMPOTENCY_TTL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.api_prefix):
+            return await self.app(scope, receive, send)
+        if scope["path"].startswith(self.auth_prefix):
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            return await self.app(scope, receive, send)
+        key = raw_key.decode("latin-1").strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return await self._error(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+        profile_mode = headers.get(PROFILE_HEADER)
+        if profile_mode is not None and profile_mode.decode("latin-1").strip().lower() == INLINE:
+            return await self._error(
+                send, 400, f"X-Profile: {INLINE} cannot be combined with Idempotency-Key, use X-Profile: store",
+            )
+
+        # Тело читаем целиком: оно нужно для отпечатка и затем передается приложению
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        client_scope = self._client_scope(headers.get(b"authorization"))
+        fingerprint = hashlib.sha256(
+            b"\n".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+        cache_key = (client_scope, key)
+
+        stored = self.cache.get(cache_key)
+        if stored is None:
+            try:
+                reserved, existing = await self._reserve(client_scope, key, fingerprint)
+            except Exception:
+                # Хранилище недоступно - выполняем запрос без гарантии идемпотентности
+                logger.warning("Idempotency store is unavailable, executing request without it", exc_info=True)
+                return await self.app(scope, self._replay_body(body, receive), send)
+            if reserved:
+                return await self._execute(scope, receive, body, send, client_scope, key, fingerprint)
+            if existing.status_code is None:
+                IDEMPOTENCY_REQUESTS.inc(outcome="conflict")
+                return await self._error(send, 409, "A request with this Idempotency-Key is still in progress")
+            stored = (existing.fingerprint, existing.status_code, existing.response_headers or [], existing.response_body or b"")
+            self.cache.put(cache_key, stored)
+
+        stored_fingerprint, status_code, stored_headers, stored_body = stored
+        if stored_fingerprint != fingerprint:
+            IDEMPOTENCY_REQUESTS.inc(outcome="mismatch")
+            return await self._error(send, 422, "Idempotency-Key was already used for a different request")
+        IDEMPOTENCY_REQUESTS.inc(outcome="replayed")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in stored_headers] + [(REPLAYED_HEADER, b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored_body})
+
+    @staticmethod
+    def _client_scope(authorization: Optional[bytes]) -> str:
+        """
+        Область ключей - клиент: хеш subject токена. Без валидного токена запрос все
+        равно получит 401, такие ключи изолируются по хешу самого заголовка.
+        """
+        raw = authorization.decode("latin-1") if authorization else ""
+        subject = bearer_subject(raw)
+        source = f"sub:{subject}" if subject is not None else f"raw:{raw}"
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    async def _reserve(self, client_scope: str, key: str, fingerprint: str):
+        async with AsyncSessionFactory() as db:
+            return await idempotency.reserve(
+                db, scope=client_scope, key=key, fingerprint=fingerprint,
+                ttl=settings.IDEMPOTENCY_TTL, lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+            )
+
+    async def _execute(self, scope, receive, body: bytes, send, client_scope: str, key: str, fingerprint: str) -> None:
+        """Выполнить запрос, параллельно отдавая ответ клиенту и запоминая его."""
+        status_code = 500
+        response_headers: List[List[str]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = [[k.decode("latin-1"), v.decode("latin-1")] for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        IDEMPOTENCY_REQUESTS.inc(outcome="executed")
+        try:
+            await self.app(scope, self._replay_body(body, receive), capture)
+        except BaseException:
+            try:
+                async with AsyncSessionFactory() as db:
+                    await idempotency.release(db, scope=client_scope, key=key)
+            except Exception:
+                logger.exception("Failed to release Idempotency-Key") # Ключ освободится по истечении TTL
+            raise
+
+        response_body = b"".join(chunks)
+        async with AsyncSessionFactory() as db:
+            if status_code >= 500 or len(response_body) > settings.IDEMPOTENCY_MAX_BODY:
+                await idempotency.release(db, scope=client_scope, key=key)
+                return
+            await idempotency.complete(
+                db, scope=client_scope, key=key,
+                status_code=status_code, headers=response_headers, body=response_body,
+            )
+        self.cache.put((client_scope, key), (fingerprint, status_code, response_headers, response_body))
+
+    @staticmethod
+    def _replay_body(body: bytes, receive):
+        """receive для приложения: сначала уже прочитанное тело, дальше - исходный канал (disconnect)."""
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    async def _error(self, send, status_code: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
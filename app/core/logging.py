@@ -0,0 +1,227 @@
+# app/core/logging.py
+# Структурированное логирование, не блокирующее обработку запросов.
+#
+# Записи из кода приложения кладутся в ограниченную очередь (QueueHandler), а вывод
+# в stderr делает отдельный поток QueueListener, так что медленный stdout/журнал
+# не задерживает event loop. При переполнении очереди запись отбрасывается (и считается
+# в метрике), а не ждет места.
+#
+# Повторяющиеся записи (одинаковые logger + шаблон сообщения, уровень ниже ERROR)
+# ограничиваются: первые LOG_RATE_LIMIT_BURST за окно LOG_RATE_LIMIT_WINDOW проходят,
+# дальше - каждая LOG_RATE_LIMIT_SAMPLE-я с полем suppressed (сколько пропущено).
+#
+# В каждую запись добавляется request_id текущего запроса (RequestIdMiddleware,
+# заголовок X-Request-ID), чтобы записи одного запроса можно было найти вместе.
+import copy
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+LOG_RECORDS_DROPPED = registry.counter("log_records_dropped_total", "Log records not written, by reason")
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Принимаем идентификатор клиента/прокси, только если он короткий и без спецсимволов
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Атрибуты LogRecord, которые не являются полями extra=
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "suppressed"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Добавляет в запись request_id. Стоит на QueueHandler, то есть работает в потоке запроса."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничение повторяющихся записей по ключу (logger, шаблон сообщения, уровень).
+    Ключ - шаблон, а не отформатированный текст, поэтому "Token validation error: %s"
+    с разными ошибками считается одной записью.
+    """
+    def __init__(self, *, burst: int, window: float, sample: int, max_keys: int = 10000):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sample = max(1, sample)
+        self.max_keys = max_keys
+        # ключ -> [начало окна, записей в окне, пропущено с последней выведенной]
+        self._counters: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, str(record.msg), record.levelno)
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                if counter is None and len(self._counters) >= self.max_keys:
+                    self._counters.clear() # Защита от неограниченного роста при уникальных шаблонах
+                suppressed = counter[2] if counter else 0
+                counter = self._counters[key] = [now, 0, 0]
+            else:
+                suppressed = counter[2]
+            counter[1] += 1
+            seen = counter[1]
+            if seen > self.burst and (seen - self.burst) % self.sample:
+                counter[2] += 1
+                LOG_RECORDS_DROPPED.inc(reason="rate_limited")
+                return False
+            counter[2] = 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler, который при полной очереди отбрасывает запись, а не блокирует или пишет traceback."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # В отличие от QueueHandler.prepare, traceback не склеивается с сообщением,
+        # а остается в exc_text, чтобы форматтер вывел его отдельным полем
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON: ts, level, logger, message, request_id и поля extra=."""
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            data["request_id"] = record.request_id
+        if getattr(record, "suppressed", None):
+            data["suppressed"] = record.suppressed
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = record.stack_info
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Читаемый формат для разработки; request_id и suppressed дописываются в конец строки."""
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        extra = []
+        if getattr(record, "request_id", None):
+            extra.append(f"request_id={record.request_id}")
+        if getattr(record, "suppressed", None):
+            extra.append(f"suppressed={record.suppressed}")
+        if not extra:
+            return text
+        first, _, rest = text.partition("\n")
+        return f"{first} [{' '.join(extra)}]" + (f"\n{rest}" if rest else "")
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """
+    Настроить корневой логгер процесса: очередь + поток вывода.
+    Повторный вызов ничего не делает (фабрика приложения может вызываться несколько раз).
+    """
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(RateLimitFilter(
+        burst=settings.LOG_RATE_LIMIT_BURST,
+        window=settings.LOG_RATE_LIMIT_WINDOW,
+        sample=settings.LOG_RATE_LIMIT_SAMPLE,
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Дописать накопленные записи и остановить поток вывода."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware: берет X-Request-ID из запроса (или создает новый), делает его
+    доступным логированию через request_id_var и возвращает в заголовке ответа.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != REQUEST_ID_HEADER]
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
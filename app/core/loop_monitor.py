@@ -0,0 +1,108 @@
+# app/core/loop_monitor.py
+# Мониторинг задержки event loop.
+#
+# Фоновая задача засыпает на LOOP_MONITOR_INTERVAL и меряет, насколько позже она
+# проснулась. Опоздание - время, которое готовые к выполнению корутины ждали
+# из-за синхронной работы в других обработчиках (bcrypt, jsonable_encoder на больших
+# ответах, блокирующий I/O). Экспортируется как метрика event_loop_lag_seconds.
+#
+# При LOOP_MONITOR_DEBUG=True дополнительно работает сторожевой поток: если задача
+# не просыпается дольше LOOP_BLOCK_THRESHOLD_MS сверх интервала, он снимает стек
+# потока event loop (sys._current_frames) и пишет его в лог - это как раз код,
+# который блокирует loop. Стек снимается один раз на каждую остановку.
+# Сторожевой поток рассчитан на staging: сам он дешев, но предупреждения с полными
+# стеками в продакшене могут быть шумными.
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds", "Event loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_LAG_LAST = registry.gauge("event_loop_lag_last_seconds", "Event loop scheduling delay, last sample")
+LOOP_BLOCKED = registry.counter("event_loop_blocked_total", "Event loop stalls longer than LOOP_BLOCK_THRESHOLD_MS")
+
+
+class LoopMonitor:
+    """
+    Замер задержки event loop и (опционально) сторожевой поток со снятием стеков.
+    Запускается и останавливается вместе с приложением (lifespan) или app.worker.
+    """
+    def __init__(self, *, interval: float, block_threshold: Optional[float] = None):
+        self.interval = interval
+        self.block_threshold = block_threshold # Секунды; None - без сторожевого потока
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample_loop())
+        if self.block_threshold is not None:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval + self.block_threshold)
+            self._watchdog = None
+
+    async def _sample_loop(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - started - self.interval)
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        """
+        Сторожевой поток. Остановкой считается отсутствие heartbeat дольше
+        interval + block_threshold; проверка - каждые block_threshold / 2.
+        """
+        reported_heartbeat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning(
+                "Event loop blocked for at least %.0f ms, loop thread stack:\n%s", stalled * 1000, stack,
+                extra={"blocked_ms": round(stalled * 1000)},
+            )
+
+
+def create_loop_monitor() -> LoopMonitor:
+    """Монитор по настройкам LOOP_MONITOR_*."""
+    return LoopMonitor(
+        interval=settings.LOOP_MONITOR_INTERVAL,
+        block_threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000 if settings.LOOP_MONITOR_DEBUG else None,
+    )
@@ -0,0 +1,381 @@
+# app/core/profiling.py
+# Профилирование отдельного запроса по заголовку, без передеплоя.
+#
+# Администратор (subject токена из PROFILING_ADMINS) добавляет к запросу заголовок
+#   X-Profile: store  - отчет сохраняется в памяти процесса, в ответе X-Profile-Id
+#                       (скачать: GET /api/v1/profiles/{id});
+#   X-Profile: inline - вместо тела ответа возвращается сам отчет (удобно, когда воркеров
+#                       несколько и запрос за отчетом может попасть в другой процесс).
+#
+# Отчет: дерево вызовов с wall time по сэмплам и SQL-запросы с длительностью.
+# Сэмплер - отдельный поток, который раз в PROFILING_SAMPLE_INTERVAL_MS смотрит на задачу
+# запроса: если она выполняется - берет стек потока event loop, если ждет - цепочку
+# await (с листом "<await>"). Другие запросы того же процесса в отчет не попадают.
+# SQL пишут слушатели событий движка, подключенные, только пока идет хотя бы одно
+# профилирование. Без заголовка вся стоимость - поиск заголовка в запросе.
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.security import bearer_subject
+from app.db.session import engine
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+STORE = "store"
+INLINE = "inline"
+
+PROFILED_REQUESTS = registry.counter("profiled_requests_total", "Requests profiled via X-Profile, by mode")
+
+_FrameKey = Tuple[str, str, int] # Функция, файл, первая строка
+_AWAIT: _FrameKey = ("<await>", "", 0)
+
+
+def is_profiling_admin(subject: Optional[str]) -> bool:
+    """Разрешено ли профилирование субъекту токена (по умолчанию - только INITIAL_API_LOGIN)."""
+    admins = settings.PROFILING_ADMINS or [settings.INITIAL_API_LOGIN]
+    return subject is not None and subject in admins
+
+
+# --- SQL ---
+
+class SqlCapture:
+    """SQL-запросы одного профилируемого запроса."""
+    def __init__(self, started: float, limit: int):
+        self.started = started
+        self.limit = limit
+        self.statements: List[Dict[str, Any]] = []
+        self.total = 0.0
+        self.dropped = 0
+
+    def add(self, statement: str, executemany: bool, started: float, duration: float, rows: Optional[int]) -> None:
+        self.total += duration
+        if len(self.statements) >= self.limit:
+            self.dropped += 1
+            return
+        self.statements.append({
+            "statement": statement,
+            "executemany": executemany,
+            "started_ms": round((started - self.started) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "rows": rows,
+        })
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.statements) + self.dropped,
+            "total_ms": round(self.total * 1000, 3),
+            "dropped": self.dropped,
+            "statements": self.statements,
+        }
+
+
+# Контекст запроса доходит и до greenlet, в котором SQLAlchemy выполняет запросы asyncpg
+_sql_capture: ContextVar[Optional[SqlCapture]] = ContextVar("profile_sql_capture", default=None)
+_active_profiles = 0
+_listeners_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _sql_capture.get() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    capture = _sql_capture.get()
+    started = getattr(context, "_profile_started", None)
+    if capture is None or started is None:
+        return
+    rowcount = getattr(cursor, "rowcount", -1)
+    capture.add(statement, executemany, started, time.perf_counter() - started, rowcount if rowcount >= 0 else None)
+
+
+def _attach_sql_listeners() -> None:
+    global _active_profiles
+    with _listeners_lock:
+        _active_profiles += 1
+        if _active_profiles == 1:
+            event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _detach_sql_listeners() -> None:
+    global _active_profiles
+    with _listeners_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            event.remove(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Сэмплер ---
+
+def _frame_key(frame) -> _FrameKey:
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+
+def _short_path(filename: str) -> str:
+    marker = f"site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    return filename[len(cwd):] if filename.startswith(cwd) else filename
+
+
+def _await_chain(coro) -> List[Any]:
+    """Фреймы цепочки await задачи, от внешней корутины к внутренней."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _thread_stack(frame) -> List[Any]:
+    """Стек потока от корня к текущему фрейму."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class CallTree:
+    """Дерево вызовов: время сэмплов накапливается по пути от корня к листу."""
+    def __init__(self):
+        self.root: Dict[str, Any] = {"seconds": 0.0, "self": 0.0, "children": {}}
+
+    def add(self, stack: List[_FrameKey], seconds: float) -> None:
+        node = self.root
+        node["seconds"] += seconds
+        for key in stack:
+            node = node["children"].setdefault(key, {"seconds": 0.0, "self": 0.0, "children": {}})
+            node["seconds"] += seconds
+        node["self"] += seconds
+
+    def report(self) -> List[Dict[str, Any]]:
+        def convert(key: _FrameKey, node: Dict[str, Any]) -> Dict[str, Any]:
+            name, filename, line = key
+            return {
+                "function": name,
+                "location": f"{_short_path(filename)}:{line}" if filename else "",
+                "ms": round(node["seconds"] * 1000, 3),
+                "self_ms": round(node["self"] * 1000, 3),
+                "children": children(node),
+            }
+
+        def children(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+            items = sorted(node["children"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+            return [convert(key, child) for key, child in items]
+
+        return children(self.root)
+
+
+class Sampler(threading.Thread):
+    """
+    Поток, снимающий стек одной задачи event loop. Стек обрезается по фрейму-маркеру
+    (ProfilingMiddleware._run), чтобы в отчет не попадали uvicorn и внешние middleware.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task, marker, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop = loop
+        self.task = task
+        self.marker = marker
+        self.interval = interval
+        self.loop_thread_id = threading.get_ident()
+        self.tree = CallTree()
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            stack = self._sample()
+            now = time.perf_counter()
+            if stack is not None:
+                # Вес сэмпла - фактическое время с прошлого, а не номинальный интервал
+                self.tree.add(stack, now - last)
+                self.samples += 1
+            last = now
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def _after_marker(self, frames: List[Any]) -> Optional[List[Any]]:
+        for i, frame in enumerate(frames):
+            if frame.f_code is self.marker:
+                return frames[i + 1:]
+        return None
+
+    def _sample(self) -> Optional[List[_FrameKey]]:
+        # Чтение чужих фреймов без блокировки loop: в редких гонках сэмпл пропускается
+        try:
+            if asyncio.current_task(self.loop) is not self.task:
+                chain = self._after_marker(_await_chain(self.task.get_coro()))
+                return None if chain is None else [_frame_key(frame) for frame in chain] + [_AWAIT]
+            stack = _thread_stack(sys._current_frames().get(self.loop_thread_id))
+            frames = self._after_marker(stack)
+            if frames is None:
+                # Маркера нет в стеке потока - код выполняется в greenlet SQLAlchemy,
+                # путь до greenlet дает цепочка await задачи
+                chain = self._after_marker(_await_chain(self.task.get_coro()))
+                if chain is None:
+                    return None
+                frames = chain + stack
+            return [_frame_key(frame) for frame in frames]
+        except Exception:
+            return None
+
+
+# --- Хранилище отчетов ---
+
+class ProfileStore:
+    """Последние PROFILING_MAX_REPORTS отчетов процесса."""
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._reports: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def put(self, report: Dict[str, Any]) -> None:
+        self._reports[report["id"]] = report
+        while len(self._reports) > self.max_entries:
+            self._reports.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._reports.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Краткие сведения об отчетах, начиная с последнего."""
+        fields = ("id", "method", "path", "status_code", "started_at", "wall_ms")
+        return [{field: report[field] for field in fields} for report in reversed(self._reports.values())]
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_REPORTS)
+
+
+# --- Middleware ---
+
+def _token_subject(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return bearer_subject(value.decode("latin-1"))
+    return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware, включающее профилирование запроса по заголовку X-Profile."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        mode = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                mode = value.decode("latin-1").strip().lower()
+                break
+        if mode is None:
+            return await self.app(scope, receive, send)
+
+        if mode not in (STORE, INLINE):
+            return await self._error(send, 400, f"X-Profile must be '{STORE}' or '{INLINE}'")
+        if not is_profiling_admin(_token_subject(scope)):
+            return await self._error(send, 403, "Profiling is not permitted")
+        await self._profile(scope, receive, send, mode)
+
+    async def _run(self, scope, receive, send) -> None:
+        # Маркер для сэмплера: все, что ниже этого фрейма, относится к запросу
+        await self.app(scope, receive, send)
+
+    async def _profile(self, scope, receive, send, mode: str) -> None:
+        profile_id = uuid.uuid4().hex
+        status_code = None
+
+        async def capture(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [(PROFILE_ID_HEADER, profile_id.encode())]}
+            if mode == STORE:
+                await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        sql = SqlCapture(started, settings.PROFILING_MAX_SQL)
+        token = _sql_capture.set(sql)
+        _attach_sql_listeners()
+        sampler = Sampler(
+            asyncio.get_running_loop(), asyncio.current_task(), self._run.__code__,
+            settings.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+        )
+        sampler.start()
+        error = None
+        try:
+            await self._run(scope, receive, capture)
+        except BaseException as exc:
+            error = repr(exc)
+            raise
+        finally:
+            wall = time.perf_counter() - started
+            sampler.stop()
+            _sql_capture.reset(token)
+            _detach_sql_listeners()
+            report = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status_code": status_code,
+                "error": error,
+                "started_at": started_at.isoformat(),
+                "wall_ms": round(wall * 1000, 3),
+                "sample_interval_ms": settings.PROFILING_SAMPLE_INTERVAL_MS,
+                "samples": sampler.samples,
+                "tree": sampler.tree.report(),
+                "sql": sql.report(),
+            }
+            profile_store.put(report)
+            PROFILED_REQUESTS.inc(mode=mode)
+
+        if mode == INLINE:
+            body = json.dumps(report).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (PROFILE_ID_HEADER, profile_id.encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+    async def _error(self, send, status_code: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
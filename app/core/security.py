@@ -1,4 +1,5 @@
 # app/core/security.py
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional
 
@@ -9,6 +10,8 @@ from pydantic import ValidationError
 from app.core.config import settings
 from app.schemas.token import TokenPayload # Создадим этот файл следующим
 
+logger = logging.getLogger(__name__)
+
 # Контекст для хеширования паролей/ключей
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -58,13 +61,28 @@ def decode_token(token: str) -> Optional[TokenPayload]:
         token_data = TokenPayload(**payload)
         # Дополнительная проверка времени жизни (хотя jwt.decode это тоже делает)
         if token_data.exp < datetime.now(timezone.utc):
-            print("Token expired") # Или логирование
+            logger.info("Token expired")
             return None
         return token_data
     except (JWTError, ValidationError, KeyError) as e:
-        # Логируем ошибку или обрабатываем иначе
-        print(f"Token validation error: {e}")
+        # Повторяющиеся записи ограничиваются (app/core/logging.py), поэтому поток
+        # невалидных токенов не заваливает журнал
+        logger.info("Token validation error: %s", e)
+        return None
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    Subject токена из значения заголовка Authorization ("Bearer <JWT>").
+    None - заголовка нет, схема не Bearer или токен невалиден/истек.
+    Для ASGI middleware, которым нужен клиент до обработчика (и deps.verify_token).
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer":
         return None
+    payload = decode_token(token.strip())
+    return payload.sub if payload else None
 
 # --- Хеш для нашего "начального" пароля ---
 # Этот хеш можно сгенерировать один раз и вставить в .env или хранить где-то
@@ -4,6 +4,13 @@ from .crud_point import point
 from .crud_server import server
 from .crud_workstation import workstation
 from .crud_fiscal_registrar import fiscal_registrar
+from .crud_job import job
+from .crud_search import search
+from .crud_resolve import resolve
+from .crud_batch import batch
+from .crud_idempotency import idempotency
+from .crud_history import history
+from .crud_sync import sync
 
 __all__ = [
     "company",
@@ -11,4 +18,11 @@ __all__ = [
     "server",
     "workstation",
     "fiscal_registrar",
+    "job",
+    "search",
+    "resolve",
+    "batch",
+    "idempotency",
+    "history",
+    "sync",
 ]
\ No newline at end of file
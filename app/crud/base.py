@@ -1,13 +1,19 @@
 # app/crud/base.py
+import json
 import uuid
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, func # Добавляем func для count
+from sqlalchemy import Select, Uuid, any_, literal, select, func, text # Добавляем func для count
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from sqlmodel import SQLModel # Используем SQLModel
 
+from app.crud.count_cache import count_cache
+from app.db.explain import Explain
+
 # Определяем типовые переменные для моделей SQLAlchemy/SQLModel и схем Pydantic
 ModelType = TypeVar("ModelType", bound=SQLModel) # Модель таблицы (наследуется от SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel) # Схема для создания
@@ -24,26 +30,121 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    async def get(self, db: AsyncSession, id: uuid.UUID) -> Optional[ModelType]:
-        """Получить одну запись по ID."""
-        statement = select(self.model).where(self.model.id == id)
+    def with_fields(self, statement: Select, fields: Optional[Sequence[str]]) -> Select:
+        """
+        Загружать только указанные колонки (load_only), остальные не читаются из БД.
+        Обращение к незагруженному атрибуту в асинхронной сессии - ошибка,
+        поэтому такие объекты используются только для урезанного ответа (app/api/fields.py).
+        """
+        if not fields:
+            return statement
+        return statement.options(load_only(*[getattr(self.model, name) for name in fields]))
+
+    async def get(self, db: AsyncSession, id: uuid.UUID, fields: Optional[Sequence[str]] = None) -> Optional[ModelType]:
+        """Получить одну запись по ID (опционально только указанные поля)."""
+        statement = self.with_fields(select(self.model).where(self.model.id == id), fields)
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_many(
+        self,
+        db: AsyncSession,
+        ids: Sequence[uuid.UUID],
+        fields: Optional[Sequence[str]] = None,
+        for_update: bool = False,
+    ) -> Tuple[List[ModelType], List[uuid.UUID]]:
+        """
+        Получить записи по списку ID одним запросом (WHERE id = ANY(:ids)).
+        Возвращает найденные записи в порядке ids (без повторов) и список отсутствующих ID.
+        for_update - заблокировать строки до конца транзакции (SELECT ... FOR UPDATE).
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return [], []
+        statement = self.with_fields(
+            select(self.model).where(self.model.id == any_(literal(unique_ids, ARRAY(Uuid())))),
+            fields,
+        )
+        if for_update:
+            statement = self._locked(statement)
+        result = await db.execute(statement)
+        found = {obj.id: obj for obj in result.scalars().all()}
+        return (
+            [found[id] for id in unique_ids if id in found],
+            [id for id in unique_ids if id not in found],
+        )
+
+    @staticmethod
+    def _locked(statement: Select) -> Select:
+        """
+        SELECT ... FOR UPDATE с перечитыванием уже загруженных объектов.
+        Параллельные изменения одной записи выполняются по очереди, и каждое видит
+        ревизию, записанную предыдущим, - иначе оба вычислили бы одну и ту же
+        revision + 1 и столкнулись на ключе истории (entityrevision).
+        """
+        return statement.with_for_update().execution_options(populate_existing=True)
+
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
     ) -> List[ModelType]:
         """Получить список записей с пагинацией."""
-        statement = select(self.model).offset(skip).limit(limit)
+        statement = self.with_fields(select(self.model).offset(skip).limit(limit), fields)
         result = await db.execute(statement)
         return result.scalars().all() # Возвращает список объектов модели
 
-    async def get_count(self, db: AsyncSession) -> int:
-        """Получить общее количество записей."""
-        statement = select(func.count()).select_from(self.model)
+    def filtered_statement(self, **filters: Any) -> Select:
+        """
+        Запрос списка записей с фильтрами (без пагинации).
+        Наследники переопределяют его, добавляя свои фильтры; он же используется для подсчета.
+        """
+        return select(self.model)
+
+    async def get_count(self, db: AsyncSession, statement: Optional[Select] = None) -> int:
+        """Получить общее количество записей (или строк запроса statement)."""
+        if statement is None:
+            statement = select(func.count()).select_from(self.model)
+        else:
+            statement = select(func.count()).select_from(
+                statement.order_by(None).limit(None).offset(None).subquery()
+            )
         result = await db.execute(statement)
         return result.scalar_one()
 
+    async def get_count_estimate(self, db: AsyncSession, statement: Optional[Select] = None) -> int:
+        """
+        Оценка количества записей без чтения таблицы.
+        Без фильтров - pg_class.reltuples (обновляется VACUUM/ANALYZE),
+        с фильтрами - число строк из плана запроса (EXPLAIN без выполнения).
+        """
+        if statement is None or statement.whereclause is None:
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+            if estimate is not None and estimate >= 0: # -1: таблица еще ни разу не анализировалась
+                return estimate
+            statement = select(self.model)
+        raw = (await db.execute(Explain(statement.order_by(None).limit(None).offset(None)))).scalar_one()
+        plan = json.loads(raw) if isinstance(raw, str) else raw
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def get_count_cached(self, db: AsyncSession, statement: Optional[Select] = None) -> int:
+        """Точное количество из кеша; кеш сбрасывается при изменении таблицы (см. count_cache)."""
+        table = self.model.__tablename__
+        if statement is None:
+            key: Any = None
+        else:
+            compiled = statement.compile(dialect=db.get_bind().dialect)
+            key = (str(compiled), repr(sorted(compiled.params.items())))
+        cached = count_cache.get(table, key)
+        if cached is not None:
+            return cached
+        revision = count_cache.revision(table)
+        value = await self.get_count(db, statement)
+        count_cache.put(table, key, revision, value)
+        return value
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """Создать новую запись."""
         # Преобразуем Pydantic схему в словарь
@@ -65,6 +166,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """Обновить существующую запись."""
+        # Блокируем строку и перечитываем ее до изменений (см. _locked)
+        await db.execute(self._locked(select(self.model).where(self.model.id == db_obj.id)))
+
         # Получаем данные для обновления (либо из схемы Pydantic, либо из словаря)
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -94,7 +198,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def remove(self, db: AsyncSession, *, id: uuid.UUID) -> Optional[ModelType]:
         """Удалить запись по ID."""
-        statement = select(self.model).where(self.model.id == id)
+        statement = self._locked(select(self.model).where(self.model.id == id))
         result = await db.execute(statement)
         obj = result.scalar_one_or_none()
         if obj:
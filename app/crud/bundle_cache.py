@@ -0,0 +1,146 @@
+# app/crud/bundle_cache.py
+# Кеш готовых (сериализованных) пакетов синхронизации сервера, ключ - iiko_uid.
+# Пакет хранится сразу во всех доступных форматах ответа (JSON, msgpack, CBOR).
+#
+# Для каждого пакета запоминаются ID всех входящих записей. Закоммиченное изменение
+# сервера, точки, рабочей станции или ФР (подписка на app/db/events) сбрасывает пакеты,
+# в которые запись входит или входил/входит ее родитель - так учитываются и новые
+# записи, и перенос между родителями. Изменения из других процессов (воркеры app.run,
+# app.worker) сюда не приходят, поэтому перед отдачей из кеша отпечаток пакета
+# (crud.server.get_bundle_stamp) сверяется с БД; TTL только ограничивает память.
+#
+# Пакет, собранный параллельно с изменением, может быть устаревшим. Поэтому для записей,
+# измененных во время сборки, запоминается версия изменения, и пакет не кешируется, только
+# если изменилась одна из его записей. Изменения других серверов на кеш не влияют.
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.crud.crud_server import BundleStamp
+from app.db.events import Change, subscribe
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+
+# Поля-ссылки на родителя, по которым новая/перенесенная запись попадает в пакет
+PARENT_FIELDS = {
+    Server: (),
+    Point: ("server_id",),
+    Workstation: ("point_id",),
+    FiscalRegistrar: ("workstation_id",),
+}
+
+
+@dataclass(frozen=True)
+class CachedBundle:
+    bodies: Dict[str, bytes] # Тип содержимого -> тело ответа
+    etag: str # ETag JSON-представления
+    revision: int # Максимальная ревизия входящих записей
+    members: FrozenSet[uuid.UUID] # ID сервера, точек, рабочих станций и ФР пакета
+    stamp: BundleStamp # Отпечаток записей, из которых собран пакет
+
+
+class BundleCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Увеличивается при каждом изменении записей, которые могут входить в пакеты
+        self.version = 0
+        self._entries: "OrderedDict[str, Tuple[float, CachedBundle]]" = OrderedDict()
+        self._by_member: Dict[uuid.UUID, Set[str]] = {}
+        # ID записи -> версия последнего изменения (по возрастанию версий); хранится,
+        # пока идет хотя бы одна сборка, начатая до этого изменения
+        self._changed: "OrderedDict[uuid.UUID, int]" = OrderedDict()
+        self._building: Dict[int, int] = {} # Версия начала сборки -> число сборок
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, iiko_uid: str) -> Optional[CachedBundle]:
+        entry = self._entries.get(iiko_uid)
+        if entry is None:
+            return None
+        expires_at, bundle = entry
+        if expires_at < time.monotonic():
+            self._drop(iiko_uid)
+            return None
+        self._entries.move_to_end(iiko_uid)
+        return bundle
+
+    def begin_build(self) -> int:
+        """Отметить начало сборки пакета (ДО чтения из БД). Парный вызов - end_build."""
+        self._building[self.version] = self._building.get(self.version, 0) + 1
+        return self.version
+
+    def end_build(self, version: int) -> None:
+        count = self._building.pop(version) - 1
+        if count:
+            self._building[version] = count
+        self._prune_changed()
+
+    def put(self, iiko_uid: str, version: int, bundle: CachedBundle) -> None:
+        """
+        Сохранить пакет, собранный начиная с версии version (begin_build): если за время
+        сборки изменилась одна из его записей, пакет может быть устаревшим и не кешируется.
+        """
+        if any(self._changed.get(id, 0) > version for id in bundle.members):
+            return
+        self._drop(iiko_uid)
+        self._entries[iiko_uid] = (time.monotonic() + self.ttl, bundle)
+        for id in bundle.members:
+            self._by_member.setdefault(id, set()).add(iiko_uid)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def discard(self, iiko_uid: str) -> None:
+        """Убрать пакет, который оказался устаревшим (отпечаток в БД другой)."""
+        self._drop(iiko_uid)
+
+    def _drop(self, iiko_uid: str) -> None:
+        entry = self._entries.pop(iiko_uid, None)
+        if entry is None:
+            return
+        for id in entry[1].members:
+            keys = self._by_member.get(id)
+            if keys is not None:
+                keys.discard(iiko_uid)
+                if not keys:
+                    del self._by_member[id]
+
+    def apply_changes(self, changes: List[Change]) -> None:
+        affected: Set[uuid.UUID] = set()
+        for change in changes:
+            fields = PARENT_FIELDS.get(type(change.obj))
+            if fields is None:
+                continue
+            affected.add(change.obj.id)
+            for name in fields:
+                affected.add(getattr(change.obj, name))
+                affected.add(change.previous.get(name))
+        affected.discard(None)
+        if not affected:
+            return
+        self.version += 1
+        for id in affected:
+            if self._building:
+                self._changed[id] = self.version
+                self._changed.move_to_end(id)
+            for iiko_uid in list(self._by_member.get(id, ())):
+                self._drop(iiko_uid)
+
+    def _prune_changed(self) -> None:
+        """Забыть изменения, которые произошли до начала всех идущих сборок."""
+        oldest = min(self._building, default=self.version)
+        while self._changed:
+            id, version = next(iter(self._changed.items()))
+            if version > oldest:
+                break
+            del self._changed[id]
+
+
+bundle_cache = BundleCache(ttl=settings.BUNDLE_CACHE_TTL, max_entries=settings.BUNDLE_CACHE_MAX_ENTRIES)
+subscribe(bundle_cache.apply_changes)
@@ -0,0 +1,55 @@
+# app/crud/count_cache.py
+# Кеш точных count(*) для заголовка X-Total-Count (режим cached).
+#
+# У каждой таблицы есть счетчик ревизий, который увеличивается при каждом
+# закоммиченном изменении ее строк в этом процессе (подписка на app/db/events).
+# Значение в кеше действительно, пока ревизия таблицы не изменилась и не истек TTL.
+# TTL нужен для изменений из других процессов и массовых UPDATE/DELETE через Core,
+# о которых подписчик не узнает.
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db.events import Change, subscribe
+
+
+class CountCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._revisions: Dict[str, int] = defaultdict(int)
+        # (таблица, ключ запроса) -> (ревизия таблицы, момент истечения, значение)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[int, float, int]]" = OrderedDict()
+
+    def revision(self, table: str) -> int:
+        return self._revisions[table]
+
+    def get(self, table: str, key: Hashable) -> Optional[int]:
+        entry = self._entries.get((table, key))
+        if entry is None:
+            return None
+        revision, expires_at, value = entry
+        if revision != self._revisions[table] or expires_at < time.monotonic():
+            del self._entries[(table, key)]
+            return None
+        self._entries.move_to_end((table, key))
+        return value
+
+    def put(self, table: str, key: Hashable, revision: int, value: int) -> None:
+        """
+        Сохранить значение, посчитанное при ревизии revision (взятой ДО запроса):
+        если таблица изменилась во время подсчета, значение сразу окажется устаревшим.
+        """
+        self._entries[(table, key)] = (revision, time.monotonic() + self.ttl, value)
+        self._entries.move_to_end((table, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def apply_changes(self, changes: List[Change]) -> None:
+        for table in {change.obj.__tablename__ for change in changes}:
+            self._revisions[table] += 1
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL, max_entries=settings.COUNT_CACHE_MAX_ENTRIES)
+subscribe(count_cache.apply_changes)
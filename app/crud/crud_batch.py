@@ -0,0 +1,189 @@
+# app/crud/crud_batch.py
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.crud.crud_company import company
+from app.crud.crud_fiscal_registrar import fiscal_registrar
+from app.crud.crud_point import point
+from app.crud.crud_server import server
+from app.crud.crud_workstation import workstation
+from app.models.base import BaseUUIDModel
+from app.schemas.batch import BatchEntity, BatchOperation, BatchOpType
+from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.schemas.fiscal_registrar import FiscalRegistrarCreate, FiscalRegistrarUpdate
+from app.schemas.point import PointCreate, PointUpdate
+from app.schemas.server import ServerCreate, ServerUpdate
+from app.schemas.workstation import WorkstationCreate, WorkstationUpdate
+
+# Сущность -> (CRUD, схема создания, схема обновления)
+ENTITIES: Dict[BatchEntity, Tuple[CRUDBase[Any, Any, Any], Type[BaseModel], Type[BaseModel]]] = {
+    BatchEntity.COMPANY: (company, CompanyCreate, CompanyUpdate),
+    BatchEntity.POINT: (point, PointCreate, PointUpdate),
+    BatchEntity.SERVER: (server, ServerCreate, ServerUpdate),
+    BatchEntity.WORKSTATION: (workstation, WorkstationCreate, WorkstationUpdate),
+    BatchEntity.FISCAL_REGISTRAR: (fiscal_registrar, FiscalRegistrarCreate, FiscalRegistrarUpdate),
+}
+
+REF_PREFIX = "$"
+
+
+class BatchOperationError(Exception):
+    """Ошибка операции пакета; весь пакет откатывается. index - номер операции (None - ошибка при записи)."""
+    def __init__(self, index: Optional[int], message: str, status_code: int = 422):
+        super().__init__(message)
+        self.index = index
+        self.message = message
+        self.status_code = status_code
+
+
+class CRUDBatch:
+    """
+    Выполнение упорядоченного списка create/update/delete в одной транзакции.
+    Объекты создаются с UUID на стороне приложения, поэтому ссылки "$<ref>" на
+    созданные в этом же пакете объекты разрешаются без промежуточных flush.
+    Все изменения отправляются в БД одним flush в конце: SQLAlchemy упорядочивает
+    их по внешним ключам и группирует однотипные INSERT в пакетные запросы.
+    Записи для update/delete загружаются заранее - одним запросом на сущность.
+    Уникальность и существование родителей проверяют ограничения БД (ошибка - 409).
+    """
+    def _resolve(self, index: int, value: str, refs: Dict[str, BaseUUIDModel]) -> uuid.UUID:
+        if value.startswith(REF_PREFIX):
+            name = value[len(REF_PREFIX):]
+            if name not in refs:
+                raise BatchOperationError(index, f"Unknown reference '{value}'")
+            return refs[name].id
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            raise BatchOperationError(index, f"Invalid id '{value}'")
+
+    def _resolve_data(self, index: int, data: Optional[Dict[str, Any]], refs: Dict[str, BaseUUIDModel]) -> Dict[str, Any]:
+        """Заменить ссылки "$<ref>" в полях *_id на UUID созданных объектов."""
+        resolved = dict(data or {})
+        for key, value in resolved.items():
+            if key.endswith("_id") and isinstance(value, str) and value.startswith(REF_PREFIX):
+                resolved[key] = str(self._resolve(index, value, refs))
+        return resolved
+
+    def _validate(self, index: int, schema: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+        try:
+            return schema.model_validate(data)
+        except ValidationError as e:
+            raise BatchOperationError(index, f"Invalid data: {e.errors(include_url=False)}")
+
+    async def _preload(
+        self, db: AsyncSession, operations: Sequence[BatchOperation]
+    ) -> Dict[Tuple[BatchEntity, uuid.UUID], BaseUUIDModel]:
+        """Загрузить существующие записи для update/delete: один запрос WHERE id = ANY на сущность."""
+        wanted: Dict[BatchEntity, List[uuid.UUID]] = {}
+        for index, operation in enumerate(operations):
+            if operation.op == BatchOpType.CREATE:
+                continue
+            if not operation.id:
+                raise BatchOperationError(index, f"id is required for {operation.op.value}")
+            if not operation.id.startswith(REF_PREFIX):
+                wanted.setdefault(operation.entity, []).append(self._resolve(index, operation.id, {}))
+        loaded = {}
+        for entity, ids in wanted.items():
+            # Блокировка до коммита пакета: параллельные изменения тех же записей ждут (см. CRUDBase._locked)
+            items, _ = await ENTITIES[entity][0].get_many(db, ids, for_update=True)
+            loaded.update({(entity, obj.id): obj for obj in items})
+        return loaded
+
+    async def _apply(
+        self,
+        db: AsyncSession,
+        index: int,
+        operation: BatchOperation,
+        refs: Dict[str, BaseUUIDModel],
+        loaded: Dict[Tuple[BatchEntity, uuid.UUID], BaseUUIDModel],
+    ) -> BaseUUIDModel:
+        crud_obj, create_schema, update_schema = ENTITIES[operation.entity]
+        data = self._resolve_data(index, operation.data, refs)
+
+        if operation.op == BatchOpType.CREATE:
+            if operation.ref and operation.ref in refs:
+                raise BatchOperationError(index, f"Duplicate ref '{operation.ref}'")
+            obj_in = self._validate(index, create_schema, data)
+            obj = crud_obj.model(**obj_in.model_dump()) # id генерируется здесь, до записи в БД
+            db.add(obj)
+            if operation.ref:
+                refs[operation.ref] = obj
+            return obj
+
+        obj_id = self._resolve(index, operation.id, refs)
+        if operation.id.startswith(REF_PREFIX):
+            obj = refs[operation.id[len(REF_PREFIX):]]
+        else:
+            obj = loaded.get((operation.entity, obj_id))
+        if obj is None or not isinstance(obj, crud_obj.model):
+            raise BatchOperationError(index, f"{operation.entity.value} {obj_id} not found", status_code=404)
+        created = obj in db.new
+
+        if operation.op == BatchOpType.UPDATE:
+            update_data = self._validate(index, update_schema, data).model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                if hasattr(obj, field):
+                    setattr(obj, field, value)
+            # Ревизия - как в CRUDBase.update; у созданных в пакете объектов остается 1
+            if not created and db.is_modified(obj):
+                obj.revision += 1
+            return obj
+
+        # DELETE: еще не записанный объект просто убираем из сессии
+        if created:
+            db.expunge(obj)
+        else:
+            await db.delete(obj)
+        return obj
+
+    async def execute(self, db: AsyncSession, operations: Sequence[BatchOperation]) -> List[Dict[str, Any]]:
+        """Выполнить операции по порядку и закоммитить все вместе; при любой ошибке - откат."""
+        refs: Dict[str, BaseUUIDModel] = {}
+        applied: List[Tuple[int, BatchOperation, BaseUUIDModel]] = []
+        try:
+            loaded = await self._preload(db, operations)
+            with db.no_autoflush:
+                for index, operation in enumerate(operations):
+                    applied.append((index, operation, await self._apply(db, index, operation, refs, loaded)))
+                # Изменения существующих записей (не созданных в пакете и не удаленных)
+                updated: Dict[Type[Any], List[uuid.UUID]] = {}
+                for obj in db.dirty:
+                    if isinstance(obj, BaseUUIDModel) and obj not in db.deleted:
+                        updated.setdefault(type(obj), []).append(obj.id)
+            await db.flush()
+
+            # updated_at обновляется на стороне БД - перечитываем измененные записи пакетно
+            for model, ids in updated.items():
+                await db.execute(
+                    select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+                )
+            await db.commit()
+        except BatchOperationError:
+            await db.rollback()
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            raise BatchOperationError(None, f"Constraint violation: {e.orig}", status_code=409)
+
+        deleted = {id(obj) for _, operation, obj in applied if operation.op == BatchOpType.DELETE}
+        return [
+            {
+                "index": index,
+                "op": operation.op,
+                "entity": operation.entity,
+                "ref": operation.ref,
+                "id": obj.id,
+                "data": None if id(obj) in deleted else obj.model_dump(),
+            }
+            for index, operation, obj in applied
+        ]
+
+
+batch = CRUDBatch()
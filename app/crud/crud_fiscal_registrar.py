@@ -1,12 +1,18 @@
 # app/crud/crud_fiscal_registrar.py
 import uuid
-from typing import List, Optional
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Date, Select, cast, delete, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.models.company import Company
+from app.models.fiscal_drive_expiry import FiscalDriveExpiryCount
 from app.models.fiscal_registrar import FiscalRegistrar # Модель таблицы
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
 from app.schemas.fiscal_registrar import FiscalRegistrarCreate, FiscalRegistrarUpdate # Схемы
 
 class CRUDFiscalRegistrar(CRUDBase[FiscalRegistrar, FiscalRegistrarCreate, FiscalRegistrarUpdate]):
@@ -19,7 +25,8 @@ class CRUDFiscalRegistrar(CRUDBase[FiscalRegistrar, FiscalRegistrarCreate, Fisca
         return result.scalar_one_or_none()
 
     async def get_multi_by_workstation(
-        self, db: AsyncSession, *, workstation_id: uuid.UUID, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, workstation_id: uuid.UUID, skip: int = 0, limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[FiscalRegistrar]:
         """Получить ФР для конкретной рабочей станции."""
         statement = (
@@ -28,9 +35,120 @@ class CRUDFiscalRegistrar(CRUDBase[FiscalRegistrar, FiscalRegistrarCreate, Fisca
             .offset(skip)
             .limit(limit)
         )
+        statement = self.with_fields(statement, fields)
         result = await db.execute(statement)
         return result.scalars().all()
 
+    def filtered_statement(self, *, workstation_id: Optional[uuid.UUID] = None) -> Select:
+        """Запрос списка ФР с фильтрами (используется и для подсчета X-Total-Count)."""
+        statement = select(self.model)
+        if workstation_id:
+            statement = statement.where(self.model.workstation_id == workstation_id)
+        return statement
+
+    async def get_expiring(
+        self,
+        db: AsyncSession,
+        *,
+        date_from: date,
+        date_to: date,
+        company_id: Optional[uuid.UUID] = None,
+        after: Optional[Tuple[date, uuid.UUID]] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        ФР, чей ФН истекает в [date_from, date_to], с рабочей станцией, точкой, компанией и сервером.
+        Keyset-пагинация по (fiscal_drive_expiry_date, id): `after` - последняя пара предыдущей страницы.
+        Использует индекс ix_fiscalregistrar_expiry_date_id, стоимость не зависит от номера страницы.
+        """
+        fr = self.model
+        statement = (
+            select(
+                fr.id, fr.model, fr.serial_number, fr.fiscal_drive_number, fr.fiscal_drive_expiry_date,
+                fr.workstation_id, Workstation.name.label("workstation_name"),
+                Point.id.label("point_id"), Point.name.label("point_name"), Point.address.label("point_address"),
+                Company.id.label("company_id"), Company.name.label("company_name"),
+                Server.id.label("server_id"), Server.name.label("server_name"), Server.iiko_uid.label("server_iiko_uid"),
+            )
+            .join(Workstation, fr.workstation_id == Workstation.id)
+            .join(Point, Workstation.point_id == Point.id)
+            .join(Company, Point.company_id == Company.id)
+            .join(Server, Workstation.server_id == Server.id)
+            .where(fr.fiscal_drive_expiry_date.between(date_from, date_to))
+            .order_by(fr.fiscal_drive_expiry_date, fr.id)
+            .limit(limit)
+        )
+        if company_id:
+            statement = statement.where(Point.company_id == company_id)
+        if after:
+            statement = statement.where(tuple_(fr.fiscal_drive_expiry_date, fr.id) > tuple_(*after))
+        result = await db.execute(statement)
+        return [dict(row._mapping) for row in result]
+
+    async def get_expiry_summary(
+        self,
+        db: AsyncSession,
+        *,
+        date_from: date,
+        date_to: date,
+        company_id: Optional[uuid.UUID] = None,
+        top_companies: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Сводка по неделям и компаниям из предрасчитанной таблицы FiscalDriveExpiryCount.
+        Окно округляется до целых недель (с понедельника недели date_from).
+        """
+        counts = FiscalDriveExpiryCount
+        window = [
+            counts.week_start >= date_from - timedelta(days=date_from.weekday()),
+            counts.week_start <= date_to,
+            counts.count > 0,
+        ]
+        if company_id:
+            window.append(counts.company_id == company_id)
+
+        by_week = await db.execute(
+            select(counts.week_start, func.sum(counts.count).label("count"))
+            .where(*window)
+            .group_by(counts.week_start)
+            .order_by(counts.week_start)
+        )
+        by_company = await db.execute(
+            select(counts.company_id, Company.name.label("company_name"), func.sum(counts.count).label("count"))
+            .join(Company, counts.company_id == Company.id)
+            .where(*window)
+            .group_by(counts.company_id, Company.name)
+            .order_by(func.sum(counts.count).desc())
+            .limit(top_companies)
+        )
+        weeks = [dict(row._mapping) for row in by_week]
+        return {
+            "total": sum(w["count"] for w in weeks),
+            "by_week": weeks,
+            "by_company": [dict(row._mapping) for row in by_company],
+        }
+
+    async def rebuild_expiry_counts(self, db: AsyncSession) -> None:
+        """
+        Полностью пересчитать FiscalDriveExpiryCount.
+        Обычно таблицу поддерживает триггер; пересчет нужен после ручных правок
+        привязки рабочих станций к точкам или точек к компаниям.
+        """
+        week = cast(func.date_trunc("week", self.model.fiscal_drive_expiry_date), Date)
+        source = (
+            select(Point.company_id, week, func.count())
+            .select_from(self.model)
+            .join(Workstation, self.model.workstation_id == Workstation.id)
+            .join(Point, Workstation.point_id == Point.id)
+            .where(self.model.fiscal_drive_expiry_date.is_not(None))
+            .group_by(Point.company_id, week)
+        )
+        await db.execute(delete(FiscalDriveExpiryCount))
+        await db.execute(
+            insert(FiscalDriveExpiryCount).from_select(["company_id", "week_start", "count"], source)
+        )
+        await db.commit()
+
     # Можно добавить другие специфичные методы
 
 fiscal_registrar = CRUDFiscalRegistrar(FiscalRegistrar)
\ No newline at end of file
@@ -0,0 +1,72 @@
+# app/crud/crud_history.py
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import history as history_hook # Регистрирует запись истории перед flush
+from app.models.history import EntityRevision
+
+
+class CRUDHistory:
+    """
+    Чтение истории изменений (таблица entityrevision).
+    Состояние на момент времени восстанавливается из ближайшего снимка и diff после него,
+    поэтому читается не больше HISTORY_SNAPSHOT_INTERVAL строк независимо от длины истории.
+    """
+    model = EntityRevision
+
+    async def get_history(
+        self, db: AsyncSession, *, entity: str, entity_id: uuid.UUID, skip: int = 0, limit: int = 100
+    ) -> List[EntityRevision]:
+        """Ревизии сущности, начиная с последней."""
+        statement = (
+            select(self.model)
+            .where(self.model.entity == entity, self.model.entity_id == entity_id)
+            .order_by(self.model.revision.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    async def get_as_of(
+        self, db: AsyncSession, *, entity: str, entity_id: uuid.UUID, as_of: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Состояние сущности на момент as_of (словарь полей, как в схеме чтения).
+        None - сущность тогда еще не существовала, уже была удалена или история до as_of не велась.
+        """
+        in_range = (
+            self.model.entity == entity,
+            self.model.entity_id == entity_id,
+            self.model.changed_at <= as_of,
+        )
+        # Последний снимок до as_of: обратный проход по первичному ключу
+        base_revision = (
+            select(self.model.revision)
+            .where(*in_range, self.model.snapshot.is_not(None))
+            .order_by(self.model.revision.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(self.model)
+            .where(*in_range, self.model.revision >= base_revision)
+            .order_by(self.model.revision)
+        )
+        revisions = result.scalars().all()
+        if not revisions or revisions[-1].op == history_hook.DELETE:
+            return None
+
+        state = dict(revisions[0].snapshot)
+        for revision in revisions[1:]:
+            state.update(revision.changes or {})
+        last = revisions[-1]
+        state.update(id=entity_id, revision=last.revision, updated_at=last.changed_at)
+        return state
+
+
+history = CRUDHistory()
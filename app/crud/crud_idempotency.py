@@ -0,0 +1,96 @@
+# app/crud/crud_idempotency.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyKey
+
+
+class CRUDIdempotency:
+    """Хранилище ключей идемпотентности (таблица idempotencykey)."""
+    model = IdempotencyKey
+
+    async def reserve(
+        self, db: AsyncSession, *, scope: str, key: str, fingerprint: str, ttl: int, lock_timeout: int
+    ) -> Tuple[bool, Optional[IdempotencyKey]]:
+        """
+        Занять ключ для выполнения запроса на lock_timeout секунд.
+        Возвращает (True, None), если ключ новый, прежняя запись истекла или прежний
+        запрос не завершился за lock_timeout (процесс упал посреди запроса),
+        иначе (False, существующая запись) - выполняемая или с готовым ответом.
+        Занятие - один INSERT ... ON CONFLICT, поэтому гонка двух одинаковых
+        запросов (в том числе в разных процессах) разрешается в БД.
+        """
+        now = datetime.now(timezone.utc)
+        values = {
+            "scope": scope,
+            "key": key,
+            "fingerprint": fingerprint,
+            "status_code": None,
+            "response_headers": None,
+            "response_body": None,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+            "locked_until": now + timedelta(seconds=lock_timeout),
+        }
+        statement = insert(self.model).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.scope, self.model.key],
+            set_={name: statement.excluded[name] for name in values if name not in ("scope", "key")},
+            where=or_(
+                self.model.expires_at < func.now(),
+                and_(
+                    self.model.status_code.is_(None),
+                    # NULL - записи, созданные до появления locked_until
+                    or_(self.model.locked_until.is_(None), self.model.locked_until < func.now()),
+                ),
+            ),
+        ).returning(self.model.key)
+        reserved = (await db.execute(statement)).first() is not None
+        existing = None
+        if not reserved:
+            result = await db.execute(
+                select(self.model).where(self.model.scope == scope, self.model.key == key)
+            )
+            existing = result.scalar_one_or_none()
+        await db.commit()
+        return reserved, existing
+
+    async def complete(
+        self,
+        db: AsyncSession,
+        *,
+        scope: str,
+        key: str,
+        status_code: int,
+        headers: List[List[str]],
+        body: bytes,
+    ) -> None:
+        """Сохранить ответ выполненного запроса."""
+        await db.execute(
+            update(self.model)
+            .where(self.model.scope == scope, self.model.key == key)
+            .values(status_code=status_code, response_headers=headers, response_body=body, locked_until=None)
+        )
+        await db.commit()
+
+    async def release(self, db: AsyncSession, *, scope: str, key: str) -> None:
+        """Освободить ключ (запрос упал) - повтор с тем же ключом выполнится заново."""
+        await db.execute(
+            delete(self.model).where(
+                self.model.scope == scope, self.model.key == key, self.model.status_code.is_(None)
+            )
+        )
+        await db.commit()
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        """Удалить истекшие записи. Возвращает количество удаленных."""
+        result = await db.execute(delete(self.model).where(self.model.expires_at < func.now()))
+        await db.commit()
+        return result.rowcount
+
+
+idempotency = CRUDIdempotency()
@@ -0,0 +1,176 @@
+# app/crud/crud_job.py
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.enums import JobStatus
+from app.models.job import Job, JobResultPage # Модели таблиц
+from app.schemas.job import JobCreate # Схемы
+
+class CRUDJob(CRUDBase[Job, JobCreate, JobCreate]):
+    # Изменения выполняющейся задачи применяются, только если она все еще выполняется
+    # этим воркером: задачу, возвращенную в очередь как зависшую, может уже выполнять
+    # другой воркер, и поздний результат первого не должен перезаписать его работу
+    def _owned(self, job_id: uuid.UUID, worker_id: str):
+        return (
+            self.model.id == job_id,
+            self.model.status == JobStatus.RUNNING,
+            self.model.worker_id == worker_id,
+        )
+
+    async def claim(
+        self, db: AsyncSession, *, job_type: str, limit: int, worker_id: str
+    ) -> List[Job]:
+        """
+        Забрать до `limit` задач из очереди для указанного типа.
+        FOR UPDATE SKIP LOCKED позволяет нескольким воркерам конкурентно
+        разбирать очередь, не блокируя друг друга и не беря одну задачу дважды.
+        """
+        statement = (
+            select(self.model)
+            .where(self.model.status == JobStatus.QUEUED, self.model.job_type == job_type)
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(statement)
+        jobs = list(result.scalars().all())
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            job.status = JobStatus.RUNNING
+            job.worker_id = worker_id
+            job.started_at = now
+            job.heartbeat_at = now
+            job.attempts += 1
+            job.revision += 1
+        await db.commit()
+        return jobs
+
+    async def set_progress(
+        self, db: AsyncSession, *, job_id: uuid.UUID, worker_id: str, progress: float, message: Optional[str] = None
+    ) -> bool:
+        """
+        Обновить прогресс задачи (и заодно heartbeat) одним UPDATE.
+        False - задача больше не принадлежит воркеру.
+        """
+        statement = (
+            update(self.model)
+            .where(*self._owned(job_id, worker_id))
+            .values(
+                progress=progress,
+                progress_message=message,
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+        )
+        result = await db.execute(statement)
+        await db.commit()
+        return bool(result.rowcount)
+
+    async def finish(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: uuid.UUID,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Отметить задачу как завершенную (успешно или с ошибкой).
+        False - задача больше не принадлежит воркеру, результат не сохранен.
+        """
+        values: Dict[str, Any] = {
+            "status": JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+            "result": result,
+            "error": error,
+            "finished_at": datetime.now(timezone.utc),
+            "revision": self.model.revision + 1,
+        }
+        if not error:
+            values["progress"] = 1.0
+        statement = update(self.model).where(*self._owned(job_id, worker_id)).values(**values)
+        updated = await db.execute(statement)
+        await db.commit()
+        return bool(updated.rowcount)
+
+    async def heartbeat(self, db: AsyncSession, *, job_ids: List[uuid.UUID], worker_id: str) -> None:
+        """Продлить heartbeat для выполняющихся задач воркера."""
+        if not job_ids:
+            return
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id.in_(job_ids),
+                self.model.status == JobStatus.RUNNING,
+                self.model.worker_id == worker_id,
+            )
+            .values(heartbeat_at=datetime.now(timezone.utc))
+        )
+        await db.execute(statement)
+        await db.commit()
+
+    async def release(self, db: AsyncSession, *, job_id: uuid.UUID, worker_id: str) -> None:
+        """
+        Вернуть задачу в очередь при штатной остановке воркера.
+        Такая попытка не считается в attempts (см. requeue_stale).
+        """
+        statement = (
+            update(self.model)
+            .where(*self._owned(job_id, worker_id))
+            .values(status=JobStatus.QUEUED, worker_id=None, attempts=self.model.attempts - 1)
+        )
+        await db.execute(statement)
+        await db.commit()
+
+    async def requeue_stale(self, db: AsyncSession, *, stale_before: datetime, max_attempts: int) -> int:
+        """
+        Вернуть в очередь задачи, чей воркер перестал обновлять heartbeat
+        (например, процесс был убит во время выполнения). Задачи, исчерпавшие
+        max_attempts попыток, помечаются FAILED: задача, которая роняет воркер,
+        не должна перезапускаться бесконечно. Возвращает число затронутых задач.
+        """
+        stale = (self.model.status == JobStatus.RUNNING, self.model.heartbeat_at < stale_before)
+        failed = await db.execute(
+            update(self.model)
+            .where(*stale, self.model.attempts >= max_attempts)
+            .values(
+                status=JobStatus.FAILED,
+                worker_id=None,
+                error=f"Worker stopped responding during {max_attempts} attempts",
+                finished_at=datetime.now(timezone.utc),
+                revision=self.model.revision + 1,
+            )
+        )
+        requeued = await db.execute(
+            update(self.model)
+            .where(*stale, self.model.attempts < max_attempts)
+            .values(status=JobStatus.QUEUED, worker_id=None)
+        )
+        await db.commit()
+        return (failed.rowcount or 0) + (requeued.rowcount or 0)
+
+    async def clear_result_pages(self, db: AsyncSession, *, job_id: uuid.UUID) -> None:
+        """Удалить страницы результата (остатки прерванной попытки)."""
+        await db.execute(delete(JobResultPage).where(JobResultPage.job_id == job_id))
+        await db.commit()
+
+    async def put_result_page(
+        self, db: AsyncSession, *, job_id: uuid.UUID, page: int, items: List[Dict[str, Any]]
+    ) -> None:
+        """Записать страницу результата (повторная запись той же страницы заменяет ее)."""
+        statement = insert(JobResultPage).values(job_id=job_id, page=page, items=items)
+        statement = statement.on_conflict_do_update(
+            index_elements=[JobResultPage.job_id, JobResultPage.page], set_={"items": statement.excluded["items"]},
+        )
+        await db.execute(statement)
+        await db.commit()
+
+    async def get_result_page(self, db: AsyncSession, *, job_id: uuid.UUID, page: int) -> Optional[JobResultPage]:
+        return await db.get(JobResultPage, (job_id, page))
+
+job = CRUDJob(Job)
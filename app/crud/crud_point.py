@@ -1,8 +1,8 @@
 # app/crud/crud_point.py
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
@@ -11,7 +11,8 @@ from app.schemas.point import PointCreate, PointUpdate # Схемы
 
 class CRUDPoint(CRUDBase[Point, PointCreate, PointUpdate]):
     async def get_multi_by_company(
-        self, db: AsyncSession, *, company_id: uuid.UUID, skip: int = 0, limit: int = 100
+        self, db: AsyncSession, *, company_id: uuid.UUID, skip: int = 0, limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[Point]:
         """Получить точки для конкретной компании."""
         statement = (
@@ -20,9 +21,17 @@ class CRUDPoint(CRUDBase[Point, PointCreate, PointUpdate]):
             .offset(skip)
             .limit(limit)
         )
+        statement = self.with_fields(statement, fields)
         result = await db.execute(statement)
         return result.scalars().all()
 
+    def filtered_statement(self, *, company_id: Optional[uuid.UUID] = None) -> Select:
+        """Запрос списка точек с фильтрами (используется и для подсчета X-Total-Count)."""
+        statement = select(self.model)
+        if company_id:
+            statement = statement.where(self.model.company_id == company_id)
+        return statement
+
     # Можно добавить другие специфичные методы
 
 point = CRUDPoint(Point)
\ No newline at end of file
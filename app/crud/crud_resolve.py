@@ -0,0 +1,262 @@
+# app/crud/crud_resolve.py
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.events import Change, DELETE, INSERT, subscribe
+from app.models.company import Company
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+from app.schemas.resolve import IdentifierKind
+from app.schemas.server import IIKO_UID_REGEX, ServerBase
+
+# Какие колонки каких моделей индексируются и каким видом идентификатора они являются
+INDEXED_FIELDS: Dict[Type[Any], Tuple[Tuple[IdentifierKind, str], ...]] = {
+    Company: ((IdentifierKind.INN, "billing_inn"), (IdentifierKind.INN, "iiko_inn")),
+    Server: ((IdentifierKind.IIKO_UID, "iiko_uid"), (IdentifierKind.PARTNER_PORTAL_ID, "partner_portal_id")),
+    FiscalRegistrar: (
+        (IdentifierKind.SERIAL_NUMBER, "serial_number"),
+        (IdentifierKind.REGISTRATION_NUMBER, "registration_number"),
+        (IdentifierKind.FISCAL_DRIVE_NUMBER, "fiscal_drive_number"),
+    ),
+}
+ENTITY_NAMES = {Company: "company", Server: "server", FiscalRegistrar: "fiscal_registrar"}
+KIND_MODELS = {kind: model for model, fields in INDEXED_FIELDS.items() for kind, _ in fields}
+
+# Компактное представление: вид - номер в списке, UUID - 16 байт
+_KINDS = list(IdentifierKind)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+_Entry = Tuple[int, bytes]
+
+BUILD_CHUNK_SIZE = 10000
+
+
+def has_value(obj: Any, kind: IdentifierKind, value: str) -> bool:
+    """Совпадает ли значение хотя бы одной колонки вида kind у загруженной записи."""
+    return any(getattr(obj, name) == value for k, name in INDEXED_FIELDS[type(obj)] if k == kind)
+
+
+def classify(identifier: str) -> Tuple[str, List[IdentifierKind]]:
+    """
+    Определить по формату, чем может быть идентификатор.
+    Возвращает нормализованное значение и список подходящих видов.
+    """
+    value = identifier.strip()
+    if "clientId=" in value:
+        # Ссылка на партнерский портал - извлекаем ID тем же валидатором, что и при сохранении
+        try:
+            return ServerBase.extract_and_validate_partner_id(value), [IdentifierKind.PARTNER_PORTAL_ID]
+        except ValueError:
+            return value, []
+    if IIKO_UID_REGEX.match(value):
+        return value, [IdentifierKind.IIKO_UID]
+
+    kinds = []
+    if value.isdigit():
+        if len(value) in (10, 12): # ИНН ЮЛ = 10, ИП = 12
+            kinds.append(IdentifierKind.INN)
+        if len(value) <= 10:
+            kinds.append(IdentifierKind.PARTNER_PORTAL_ID)
+        if len(value) == 16: # РНМ и номер ФН - 16 цифр
+            kinds.extend([IdentifierKind.REGISTRATION_NUMBER, IdentifierKind.FISCAL_DRIVE_NUMBER])
+    # Серийные номера ФР бывают любого формата
+    kinds.append(IdentifierKind.SERIAL_NUMBER)
+    return value, kinds
+
+
+class IdentifierIndex:
+    """
+    In-memory индекс: идентификатор -> кортеж (код вида, 16 байт UUID).
+    Строится целиком при старте и поддерживается подписчиком на коммиты.
+    Изменения из других процессов сюда не попадают, поэтому попадания проверяются
+    загрузкой из БД (запись есть и значение колонки совпадает, иначе запись удаляется
+    из индекса), а промахи - обращением к БД (см. CRUDResolve).
+    """
+    def __init__(self):
+        self._entries: Dict[str, Tuple[_Entry, ...]] = {}
+        self._replay: Optional[List[List[Change]]] = None # Изменения во время перестроения
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _add(entries: Dict[str, Tuple[_Entry, ...]], kind: IdentifierKind, value: Optional[str], id: uuid.UUID) -> None:
+        if not value:
+            return
+        entry = (_KIND_CODES[kind], id.bytes)
+        current = entries.get(value, ())
+        if entry not in current:
+            entries[value] = current + (entry,)
+
+    @staticmethod
+    def _remove(entries: Dict[str, Tuple[_Entry, ...]], kind: IdentifierKind, value: Optional[str], id: uuid.UUID) -> None:
+        if not value or value not in entries:
+            return
+        remaining = tuple(e for e in entries[value] if e != (_KIND_CODES[kind], id.bytes))
+        if remaining:
+            entries[value] = remaining
+        else:
+            del entries[value]
+
+    def add(self, kind: IdentifierKind, value: Optional[str], id: uuid.UUID) -> None:
+        self._add(self._entries, kind, value, id)
+
+    def discard(self, kind: IdentifierKind, value: Optional[str], id: uuid.UUID) -> None:
+        self._remove(self._entries, kind, value, id)
+
+    def lookup(self, value: str, kinds: Sequence[IdentifierKind]) -> List[Tuple[IdentifierKind, uuid.UUID]]:
+        codes = {_KIND_CODES[k] for k in kinds}
+        return [
+            (_KINDS[code], uuid.UUID(bytes=raw))
+            for code, raw in self._entries.get(value, ())
+            if code in codes
+        ]
+
+    async def build(self, db: AsyncSession) -> None:
+        """Полностью перестроить индекс, читая только нужные колонки потоково."""
+        self._replay = []
+        entries: Dict[str, Tuple[_Entry, ...]] = {}
+        try:
+            for model, fields in INDEXED_FIELDS.items():
+                columns = [model.id] + [getattr(model, name) for _, name in fields]
+                result = await db.stream(select(*columns).execution_options(yield_per=BUILD_CHUNK_SIZE))
+                async for row in result:
+                    for (kind, _), value in zip(fields, row[1:]):
+                        self._add(entries, kind, value, row[0])
+            # Изменения, закоммиченные во время чтения, применяем к новому индексу
+            for changes in self._replay:
+                self._apply(entries, changes)
+            self._entries = entries
+            self.ready = True
+        finally:
+            self._replay = None
+
+    def apply_changes(self, changes: List[Change]) -> None:
+        if self._replay is not None:
+            self._replay.append(changes)
+        self._apply(self._entries, changes)
+
+    def _apply(self, entries: Dict[str, Tuple[_Entry, ...]], changes: List[Change]) -> None:
+        for change in changes:
+            fields = INDEXED_FIELDS.get(type(change.obj))
+            if not fields:
+                continue
+            obj = change.obj
+            # У компании billing_inn и iiko_inn могут совпадать: не удаляем значение,
+            # если оно все еще есть в другой колонке того же вида
+            current = {(kind, getattr(obj, name)) for kind, name in fields}
+            for kind, name in fields:
+                if change.op == DELETE:
+                    self._remove(entries, kind, getattr(obj, name), obj.id)
+                elif change.op == INSERT:
+                    self._add(entries, kind, getattr(obj, name), obj.id)
+                elif name in change.previous:
+                    if (kind, change.previous[name]) not in current:
+                        self._remove(entries, kind, change.previous[name], obj.id)
+                    self._add(entries, kind, getattr(obj, name), obj.id)
+
+
+class CRUDResolve:
+    """Поиск сущности по одному идентификатору любого поддерживаемого вида."""
+    def __init__(self, index: IdentifierIndex):
+        self.index = index
+
+    async def _db_hits(
+        self, db: AsyncSession, value: str, kinds: Sequence[IdentifierKind]
+    ) -> List[Tuple[IdentifierKind, uuid.UUID]]:
+        """Запасной путь: найти ID прямыми запросами по индексированным колонкам."""
+        hits = []
+        for model, fields in INDEXED_FIELDS.items():
+            wanted = [(kind, name) for kind, name in fields if kind in kinds]
+            if not wanted:
+                continue
+            columns = [getattr(model, name) for _, name in wanted]
+            statement = select(model.id, *columns).where(or_(*[c == value for c in columns]))
+            for row in (await db.execute(statement)).all():
+                for (kind, _), column_value in zip(wanted, row[1:]):
+                    if column_value == value and (kind, row[0]) not in hits:
+                        hits.append((kind, row[0]))
+                        self.index.add(kind, value, row[0]) # Дополняем индекс найденным
+        return hits
+
+    async def _load_matches(
+        self, db: AsyncSession, value: str, hits: List[Tuple[IdentifierKind, uuid.UUID]]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Загрузить найденные сущности вместе с цепочкой родителей.
+        Попадания, у которых записи уже нет или значение колонки изменилось (например,
+        другим процессом), удаляются из индекса; второй элемент результата - были ли такие.
+        """
+        matches = []
+        stale = False
+        by_model: Dict[Type[Any], List[Tuple[IdentifierKind, uuid.UUID]]] = {}
+        for kind, id in hits:
+            by_model.setdefault(KIND_MODELS[kind], []).append((kind, id))
+
+        for model in (Company, Server):
+            model_hits = by_model.get(model, [])
+            if not model_hits:
+                continue
+            result = await db.execute(select(model).where(model.id.in_([id for _, id in model_hits])))
+            loaded = {obj.id: obj for obj in result.scalars().all()}
+            for kind, id in model_hits:
+                if id in loaded and has_value(loaded[id], kind, value):
+                    matches.append({"kind": kind, "entity": ENTITY_NAMES[model], ENTITY_NAMES[model]: loaded[id]})
+                else:
+                    stale = True
+                    self.index.discard(kind, value, id)
+
+        fr_hits = by_model.get(FiscalRegistrar, [])
+        if fr_hits:
+            statement = (
+                select(FiscalRegistrar, Workstation, Point, Company, Server)
+                .join(Workstation, FiscalRegistrar.workstation_id == Workstation.id)
+                .join(Point, Workstation.point_id == Point.id)
+                .join(Company, Point.company_id == Company.id)
+                .join(Server, Workstation.server_id == Server.id)
+                .where(FiscalRegistrar.id.in_([id for _, id in fr_hits]))
+            )
+            loaded = {row[0].id: row for row in (await db.execute(statement)).all()}
+            for kind, id in fr_hits:
+                if id not in loaded or not has_value(loaded[id][0], kind, value):
+                    stale = True
+                    self.index.discard(kind, value, id)
+                    continue
+                fr, workstation, point, company, server = loaded[id]
+                matches.append({
+                    "kind": kind,
+                    "entity": "fiscal_registrar",
+                    "fiscal_registrar": fr,
+                    "workstation": workstation,
+                    "point": point,
+                    "company": company,
+                    "server": server,
+                })
+        return matches, stale
+
+    async def resolve(self, db: AsyncSession, *, identifier: str) -> Dict[str, Any]:
+        value, kinds = classify(identifier)
+        matches: List[Dict[str, Any]] = []
+        if kinds:
+            if self.index.ready:
+                hits = self.index.lookup(value, kinds)
+                if hits:
+                    matches, stale = await self._load_matches(db, value, hits)
+                    if stale:
+                        # Значение могло перейти к записи, которой нет в индексе
+                        matches = []
+            # Индекс еще не построен, промах или устаревшее попадание - идем в БД
+            if not matches:
+                matches, _ = await self._load_matches(db, value, await self._db_hits(db, value, kinds))
+        return {"identifier": value, "kinds": kinds, "matches": matches}
+
+
+identifier_index = IdentifierIndex()
+subscribe(identifier_index.apply_changes)
+
+resolve = CRUDResolve(identifier_index)
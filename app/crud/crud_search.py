@@ -0,0 +1,102 @@
+# app/crud/crud_search.py
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import ColumnElement, case, func, literal, select, text, union, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.company import Company
+from app.models.point import Point
+from app.models.server import Server
+from app.schemas.search import SearchResultType
+
+
+def escape_like(value: str) -> str:
+    """Экранировать спецсимволы LIKE, чтобы искать фрагмент буквально."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class CRUDSearch:
+    """
+    Глобальный поиск по фрагменту в компаниях (название, ИНН), точках и серверах.
+    Фильтрация - ILIKE '%q%', ранжирование - similarity() из pg_trgm по совпавшим колонкам.
+
+    Кандидаты берутся по каждой колонке отдельно: ILIKE + ORDER BY col <-> q LIMIT limit.
+    Для частых фрагментов ("ООО") такой запрос идет по GiST-индексу gist_trgm_ops в порядке
+    похожести и останавливается на limit совпадениях, для редких - планировщик выбирает
+    GIN и сортирует немногие совпадения. Лучшие limit строк по максимуму похожести среди
+    совпавших колонок всегда входят в объединение лучших limit по каждой колонке, поэтому
+    ранжирование точное, а стоимость не зависит от числа совпадений.
+    """
+    def _branch(
+        self,
+        result_type: SearchResultType,
+        model: Any,
+        title: ColumnElement,
+        subtitle: ColumnElement,
+        columns: Sequence[ColumnElement],
+        q: str,
+        pattern: str,
+        limit: int,
+    ):
+        matches = {c: c.ilike(pattern, escape="\\") for c in columns}
+        candidate_ids = union(*[
+            select(model.id).where(match).order_by(c.op("<->")(q)).limit(limit)
+            for c, match in matches.items()
+        ]).subquery()
+        # Похожесть только по колонкам, где фрагмент найден
+        score = func.coalesce(
+            func.greatest(*[case((match, func.similarity(c, q))) for c, match in matches.items()]), 0.0,
+        )
+        return (
+            select(
+                literal(result_type.value).label("type"),
+                model.id.label("id"),
+                title.label("title"),
+                subtitle.label("subtitle"),
+                score.label("score"),
+            )
+            .where(model.id.in_(select(candidate_ids.c.id)))
+            .order_by(score.desc())
+            .limit(limit)
+        )
+
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        q: str,
+        types: Optional[Sequence[SearchResultType]] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Найти объекты, содержащие фрагмент q. Результаты отсортированы по похожести."""
+        types = set(types or SearchResultType)
+        pattern = f"%{escape_like(q)}%"
+        branches = []
+        if SearchResultType.COMPANY in types:
+            branches.append(self._branch(
+                SearchResultType.COMPANY, Company, Company.name, Company.billing_inn,
+                [Company.name, Company.billing_inn, Company.iiko_inn], q, pattern, limit,
+            ))
+        if SearchResultType.POINT in types:
+            branches.append(self._branch(
+                SearchResultType.POINT, Point, Point.name, Point.address,
+                [Point.name, Point.address], q, pattern, limit,
+            ))
+        if SearchResultType.SERVER in types:
+            branches.append(self._branch(
+                SearchResultType.SERVER, Server, Server.name, Server.iiko_uid,
+                [Server.name, Server.address, Server.iiko_uid], q, pattern, limit,
+            ))
+
+        combined = union_all(*[b.subquery().select() for b in branches]).subquery()
+        statement = select(combined).order_by(combined.c.score.desc()).limit(limit)
+
+        # Жесткий бюджет времени: лучше быстро вернуть ошибку, чем держать соединение
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(settings.SEARCH_TIMEOUT_MS)}"))
+        result = await db.execute(statement)
+        rows = [dict(row._mapping) for row in result]
+        await db.rollback() # Завершаем транзакцию, чтобы сбросить SET LOCAL
+        return rows
+
+search = CRUDSearch()
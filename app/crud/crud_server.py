@@ -1,14 +1,48 @@
 # app/crud/crud_server.py
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, func, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.crud.crud_search import escape_like
+from app.models.enums import ConnectionType, LicenseType, ServerType
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
 from app.models.server import Server # Модель таблицы
+from app.models.workstation import Workstation
 from app.schemas.server import ServerCreate, ServerUpdate # Схемы
 
+# Ключ, под которым в записи connection_details хранится тип подключения
+CONNECTION_TYPE_KEY = "type"
+
+# Отпечаток состава пакета: число записей, сумма ревизий, последний updated_at.
+# Любое изменение записи увеличивает ревизию, добавление/удаление/перенос меняют число
+BundleStamp = Tuple[int, int, Optional[datetime]]
+
+
+def bundle_stamp(objects: Iterable[Any]) -> BundleStamp:
+    """Отпечаток по уже загруженным записям пакета (тот же, что считает get_bundle_stamp)."""
+    objects = list(objects)
+    return (
+        len(objects),
+        sum(obj.revision for obj in objects),
+        max((obj.updated_at for obj in objects), default=None),
+    )
+
+
+def connection_type_filter(column: Any, connection_type: ConnectionType) -> ColumnElement:
+    """
+    Условие "есть подключение такого типа" для JSONB-колонки connection_details.
+    Колонка может содержать как список подключений, так и одно подключение-объект,
+    поэтому проверяем оба варианта оператором @> (оба используют GIN jsonb_path_ops).
+    """
+    entry = {CONNECTION_TYPE_KEY: connection_type.value}
+    return or_(column.contains([entry]), column.contains(entry))
+
+
 class CRUDServer(CRUDBase[Server, ServerCreate, ServerUpdate]):
     async def get_by_iiko_uid(self, db: AsyncSession, *, iiko_uid: str) -> Optional[Server]:
         """Найти сервер по iiko_uid."""
@@ -16,6 +50,103 @@ class CRUDServer(CRUDBase[Server, ServerCreate, ServerUpdate]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    def filtered_statement(
+        self,
+        *,
+        connection_type: Optional[ConnectionType] = None,
+        server_type: Optional[ServerType] = None,
+        license_type: Optional[LicenseType] = None,
+        partner_portal_id: Optional[str] = None,
+        address: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> Select:
+        """
+        Запрос списка серверов с фильтрами. Каждый фильтр опирается на индекс:
+        license_type/server_type - составные индексы (..., id), partner_portal_id - B-tree,
+        address (фрагмент, ILIKE) - триграммный GIN, updated_since - (updated_at, id),
+        connection_type - GIN jsonb_path_ops. Проверка планов: benchmarks/query_plans.py.
+        """
+        statement = select(self.model)
+        if connection_type:
+            statement = statement.where(connection_type_filter(self.model.connection_details, connection_type))
+        if server_type:
+            statement = statement.where(self.model.server_type == server_type)
+        if license_type:
+            statement = statement.where(self.model.license_type == license_type)
+        if partner_portal_id:
+            statement = statement.where(self.model.partner_portal_id == partner_portal_id)
+        if address:
+            statement = statement.where(self.model.address.ilike(f"%{escape_like(address)}%", escape="\\"))
+        if updated_since:
+            # Инкрементальная выгрузка: порядок по времени изменения совпадает с индексом
+            return statement.where(self.model.updated_at >= updated_since).order_by(self.model.updated_at, self.model.id)
+        return statement.order_by(self.model.id)
+
+    async def get_multi_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> List[Server]:
+        """Получить список серверов с фильтрами (фильтрация на стороне БД, см. filtered_statement)."""
+        statement = self.with_fields(self.filtered_statement(**filters).offset(skip).limit(limit), fields)
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    async def get_bundle(self, db: AsyncSession, *, iiko_uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Пакет синхронизации сервера: сам сервер, его точки (point.server_id),
+        рабочие станции этих точек и их ФР. None - сервера с таким iiko_uid нет.
+        """
+        server = await self.get_by_iiko_uid(db, iiko_uid=iiko_uid)
+        if server is None:
+            return None
+        point_ids = select(Point.id).where(Point.server_id == server.id)
+        workstation_ids = select(Workstation.id).where(Workstation.point_id.in_(point_ids))
+        points = (await db.execute(
+            select(Point).where(Point.server_id == server.id).order_by(Point.id)
+        )).scalars().all()
+        workstations = (await db.execute(
+            select(Workstation).where(Workstation.point_id.in_(point_ids)).order_by(Workstation.id)
+        )).scalars().all()
+        fiscal_registrars = (await db.execute(
+            select(FiscalRegistrar).where(FiscalRegistrar.workstation_id.in_(workstation_ids)).order_by(FiscalRegistrar.id)
+        )).scalars().all()
+        return {
+            "revision": max(obj.revision for obj in [server, *points, *workstations, *fiscal_registrars]),
+            "server": server,
+            "points": points,
+            "workstations": workstations,
+            "fiscal_registrars": fiscal_registrars,
+        }
+
+    async def get_bundle_stamp(self, db: AsyncSession, *, iiko_uid: str) -> Optional[BundleStamp]:
+        """
+        Отпечаток пакета одним запросом по индексам ссылок на родителя, без загрузки записей:
+        им проверяется закешированный пакет, который могли изменить другие процессы.
+        None - сервера с таким iiko_uid нет.
+        """
+        server_ids = select(Server.id).where(Server.iiko_uid == iiko_uid)
+        point_ids = select(Point.id).where(Point.server_id.in_(server_ids))
+        workstation_ids = select(Workstation.id).where(Workstation.point_id.in_(point_ids))
+        members = union_all(
+            select(Server.revision, Server.updated_at).where(Server.iiko_uid == iiko_uid),
+            select(Point.revision, Point.updated_at).where(Point.server_id.in_(server_ids)),
+            select(Workstation.revision, Workstation.updated_at).where(Workstation.point_id.in_(point_ids)),
+            select(FiscalRegistrar.revision, FiscalRegistrar.updated_at).where(
+                FiscalRegistrar.workstation_id.in_(workstation_ids)
+            ),
+        ).subquery()
+        count, revisions, updated_at = (await db.execute(
+            select(func.count(), func.coalesce(func.sum(members.c.revision), 0), func.max(members.c.updated_at))
+        )).one()
+        if not count:
+            return None
+        return count, int(revisions), updated_at
+
     # Можно добавить другие специфичные методы
 
-server = CRUDServer(Server)
\ No newline at end of file
+server = CRUDServer(Server)
@@ -0,0 +1,181 @@
+# app/crud/crud_sync.py
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from sqlalchemy import BigInteger, ColumnElement, Integer, String, Uuid, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, BIT
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.company import Company
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+from app.schemas.sync import SyncEntity
+
+SYNC_MODELS: Dict[SyncEntity, Type[Any]] = {
+    SyncEntity.COMPANY: Company,
+    SyncEntity.POINT: Point,
+    SyncEntity.SERVER: Server,
+    SyncEntity.WORKSTATION: Workstation,
+    SyncEntity.FISCAL_REGISTRAR: FiscalRegistrar,
+}
+
+HEX_DIGITS = 32 # Длина UUID в hex без дефисов
+_MASK64 = (1 << 64) - 1
+
+
+def scope_filter(entity: SyncEntity, company_id: Optional[uuid.UUID], server_id: Optional[uuid.UUID]) -> List[ColumnElement]:
+    """Условия "записи сущности, относящиеся к компании / серверу" (полусоединения по связям)."""
+    model = SYNC_MODELS[entity]
+    conditions = []
+    if company_id is not None:
+        points = select(Point.id).where(Point.company_id == company_id)
+        if entity == SyncEntity.COMPANY:
+            conditions.append(Company.id == company_id)
+        elif entity == SyncEntity.POINT:
+            conditions.append(Point.company_id == company_id)
+        elif entity == SyncEntity.SERVER:
+            conditions.append(Server.id.in_(select(Point.server_id).where(Point.company_id == company_id)))
+        elif entity == SyncEntity.WORKSTATION:
+            conditions.append(Workstation.point_id.in_(points))
+        else:
+            conditions.append(FiscalRegistrar.workstation_id.in_(
+                select(Workstation.id).where(Workstation.point_id.in_(points))
+            ))
+    if server_id is not None:
+        if entity == SyncEntity.COMPANY:
+            conditions.append(Company.id.in_(select(Point.company_id).where(Point.server_id == server_id)))
+        elif entity == SyncEntity.SERVER:
+            conditions.append(Server.id == server_id)
+        elif entity == SyncEntity.FISCAL_REGISTRAR:
+            conditions.append(FiscalRegistrar.workstation_id.in_(
+                select(Workstation.id).where(Workstation.server_id == server_id)
+            ))
+        else:
+            conditions.append(model.server_id == server_id)
+    return conditions
+
+
+def prefix_range(model: Type[Any], prefix: str) -> List[ColumnElement]:
+    """
+    Условия "hex id начинается с prefix" в виде диапазона id (по индексу первичного ключа).
+    UUID в Postgres сравниваются побайтно, то есть в том же порядке, что и их hex.
+    """
+    if not prefix:
+        return []
+    conditions = [model.id >= uuid.UUID(prefix.ljust(HEX_DIGITS, "0"))]
+    upper = int(prefix, 16) + 1
+    if upper < 16 ** len(prefix): # У префикса "ff..." верхней границы нет
+        conditions.append(model.id < uuid.UUID(f"{upper:0{len(prefix)}x}".ljust(HEX_DIGITS, "0")))
+    return conditions
+
+
+def row_hash(model: Type[Any]) -> ColumnElement:
+    """
+    64-битный хеш строки: первые 8 байт md5("<id>:<revision>") как bigint.
+    Клиент считает то же самое: int(md5(f"{id}:{revision}").hexdigest()[:16], 16).
+    """
+    text = cast(model.id, String) + ":" + cast(model.revision, String)
+    return cast(cast(literal("x") + func.substr(func.md5(text), 1, 16), BIT(64)), BigInteger)
+
+
+def format_digest(value: Optional[int]) -> str:
+    return f"{(value or 0) & _MASK64:016x}"
+
+
+class CRUDSync:
+    """
+    Контрольные суммы (id, revision) по диапазонам ID для проверки синхронизации клиентов.
+    Сумма диапазона - XOR хешей строк, поэтому клиент поддерживает ее у себя инкрементально,
+    а сервер считает одним агрегирующим запросом по диапазону первичного ключа.
+    Несовпадающий диапазон уточняется запросом с его префиксом (в 16^depth раз меньше),
+    пока в нем не останется SYNC_DIGEST_LEAF_SIZE записей - тогда отдаются сами пары.
+    """
+    async def digests(
+        self,
+        db: AsyncSession,
+        *,
+        entity: SyncEntity,
+        prefix: str = "",
+        depth: int = 2,
+        company_id: Optional[uuid.UUID] = None,
+        server_id: Optional[uuid.UUID] = None,
+    ) -> Dict[str, Any]:
+        model = SYNC_MODELS[entity]
+        conditions = prefix_range(model, prefix) + scope_filter(entity, company_id, server_id)
+        bucket_length = min(len(prefix) + depth, HEX_DIGITS)
+        bucket = func.substr(func.replace(cast(model.id, String), "-", ""), 1, bucket_length).label("bucket")
+        statement = (
+            select(bucket, func.count().label("count"), func.bit_xor(row_hash(model)).label("digest"))
+            .where(*conditions)
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        rows = (await db.execute(statement)).all()
+
+        total, digest = 0, 0
+        buckets = []
+        for row in rows:
+            total += row.count
+            digest ^= row.digest
+            buckets.append({"prefix": row.bucket, "count": row.count, "digest": format_digest(row.digest)})
+
+        items = None
+        if total <= settings.SYNC_DIGEST_LEAF_SIZE:
+            result = await db.execute(select(model.id, model.revision).where(*conditions).order_by(model.id))
+            items = [{"id": id, "revision": revision} for id, revision in result.all()]
+            buckets = []
+        return {
+            "entity": entity,
+            "prefix": prefix,
+            "count": total,
+            "digest": format_digest(digest),
+            "buckets": buckets,
+            "items": items,
+        }
+
+    async def reconcile(
+        self,
+        db: AsyncSession,
+        *,
+        entity: SyncEntity,
+        ids: Sequence[uuid.UUID],
+        revisions: Sequence[int],
+        company_id: Optional[uuid.UUID] = None,
+        server_id: Optional[uuid.UUID] = None,
+    ) -> Dict[str, List[uuid.UUID]]:
+        """
+        Сравнить набор клиента (id, revision) с записями сущности одним запросом.
+        Набор передается двумя массивами и разворачивается unnest() в виртуальную таблицу,
+        сравнение - FULL JOIN с записями в области company_id/server_id,
+        результат - три массива array_agg(), так что Python не обходит строки ни в одну сторону.
+        """
+        model = SYNC_MODELS[entity]
+        client = (
+            func.unnest(literal(list(ids), ARRAY(Uuid())), literal(list(revisions), ARRAY(Integer())))
+            .table_valued("id", "revision")
+            .render_derived(name="client")
+        )
+        server = (
+            select(model.id, model.revision)
+            .where(*scope_filter(entity, company_id, server_id))
+            .subquery("server")
+        )
+        statement = select(
+            func.array_agg(server.c.id).filter(client.c.id.is_(None)).label("new"),
+            func.array_agg(server.c.id).filter(
+                client.c.id.is_not(None), server.c.revision != client.c.revision
+            ).label("changed"),
+            func.array_agg(client.c.id).filter(server.c.id.is_(None)).label("deleted"),
+        ).select_from(server.join(client, server.c.id == client.c.id, full=True))
+        row = (await db.execute(statement)).one()
+        return {
+            "new": row.new or [],
+            "changed": row.changed or [],
+            "deleted": row.deleted or [],
+        }
+
+
+sync = CRUDSync()
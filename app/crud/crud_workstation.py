@@ -1,11 +1,13 @@
 # app/crud/crud_workstation.py
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.crud.crud_server import connection_type_filter
+from app.models.enums import ConnectionType
 from app.models.workstation import Workstation # Модель таблицы
 from app.schemas.workstation import WorkstationCreate, WorkstationUpdate # Схемы
 
@@ -23,6 +25,41 @@ class CRUDWorkstation(CRUDBase[Workstation, WorkstationCreate, WorkstationUpdate
         result = await db.execute(statement)
         return result.scalars().all()
 
+    def filtered_statement(
+        self,
+        *,
+        point_id: Optional[uuid.UUID] = None,
+        connection_type: Optional[ConnectionType] = None,
+        equipment: Optional[Dict[str, Any]] = None,
+    ) -> Select:
+        """
+        Запрос списка рабочих станций с фильтрами (фильтрация на стороне БД).
+        equipment - JSON-фрагмент, который должен входить в extra_equipment (оператор @>),
+        например {"scale": {"model": "X"}}.
+        """
+        statement = select(self.model)
+        if point_id:
+            statement = statement.where(self.model.point_id == point_id)
+        if connection_type:
+            statement = statement.where(connection_type_filter(self.model.connection_details, connection_type))
+        if equipment:
+            statement = statement.where(self.model.extra_equipment.contains(equipment))
+        return statement.order_by(self.model.id)
+
+    async def get_multi_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> List[Workstation]:
+        """Получить рабочие станции с фильтрами (см. filtered_statement)."""
+        statement = self.with_fields(self.filtered_statement(**filters).offset(skip).limit(limit), fields)
+        result = await db.execute(statement)
+        return result.scalars().all()
+
     # Можно добавить другие специфичные методы
 
-workstation = CRUDWorkstation(Workstation)
\ No newline at end of file
+workstation = CRUDWorkstation(Workstation)
@@ -0,0 +1,85 @@
+# app/db/events.py
+# Уведомления об изменениях сущностей после успешного коммита.
+# Изменения собираются при каждом flush (после INSERT/UPDATE/DELETE через ORM) и
+# передаются подписчикам только после COMMIT; при откате - отбрасываются.
+# Подписчики - синхронные функции, используются для поддержки in-memory индексов
+# и кешей в актуальном состоянии без отдельного запроса к БД.
+#
+# Важно: массовые UPDATE/DELETE через Core (update()/delete()) сюда не попадают.
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.base import BaseUUIDModel
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_changes"
+
+
+@dataclass
+class Change:
+    op: str # insert / update / delete
+    obj: BaseUUIDModel
+    # Прежние значения измененных колонок (только для update)
+    previous: Dict[str, Any] = field(default_factory=dict)
+
+
+ChangeSubscriber = Callable[[List[Change]], None]
+_subscribers: List[ChangeSubscriber] = []
+
+
+def subscribe(callback: ChangeSubscriber) -> ChangeSubscriber:
+    """Подписаться на изменения после коммита. Можно использовать как декоратор."""
+    _subscribers.append(callback)
+    return callback
+
+
+def _previous_values(obj: BaseUUIDModel) -> Dict[str, Any]:
+    previous = {}
+    state = inspect(obj)
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.has_changes() and history.deleted:
+            previous[attr.key] = history.deleted[0]
+    return previous
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # В after_flush new/dirty/deleted и история атрибутов еще в состоянии до flush
+    pending: List[Change] = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, BaseUUIDModel):
+            pending.append(Change(INSERT, obj))
+    for obj in session.dirty:
+        if isinstance(obj, BaseUUIDModel) and session.is_modified(obj):
+            pending.append(Change(UPDATE, obj, _previous_values(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, BaseUUIDModel):
+            pending.append(Change(DELETE, obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    for callback in _subscribers:
+        try:
+            callback(changes)
+        except Exception:
+            # Ошибка подписчика не должна ломать уже закоммиченный запрос
+            logger.exception("Change subscriber %r failed", callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,19 @@
+# app/db/explain.py
+# EXPLAIN для произвольного запроса SQLAlchemy: параметры обрабатываются как обычно
+# (enum, UUID, JSONB и т.д.), поэтому план строится ровно для того запроса,
+# который выполняет приложение.
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>. Без ANALYZE - запрос не выполняется."""
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
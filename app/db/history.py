@@ -0,0 +1,88 @@
+# app/db/history.py
+# Запись истории изменений сущностей (таблица entityrevision).
+# Перед каждым flush для созданных/измененных/удаленных сущностей в ту же сессию
+# добавляется строка EntityRevision, поэтому история пишется в той же транзакции,
+# что и само изменение, и откатывается вместе с ним.
+#
+# Важно: как и app/db/events.py, массовые UPDATE/DELETE через Core сюда не попадают.
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.company import Company
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.history import EntityRevision
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+SNAPSHOT = "snapshot" # Начальное состояние записей, существовавших до включения истории
+
+TRACKED_MODELS = (Company, Point, Server, Workstation, FiscalRegistrar)
+
+# Не входят в diff/снимок: id и revision - часть ключа, updated_at = changed_at ревизии
+# (к тому же при UPDATE он выставляется БД и до flush неизвестен)
+UNTRACKED_FIELDS = {"id", "revision", "updated_at"}
+
+
+def _column_keys(obj: Any):
+    return [attr.key for attr in inspect(obj).mapper.column_attrs if attr.key not in UNTRACKED_FIELDS]
+
+
+def state_of(obj: Any) -> Dict[str, Any]:
+    """Полное состояние сущности в JSON-совместимом виде."""
+    return jsonable_encoder({key: getattr(obj, key) for key in _column_keys(obj)})
+
+
+def _changes_of(obj: Any) -> Dict[str, Any]:
+    """Новые значения колонок, измененных с прошлого flush."""
+    state = inspect(obj)
+    changes = {}
+    for key in _column_keys(obj):
+        history = state.attrs[key].history
+        if history.has_changes() and history.added:
+            changes[key] = history.added[0]
+    return jsonable_encoder(changes)
+
+
+def _is_snapshot_revision(revision: int) -> bool:
+    return revision % max(1, settings.HISTORY_SNAPSHOT_INTERVAL) == 0
+
+
+@event.listens_for(Session, "before_flush")
+def _record_history(session: Session, flush_context, instances) -> None:
+    revisions = []
+    for obj in session.new:
+        if isinstance(obj, TRACKED_MODELS):
+            revisions.append(EntityRevision(
+                entity=obj.__tablename__, entity_id=obj.id, revision=obj.revision, op=INSERT, snapshot=state_of(obj),
+            ))
+    for obj in session.dirty:
+        if not isinstance(obj, TRACKED_MODELS) or not session.is_modified(obj):
+            continue
+        changes = _changes_of(obj)
+        if not changes:
+            continue
+        # Ревизия - ключ истории: если изменивший код ее не увеличил, увеличиваем здесь
+        if not inspect(obj).attrs.revision.history.has_changes():
+            obj.revision += 1
+        revisions.append(EntityRevision(
+            entity=obj.__tablename__,
+            entity_id=obj.id,
+            revision=obj.revision,
+            op=UPDATE,
+            changes=changes,
+            snapshot=state_of(obj) if _is_snapshot_revision(obj.revision) else None,
+        ))
+    for obj in session.deleted:
+        if isinstance(obj, TRACKED_MODELS):
+            revisions.append(EntityRevision(
+                entity=obj.__tablename__, entity_id=obj.id, revision=obj.revision + 1, op=DELETE,
+            ))
+    session.add_all(revisions)
@@ -5,6 +5,7 @@ from sqlmodel import SQLModel # Импортируем SQLModel для мета
 from typing import AsyncGenerator
 
 from app.core.config import settings
+from app.db import events # noqa: F401 - регистрирует слушатели изменений для подписчиков (индексы, кеши)
 
 # Проверяем, что DATABASE_URL точно задан
 if settings.DATABASE_URL is None:
@@ -12,7 +13,14 @@ if settings.DATABASE_URL is None:
 
 # Создаем асинхронный движок SQLAlchemy
 # echo=True полезно для отладки, показывает генерируемые SQL-запросы. В продакшене лучше убрать.
-engine = create_async_engine(str(settings.DATABASE_URL), echo=False, future=True)
+engine = create_async_engine(
+    str(settings.DATABASE_URL),
+    echo=False,
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
 
 # Создаем фабрику асинхронных сессий
 AsyncSessionFactory = sessionmaker(
@@ -0,0 +1,58 @@
+# app/db/warmup.py
+# Прогрев пула соединений при старте приложения.
+# Открываем заранее несколько соединений и на каждом выполняем "горячие" CRUD-запросы:
+# asyncpg кеширует подготовленные выражения на уровне соединения, а SQLAlchemy -
+# скомпилированный SQL, поэтому первые реальные запросы после деплоя не платят за это.
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import AsyncExitStack
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app import crud
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Несуществующий ID: запросы по нему строят тот же SQL, что и реальные get()
+_WARMUP_ID = uuid.UUID(int=0)
+
+# CRUD-объекты, чьи запросы прогреваем
+_HOT_CRUDS = (crud.company, crud.point, crud.server, crud.workstation, crud.fiscal_registrar)
+
+
+async def _prime_connection(conn: AsyncConnection) -> None:
+    """Выполнить горячие запросы на конкретном соединении."""
+    async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+        for crud_obj in _HOT_CRUDS:
+            await crud_obj.get(session, id=_WARMUP_ID)
+            await crud_obj.get_multi(session, skip=0, limit=1)
+        await crud.point.get_multi_by_company(session, company_id=_WARMUP_ID, limit=1)
+        await crud.workstation.get_multi_by_point(session, point_id=_WARMUP_ID, limit=1)
+        await crud.fiscal_registrar.get_multi_by_workstation(session, workstation_id=_WARMUP_ID, limit=1)
+        await crud.server.get_by_iiko_uid(session, iiko_uid="000-000-000")
+        await session.rollback()
+
+
+async def prewarm_pool(connections: int) -> float:
+    """
+    Открыть `connections` соединений одновременно (чтобы они были разными)
+    и прогреть каждое. Возвращает затраченное время в секундах.
+    Ошибки не пробрасываются: недоступная при старте БД не должна мешать запуску.
+    """
+    started = time.perf_counter()
+    if connections <= 0:
+        return 0.0
+    try:
+        async with AsyncExitStack() as stack:
+            conns = await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+            )
+            await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+            await asyncio.gather(*(_prime_connection(conn) for conn in conns))
+    except Exception:
+        logger.exception("Database pool warm-up failed")
+    return time.perf_counter() - started
@@ -0,0 +1,10 @@
+# app/jobs/__init__.py
+from .registry import job_handler, registered_job_types
+from .runner import JobContext, JobRunner
+# Импорт модуля регистрирует встроенные обработчики
+from . import handlers
+
+__all__ = [
+    "job_handler", "registered_job_types",
+    "JobContext", "JobRunner",
+]
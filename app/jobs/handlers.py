@@ -0,0 +1,77 @@
+# app/jobs/handlers.py
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from app import crud, schemas
+from app.jobs.registry import job_handler
+from app.jobs.runner import JobContext
+
+# Сущности, доступные для экспорта: имя -> (CRUD, схема чтения)
+EXPORTABLE = {
+    "company": (crud.company, schemas.CompanyRead),
+    "point": (crud.point, schemas.PointRead),
+    "server": (crud.server, schemas.ServerRead),
+    "workstation": (crud.workstation, schemas.WorkstationRead),
+    "fiscal_registrar": (crud.fiscal_registrar, schemas.FiscalRegistrarRead),
+}
+
+EXPORT_PAGE_SIZE = 1000
+
+
+@job_handler("export")
+async def export_entities(ctx: JobContext, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Выгрузка всех записей сущности.
+    Параметры: {"entity": "company" | "point" | ...}.
+    Записи читаются страницами по id (keyset), каждая страница - в своей сессии, и сразу
+    записывается в jobresultpage (GET /jobs/{job_id}/result/{page}); в памяти и в
+    job.result - только одна страница и итог {"entity", "count", "pages"}.
+    """
+    entity = params.get("entity")
+    if entity not in EXPORTABLE:
+        raise ValueError(f"Unknown entity '{entity}'. Expected one of: {', '.join(EXPORTABLE)}")
+    crud_obj, read_schema = EXPORTABLE[entity]
+    model = crud_obj.model
+
+    async with ctx.session() as db:
+        total = (await db.execute(select(func.count()).select_from(model))).scalar_one()
+        # Страницы прерванной попытки (задача могла быть возвращена в очередь)
+        await crud.job.clear_result_pages(db, job_id=ctx.job_id)
+
+    count = 0
+    pages = 0
+    last_id = None
+    while True:
+        statement = select(model).order_by(model.id).limit(EXPORT_PAGE_SIZE)
+        if last_id is not None:
+            statement = statement.where(model.id > last_id)
+        async with ctx.session() as db:
+            rows = (await db.execute(statement)).scalars().all()
+            if not rows:
+                break
+            items = [jsonable_encoder(read_schema.model_validate(row)) for row in rows]
+            await crud.job.put_result_page(db, job_id=ctx.job_id, page=pages, items=items)
+        count += len(rows)
+        pages += 1
+        last_id = rows[-1].id
+        await ctx.report_progress(count / total if total else 1.0, f"Exported {count} of {total}")
+
+    return {"entity": entity, "count": count, "pages": pages}
+
+
+@job_handler("rebuild_fiscal_drive_expiry_counts")
+async def rebuild_fiscal_drive_expiry_counts(ctx: JobContext, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Полный пересчет сводки по истечению ФН (FiscalDriveExpiryCount)."""
+    async with ctx.session() as db:
+        await crud.fiscal_registrar.rebuild_expiry_counts(db)
+    return None
+
+
+@job_handler("purge_idempotency_keys")
+async def purge_idempotency_keys(ctx: JobContext, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Удалить истекшие ключи идемпотентности (таблица idempotencykey)."""
+    async with ctx.session() as db:
+        deleted = await crud.idempotency.purge_expired(db)
+    return {"deleted": deleted}
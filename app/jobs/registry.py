@@ -0,0 +1,40 @@
+# app/jobs/registry.py
+from typing import Any, Awaitable, Callable, Dict, Optional, TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from .runner import JobContext
+
+# Обработчик получает контекст задачи и параметры, возвращает результат (или None)
+JobHandler = Callable[["JobContext", Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+# Зарегистрированные обработчики: job_type -> (обработчик, лимит параллельности)
+_handlers: Dict[str, JobHandler] = {}
+_concurrency: Dict[str, int] = {}
+
+
+def job_handler(job_type: str, *, concurrency: Optional[int] = None):
+    """
+    Декоратор для регистрации обработчика фоновой задачи.
+    Лимит параллельности можно переопределить через settings.JOBS_CONCURRENCY.
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        if job_type in _handlers:
+            raise ValueError(f"Job handler for '{job_type}' is already registered")
+        _handlers[job_type] = func
+        _concurrency[job_type] = concurrency or settings.JOBS_DEFAULT_CONCURRENCY
+        return func
+    return decorator
+
+
+def get_handler(job_type: str) -> Optional[JobHandler]:
+    return _handlers.get(job_type)
+
+
+def get_concurrency(job_type: str) -> int:
+    return settings.JOBS_CONCURRENCY.get(job_type, _concurrency.get(job_type, 1))
+
+
+def registered_job_types() -> list[str]:
+    return list(_handlers)
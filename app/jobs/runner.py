@@ -0,0 +1,178 @@
+# app/jobs/runner.py
+import asyncio
+import os
+import socket
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db.session import AsyncSessionFactory
+from app.jobs import registry
+
+logger = logging.getLogger(__name__)
+
+# Минимальный интервал между записями прогресса в БД (секунды)
+PROGRESS_MIN_INTERVAL = 1.0
+
+
+class JobLostError(Exception):
+    """Задача больше не принадлежит воркеру (возвращена в очередь как зависшая)."""
+
+
+class JobContext:
+    """
+    Контекст выполняющейся задачи: доступ к сессии БД и отчет о прогрессе.
+    Каждый вызов session() открывает отдельную короткую сессию, чтобы
+    длинная задача не держала соединение из пула все время выполнения.
+    """
+    def __init__(self, job_id: uuid.UUID, job_type: str, worker_id: str):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.worker_id = worker_id
+        self._last_progress_at = 0.0
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with AsyncSessionFactory() as session:
+            yield session
+
+    async def report_progress(self, progress: float, message: Optional[str] = None) -> None:
+        """
+        Сохранить прогресс (0..1). Частые вызовы прореживаются.
+        JobLostError - задачу уже выполняет другой воркер, продолжать не нужно.
+        """
+        now = time.monotonic()
+        if progress < 1.0 and now - self._last_progress_at < PROGRESS_MIN_INTERVAL:
+            return
+        self._last_progress_at = now
+        async with self.session() as db:
+            owned = await crud.job.set_progress(
+                db, job_id=self.job_id, worker_id=self.worker_id,
+                progress=max(0.0, min(progress, 1.0)), message=message,
+            )
+        if not owned:
+            raise JobLostError(f"Job {self.job_id} is no longer owned by {self.worker_id}")
+
+
+class JobRunner:
+    """
+    Асинхронный обработчик очереди задач.
+    Может работать внутри веб-процесса (lifespan в app.main) или отдельно (app.worker).
+    Лимиты параллельности действуют на процесс: для каждого типа задач
+    забирается не больше задач, чем свободных слотов.
+    """
+    def __init__(self, *, worker_id: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval or settings.JOBS_POLL_INTERVAL
+        self._running: Dict[str, Set[asyncio.Task]] = {}
+        self._job_ids: Dict[asyncio.Task, uuid.UUID] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._loop_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._stopping = False
+        self._loop_task = asyncio.create_task(self._poll_loop(), name="job-runner")
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(), name="job-heartbeat")
+
+    def wakeup(self) -> None:
+        """Разбудить цикл опроса (например, сразу после постановки задачи)."""
+        self._wakeup.set()
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Остановить прием новых задач и дождаться текущих (не дольше timeout)."""
+        self._stopping = True
+        self._wakeup.set()
+        for task in (self._loop_task, self._heartbeat_task):
+            if task:
+                task.cancel()
+        tasks = list(self._job_ids)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def _poll_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await self._claim_and_spawn()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Ошибки БД не должны останавливать цикл: попробуем на следующем тике
+                logger.exception("Failed to claim jobs")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim_and_spawn(self) -> None:
+        for job_type in registry.registered_job_types():
+            running = self._running.setdefault(job_type, set())
+            free_slots = registry.get_concurrency(job_type) - len(running)
+            if free_slots <= 0:
+                continue
+            async with AsyncSessionFactory() as db:
+                jobs = await crud.job.claim(
+                    db, job_type=job_type, limit=free_slots, worker_id=self.worker_id
+                )
+            for job in jobs:
+                task = asyncio.create_task(self._run(job.id, job.job_type, job.params or {}))
+                running.add(task)
+                self._job_ids[task] = job.id
+                task.add_done_callback(self._forget)
+
+    def _forget(self, task: asyncio.Task) -> None:
+        self._job_ids.pop(task, None)
+        for tasks in self._running.values():
+            tasks.discard(task)
+        # Освободился слот - можно сразу забрать следующую задачу
+        self._wakeup.set()
+
+    async def _run(self, job_id: uuid.UUID, job_type: str, params: Dict[str, Any]) -> None:
+        handler = registry.get_handler(job_type)
+        ctx = JobContext(job_id, job_type, self.worker_id)
+        outcome: Dict[str, Any]
+        try:
+            outcome = {"result": await handler(ctx, params)}
+        except asyncio.CancelledError:
+            # Воркер останавливается: возвращаем задачу в очередь для другого воркера
+            async with AsyncSessionFactory() as db:
+                await crud.job.release(db, job_id=job_id, worker_id=self.worker_id)
+            raise
+        except JobLostError:
+            logger.warning("Job %s was requeued while running, abandoning this run", job_id)
+            return
+        except Exception as e:
+            outcome = {"error": f"{type(e).__name__}: {e}"}
+        async with AsyncSessionFactory() as db:
+            finished = await crud.job.finish(db, job_id=job_id, worker_id=self.worker_id, **outcome)
+        if not finished:
+            logger.warning("Job %s was requeued while running, its result is discarded", job_id)
+
+    async def _heartbeat_loop(self) -> None:
+        interval = max(settings.JOBS_STALE_AFTER / 3, 1)
+        while not self._stopping:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionFactory() as db:
+                    await crud.job.heartbeat(db, job_ids=list(self._job_ids.values()), worker_id=self.worker_id)
+                    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.JOBS_STALE_AFTER)
+                    await crud.job.requeue_stale(
+                        db, stale_before=stale_before, max_attempts=settings.JOBS_MAX_ATTEMPTS,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to heartbeat or requeue stale jobs")
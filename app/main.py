@@ -1,41 +1,183 @@
 # app/main.py
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
+from app import crud
 from app.core.config import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.logging import RequestIdMiddleware, setup_logging, shutdown_logging
+from app.core.loop_monitor import create_loop_monitor
+from app.core.profiling import ProfilingMiddleware
+from app.core.metrics import registry as metrics_registry
 from app.api.v1.api import api_router # Импортируем главный роутер v1
+from app.db.session import AsyncSessionFactory
+from app.db.warmup import prewarm_pool
+from app.models.history import EntityRevision
+from app.jobs import JobRunner
 
-# Создаем экземпляр FastAPI
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # Путь к схеме OpenAPI (Swagger)
-)
-
-# Настройка CORS
-if settings.BACKEND_CORS_ORIGINS:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["*"], # Разрешаем все методы (GET, POST, PUT, DELETE и т.д.)
-        allow_headers=["*"], # Разрешаем все заголовки
-    )
+logger = logging.getLogger(__name__)
+
+STARTUP_SECONDS = metrics_registry.gauge("app_startup_seconds", "Duration of startup phases, by phase")
+
+# SQLSTATE ошибок БД, которые означают конфликт данных, а не ошибку сервера
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+# Конфликты параллельных транзакций: повтор запроса может пройти
+RETRYABLE_SQLSTATES = {"40001", "40P01"} # serialization_failure, deadlock_detected
+
+
+def db_conflict_detail(exc: DBAPIError) -> Optional[str]:
+    """
+    Текст ответа 409 для ошибки БД или None, если это не конфликт данных.
+    Исходное сообщение драйвера (имена ограничений, значения ключей) клиенту не отдается.
+    """
+    sqlstate = getattr(exc.orig, "sqlstate", None)
+    # Таблица, на ограничении которой упал запрос (asyncpg - в исходном исключении)
+    table = getattr(exc.orig.__cause__, "table_name", None)
+    if sqlstate in RETRYABLE_SQLSTATES or (sqlstate == UNIQUE_VIOLATION and table == EntityRevision.__tablename__):
+        # Ключ истории (entity, revision) занят - запись одновременно изменил другой запрос
+        return "Record was modified concurrently, retry the request"
+    if sqlstate == UNIQUE_VIOLATION:
+        return "A record with the same unique value already exists"
+    if sqlstate == FOREIGN_KEY_VIOLATION:
+        return "Referenced record does not exist or is still referenced"
+    if isinstance(exc, IntegrityError):
+        return "Request conflicts with existing data"
+    return None
 
-# Подключаем роутер v1
-app.include_router(api_router, prefix=settings.API_V1_STR)
+async def build_identifier_index() -> None:
+    """Построить индекс для GET /resolve. До готовности запросы идут в БД напрямую."""
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionFactory() as db:
+            await crud.resolve.index.build(db)
+    except Exception:
+        logger.exception("Failed to build identifier index, /resolve will use the database")
+        return
+    STARTUP_SECONDS.set(time.perf_counter() - started, phase="identifier_index")
 
-# Просто корневой эндпоинт для проверки, что сервер работает
-@app.get("/", tags=["Root"])
-async def read_root():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """
-    Корневой эндпоинт для проверки доступности сервера.
+    Запуск и остановка фоновых компонентов вместе с приложением.
+    До приема первых запросов прогреваем пул соединений и строим схему OpenAPI,
+    чтобы первые запросы после деплоя не были медленными.
+    Обработчик задач запускается в процессе, только если JOBS_IN_PROCESS=True;
+    иначе задачи разбирает отдельный процесс `python -m app.worker`.
     """
-    return {"message": f"Welcome to {settings.PROJECT_NAME}"}
+    if settings.WARMUP_OPENAPI:
+        started = time.perf_counter()
+        app.openapi() # Результат кешируется в app.openapi_schema
+        STARTUP_SECONDS.set(time.perf_counter() - started, phase="openapi")
+    if settings.DB_POOL_PREWARM:
+        elapsed = await prewarm_pool(min(settings.DB_POOL_PREWARM, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW))
+        STARTUP_SECONDS.set(elapsed, phase="pool_prewarm")
+
+    loop_monitor = None
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor = create_loop_monitor()
+        loop_monitor.start()
+
+    # Индекс строится в фоне, чтобы не задерживать прием запросов
+    index_task = asyncio.create_task(build_identifier_index()) if settings.RESOLVE_INDEX_ENABLED else None
+
+    runner = None
+    if settings.JOBS_IN_PROCESS:
+        runner = JobRunner()
+        runner.start()
+    app.state.job_runner = runner
+    yield
+    if runner:
+        await runner.stop()
+    if index_task and not index_task.done():
+        index_task.cancel()
+    if loop_monitor:
+        await loop_monitor.stop()
+    shutdown_logging()
+
+def create_app() -> FastAPI:
+    """Фабрика приложения: собирает FastAPI со всеми middleware и роутерами."""
+    setup_logging()
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json", # Путь к схеме OpenAPI (Swagger)
+        lifespan=lifespan,
+    )
+
+    # Профилирование запроса по заголовку X-Profile (только для администраторов).
+    # Добавляется первым - самый внутренний слой, в отчет попадает только обработка запроса
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Настройка CORS
+    if settings.BACKEND_CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+            allow_credentials=True,
+            allow_methods=["*"], # Разрешаем все методы (GET, POST, PUT, DELETE и т.д.)
+            allow_headers=["*"], # Разрешаем все заголовки
+            expose_headers=["X-Total-Count", "X-Total-Count-Mode", "X-Request-ID", "X-Profile-Id"], # Доступны JS-клиенту
+        )
+
+    # Повтор POST с тем же Idempotency-Key возвращает сохраненный ответ без повторной записи
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(IdempotencyMiddleware)
+
+    # Контроль допуска: быстрый 503 при перегрузке вместо ожидания соединения из пула.
+    # Добавляется последним, чтобы быть внешним слоем и отсекать запросы как можно раньше.
+    if settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionControlMiddleware)
+
+    # X-Request-ID для записей лога. Самый внешний слой: идентификатор есть и у отклоненных запросов
+    app.add_middleware(RequestIdMiddleware)
+
+    # Подключаем роутер v1
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    @app.exception_handler(DBAPIError)
+    async def db_conflict_handler(request: Request, exc: DBAPIError):
+        """
+        Нарушение ограничения БД или конфликт параллельных транзакций - 409, а не ошибка
+        сервера. Повторять запрос клиенту предлагается только при параллельном изменении.
+        """
+        detail = db_conflict_detail(exc)
+        if detail is None:
+            raise exc # Прочие ошибки БД - 500, как без обработчика
+        logger.warning("Database conflict on %s %s: %s", request.method, request.url.path, exc.orig)
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": detail})
+
+    # Просто корневой эндпоинт для проверки, что сервер работает
+    @app.get("/", tags=["Root"])
+    async def read_root():
+        """
+        Корневой эндпоинт для проверки доступности сервера.
+        """
+        return {"message": f"Welcome to {settings.PROJECT_NAME}"}
+
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        """Метрики процесса в текстовом формате Prometheus."""
+        return PlainTextResponse(metrics_registry.render())
+
+    return app
+
+# Экземпляр приложения для `uvicorn app.main:app`
+app = create_app()
 
 # Если нужно запускать напрямую через python app/main.py (для отладки)
 # Но обычно используется uvicorn из командной строки
 if __name__ == "__main__":
     import uvicorn
     # Запуск uvicorn сервера. reload=True автоматически перезапускает сервер при изменении кода.
-    # В продакшене reload=True нужно убрать.
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # В продакшене используйте `python -m app.run` (несколько воркеров, расчет пула БД).
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
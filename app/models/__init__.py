@@ -1,18 +1,27 @@
 from .base import BaseUUIDModel
-from .enums import ServerType, LicenseType, ConnectionType # Добавить Enums
+from .enums import ServerType, LicenseType, ConnectionType, JobStatus # Добавить Enums
 from .company import Company
 from .point import Point
 from .server import Server
 from .workstation import Workstation
 from .fiscal_registrar import FiscalRegistrar # Добавить FiscalRegistrar
+from .job import Job, JobResultPage
+from .fiscal_drive_expiry import FiscalDriveExpiryCount
+from .idempotency import IdempotencyKey
+from .history import EntityRevision
 
 # Можно добавить __all__ для явного экспорта
 __all__ = [
     "BaseUUIDModel",
-    "ServerType", "LicenseType", "ConnectionType",
+    "ServerType", "LicenseType", "ConnectionType", "JobStatus",
     "Company",
     "Point",
     "Server",
     "Workstation",
     "FiscalRegistrar",
+    "Job",
+    "JobResultPage",
+    "FiscalDriveExpiryCount",
+    "IdempotencyKey",
+    "EntityRevision",
 ]
\ No newline at end of file
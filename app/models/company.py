@@ -1,6 +1,7 @@
 # app/models/company.py
 from typing import List, TYPE_CHECKING
 from sqlmodel import Field, Relationship
+from sqlalchemy import Index
 
 from .base import BaseUUIDModel
 
@@ -10,6 +11,14 @@ if TYPE_CHECKING:
 
 class Company(BaseUUIDModel, table=True):
     # __tablename__ генерируется автоматически SQLModel как 'company'
+    __table_args__ = (
+        # Триграммный индекс для поиска по фрагменту имени (GET /search)
+        Index("ix_company_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        # GiST - ближайшие по похожести (ORDER BY col <-> q) без сортировки всех совпадений
+        Index("ix_company_name_trgm_gist", "name", postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"}),
+        Index("ix_company_billing_inn_trgm_gist", "billing_inn", postgresql_using="gist", postgresql_ops={"billing_inn": "gist_trgm_ops"}),
+        Index("ix_company_iiko_inn_trgm_gist", "iiko_inn", postgresql_using="gist", postgresql_ops={"iiko_inn": "gist_trgm_ops"}),
+    )
     # Связь один-ко-многим: одна компания может иметь много точек
     name: str = Field(index=True)
     billing_inn: str = Field(index=True, unique=True, max_length=12) # ИНН ЮЛ = 10, ИП = 12
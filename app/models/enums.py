@@ -15,4 +15,11 @@ class ConnectionType(str, enum.Enum):
     RDP = "RDP"
     ANYDESK = "Anydesk"
     LITEMANAGER = "Litemanager"
-    OTHER = "Other"
\ No newline at end of file
+    OTHER = "Other"
+
+# Статусы фоновых задач (см. app/jobs)
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
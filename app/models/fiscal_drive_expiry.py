@@ -0,0 +1,12 @@
+# app/models/fiscal_drive_expiry.py
+import uuid
+from datetime import date
+from sqlmodel import SQLModel, Field
+
+# Предрасчитанное количество ФН, истекающих на неделе, по компаниям.
+# Поддерживается триггером на таблице fiscalregistrar (см. миграцию),
+# поэтому сводка для дашборда читается без агрегации по всем регистраторам.
+class FiscalDriveExpiryCount(SQLModel, table=True):
+    company_id: uuid.UUID = Field(foreign_key="company.id", primary_key=True, ondelete="CASCADE")
+    week_start: date = Field(primary_key=True, index=True) # Понедельник недели истечения ФН
+    count: int = Field(default=0, nullable=False)
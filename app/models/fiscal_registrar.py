@@ -3,6 +3,7 @@ import uuid
 from datetime import datetime, date
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship # Убираем SQLModel
+from sqlalchemy import Index
 from .base import BaseUUIDModel
 
 if TYPE_CHECKING:
@@ -10,6 +11,11 @@ if TYPE_CHECKING:
 
 # Модель таблицы FiscalRegistrar
 class FiscalRegistrar(BaseUUIDModel, table=True):
+    __table_args__ = (
+        # Диапазонные запросы по дате истечения ФН с keyset-пагинацией по (дата, id)
+        Index("ix_fiscalregistrar_expiry_date_id", "fiscal_drive_expiry_date", "id"),
+    )
+
     # Явно определяем поля
     model: str = Field(index=True)
     serial_number: str = Field(index=True, unique=True)
@@ -0,0 +1,26 @@
+# app/models/history.py
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Ревизия сущности в истории изменений (append-only, пишется в app/db/history.py).
+# changes - только измененные поля (для insert - NULL),
+# snapshot - полное состояние: при создании и каждые HISTORY_SNAPSHOT_INTERVAL ревизий.
+# Состояние на любую ревизию = ближайший снимок + diff после него.
+# none_as_null: отсутствие снимка - SQL NULL (а не JSON null), чтобы искать снимки по IS NOT NULL.
+class EntityRevision(SQLModel, table=True):
+    entity: str = Field(primary_key=True, max_length=32) # Имя таблицы сущности
+    entity_id: uuid.UUID = Field(primary_key=True)
+    revision: int = Field(primary_key=True)
+    op: str = Field(max_length=16) # insert / update / delete / snapshot (начальное состояние)
+    changes: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB(none_as_null=True)))
+    snapshot: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB(none_as_null=True)))
+    # Время транзакции - совпадает с updated_at сущности
+    changed_at: datetime = Field(
+        sa_type=DateTime(timezone=True),
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()},
+    )
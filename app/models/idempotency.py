@@ -0,0 +1,25 @@
+# app/models/idempotency.py
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DateTime, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Сохраненный ответ на POST с заголовком Idempotency-Key (см. app/core/idempotency.py).
+# Ключ действует в пределах клиента (scope - хеш subject токена).
+# Строка без status_code - запрос с этим ключом еще выполняется (до locked_until).
+class IdempotencyKey(SQLModel, table=True):
+    scope: str = Field(primary_key=True, max_length=64)
+    key: str = Field(primary_key=True, max_length=255)
+    fingerprint: str = Field(max_length=64) # sha256 метода, пути, query и тела запроса
+    status_code: Optional[int] = Field(default=None)
+    response_headers: Optional[List[List[str]]] = Field(default=None, sa_column=Column(JSONB))
+    response_body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True),
+        nullable=False,
+    )
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), nullable=False, index=True)
+    # Срок занятия ключа выполняющимся запросом; после него ключ может занять повтор
+    locked_until: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True), nullable=True)
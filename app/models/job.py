@@ -0,0 +1,46 @@
+# app/models/job.py
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .base import BaseUUIDModel
+from .enums import JobStatus
+
+# Модель фоновой задачи (импорт, экспорт, сканирование и т.д.)
+# Задачи забираются воркерами через SELECT ... FOR UPDATE SKIP LOCKED
+class Job(BaseUUIDModel, table=True):
+    __table_args__ = (
+        # Частичный индекс для быстрого поиска задач в очереди
+        Index(
+            "ix_job_queued",
+            "job_type", "created_at",
+            postgresql_where=text("status = 'QUEUED'"),
+        ),
+    )
+
+    job_type: str = Field(index=True, max_length=100)
+    status: JobStatus = Field(default=JobStatus.QUEUED, index=True)
+    params: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB))
+    result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB))
+    error: Optional[str] = Field(default=None)
+
+    # Прогресс выполнения: доля от 0 до 1 и текстовое описание этапа
+    progress: float = Field(default=0.0, nullable=False)
+    progress_message: Optional[str] = Field(default=None, max_length=255)
+
+    attempts: int = Field(default=0, nullable=False)
+    worker_id: Optional[str] = Field(default=None, max_length=255)
+    started_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    finished_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    # Обновляется воркером; по нему находим "зависшие" задачи упавших воркеров
+    heartbeat_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+
+# Страница результата задачи. Большие результаты (экспорт) пишутся по страницам,
+# а не одним JSONB в job.result: ни воркер, ни API не держат их в памяти целиком
+class JobResultPage(SQLModel, table=True):
+    job_id: uuid.UUID = Field(foreign_key="job.id", primary_key=True, ondelete="CASCADE")
+    page: int = Field(primary_key=True) # С нуля
+    items: List[Dict[str, Any]] = Field(sa_column=Column(JSONB, nullable=False))
@@ -3,6 +3,7 @@ import uuid
 
 from typing import List, Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship
+from sqlalchemy import Index
 
 from .base import BaseUUIDModel
 
@@ -12,6 +13,14 @@ if TYPE_CHECKING:
     from .workstation import Workstation
 
 class Point(BaseUUIDModel, table=True):
+    __table_args__ = (
+        # Триграммные индексы для поиска по фрагменту (GET /search)
+        Index("ix_point_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_point_address_trgm", "address", postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}),
+        # GiST - ближайшие по похожести (ORDER BY col <-> q) без сортировки всех совпадений
+        Index("ix_point_name_trgm_gist", "name", postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"}),
+        Index("ix_point_address_trgm_gist", "address", postgresql_using="gist", postgresql_ops={"address": "gist_trgm_ops"}),
+    )
 
     name: str = Field(index=True)
     address: str
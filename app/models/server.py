@@ -1,7 +1,9 @@
 # app/models/server.py
 import re # Для валидации iiko_uid
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
-from sqlmodel import Field, Relationship, Column, JSON
+from sqlmodel import Field, Relationship, Column
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import JSONB
 
 from .base import BaseUUIDModel
 from .enums import ServerType, LicenseType
@@ -14,13 +16,30 @@ if TYPE_CHECKING:
 IIKO_UID_REGEX = re.compile(r"^\d{3}-\d{3}-\d{3}$")
 
 class Server(BaseUUIDModel, table=True):
+    __table_args__ = (
+        # Триграммные индексы для поиска по фрагменту (GET /search)
+        Index("ix_server_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_server_address_trgm", "address", postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}),
+        Index("ix_server_iiko_uid_trgm", "iiko_uid", postgresql_using="gin", postgresql_ops={"iiko_uid": "gin_trgm_ops"}),
+        # GiST - ближайшие по похожести (ORDER BY col <-> q) без сортировки всех совпадений
+        Index("ix_server_name_trgm_gist", "name", postgresql_using="gist", postgresql_ops={"name": "gist_trgm_ops"}),
+        Index("ix_server_address_trgm_gist", "address", postgresql_using="gist", postgresql_ops={"address": "gist_trgm_ops"}),
+        Index("ix_server_iiko_uid_trgm_gist", "iiko_uid", postgresql_using="gist", postgresql_ops={"iiko_uid": "gist_trgm_ops"}),
+        # GIN по JSONB для фильтров по вхождению (@>), например ?connection_type=
+        Index("ix_server_connection_details_gin", "connection_details", postgresql_using="gin", postgresql_ops={"connection_details": "jsonb_path_ops"}),
+        # Фильтры списка серверов (GET /servers/), id - для сортировки без отдельного шага
+        Index("ix_server_license_type_server_type_id", "license_type", "server_type", "id"),
+        Index("ix_server_server_type_id", "server_type", "id"),
+        Index("ix_server_updated_at_id", "updated_at", "id"),
+    )
+
     name: str = Field(index=True, max_length=255) # Добавим max_length для консистентности
     server_type: ServerType = Field(default=ServerType.RMS)
     iiko_uid: str = Field(unique=True, index=True, max_length=11)
     license_type: LicenseType = Field(default=LicenseType.CLOUD)
     # Убедимся, что длины достаточно для нормализованного URL
     address: Optional[str] = Field(default=None, index=True, max_length=512)
-    connection_details: Optional[Dict[str, Any] | List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSON))
+    connection_details: Optional[Dict[str, Any] | List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSONB))
     # Убедимся, что длины достаточно для ID
     partner_portal_id: Optional[str] = Field(default=None, index=True, max_length=50)
 
@@ -1,7 +1,9 @@
 # app/models/workstation.py
 import uuid
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
-from sqlmodel import Field, Relationship, Column, JSON # Убираем SQLModel
+from sqlmodel import Field, Relationship, Column # Убираем SQLModel
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import JSONB
 from .base import BaseUUIDModel
 
 if TYPE_CHECKING:
@@ -11,10 +13,16 @@ if TYPE_CHECKING:
 
 # Модель таблицы Workstation
 class Workstation(BaseUUIDModel, table=True):
+    __table_args__ = (
+        # GIN по JSONB для фильтров по вхождению (@>): тип подключения, модель оборудования
+        Index("ix_workstation_connection_details_gin", "connection_details", postgresql_using="gin", postgresql_ops={"connection_details": "jsonb_path_ops"}),
+        Index("ix_workstation_extra_equipment_gin", "extra_equipment", postgresql_using="gin", postgresql_ops={"extra_equipment": "jsonb_path_ops"}),
+    )
+
     # Явно определяем поля
     name: Optional[str] = Field(default=None, index=True)
-    connection_details: Optional[List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSON))
-    extra_equipment: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    connection_details: Optional[List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSONB))
+    extra_equipment: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB))
 
     # Внешние ключи и связи
     point_id: uuid.UUID = Field(foreign_key="point.id", index=True)
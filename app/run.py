@@ -0,0 +1,113 @@
+# app/run.py
+# Продакшн-запуск: несколько воркеров uvicorn с uvloop/httptools (если установлены).
+# Запуск: python -m app.run [--workers N] [--host H] [--port P]
+#
+# Пул соединений каждого воркера рассчитывается так, чтобы суммарно все воркеры
+# не превышали POSTGRES_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS.
+# Рассчитанные значения передаются воркерам через переменные окружения,
+# которые имеют приоритет над .env.
+#
+# Отдельный процесс задач (python -m app.worker) берет DB_WORKER_CONNECTIONS из резерва
+# (job_worker_pool_settings). При нескольких воркерах задачи в веб-процессах по умолчанию
+# выключены (JOBS_IN_PROCESS=false): каждый воркер держал бы свой JobRunner,
+# а задачи должен выполнять app.worker.
+import argparse
+import importlib.util
+import os
+import sys
+from typing import Dict
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def available_cpus() -> int:
+    """Число CPU, доступных процессу (учитывает ограничения контейнера/affinity)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def pick_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def pick_http() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def pool_settings_per_worker(workers: int) -> Dict[str, int]:
+    """
+    Разделить бюджет соединений между воркерами.
+    Половина доли воркера - постоянный пул, остальное - overflow.
+    Лимиты контроля допуска подгоняются под пул, если не заданы явно.
+    """
+    budget = settings.POSTGRES_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise SystemExit(
+            f"Not enough Postgres connections for {workers} workers: "
+            f"max_connections={settings.POSTGRES_MAX_CONNECTIONS}, reserved={settings.DB_RESERVED_CONNECTIONS}"
+        )
+    pool_size = max(1, per_worker // 2)
+    values = {
+        "DB_POOL_SIZE": pool_size,
+        "DB_MAX_OVERFLOW": per_worker - pool_size,
+        "DB_POOL_PREWARM": min(settings.DB_POOL_PREWARM, pool_size),
+    }
+    if "ADMISSION_READ_CONCURRENCY" not in settings.model_fields_set and "ADMISSION_WRITE_CONCURRENCY" not in settings.model_fields_set:
+        writes = max(1, per_worker // 3)
+        values["ADMISSION_WRITE_CONCURRENCY"] = writes
+        values["ADMISSION_READ_CONCURRENCY"] = max(1, per_worker - writes)
+    return values
+
+
+def job_worker_pool_settings() -> Dict[str, int]:
+    """Пул процесса python -m app.worker - из резерва, который не делится между веб-воркерами."""
+    connections = settings.DB_WORKER_CONNECTIONS
+    if not 1 <= connections <= settings.DB_RESERVED_CONNECTIONS:
+        raise SystemExit(
+            f"DB_WORKER_CONNECTIONS={connections} must be between 1 and "
+            f"DB_RESERVED_CONNECTIONS={settings.DB_RESERVED_CONNECTIONS}"
+        )
+    pool_size = max(1, connections // 2)
+    return {"DB_POOL_SIZE": pool_size, "DB_MAX_OVERFLOW": connections - pool_size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f"Run {settings.PROJECT_NAME} in production mode")
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or available_cpus())
+    args = parser.parse_args()
+
+    pool_values = pool_settings_per_worker(args.workers)
+    for name, value in pool_values.items():
+        os.environ[name] = str(value)
+    if args.workers > 1 and "JOBS_IN_PROCESS" not in settings.model_fields_set:
+        os.environ["JOBS_IN_PROCESS"] = "false"
+        print("JOBS_IN_PROCESS=false: run background jobs with python -m app.worker", file=sys.stderr)
+
+    loop, http = pick_loop(), pick_http()
+    print(
+        f"Starting {args.workers} worker(s) on {args.host}:{args.port} (loop={loop}, http={http}); "
+        + ", ".join(f"{k}={v}" for k, v in pool_values.items()),
+        file=sys.stderr,
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=settings.WEB_KEEPALIVE,
+        backlog=settings.WEB_BACKLOG,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_SHUTDOWN,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,15 @@ from .point import PointBase, PointCreate, PointRead, PointUpdate
 from .server import ServerBase, ServerRead, ServerUpdate, ServerCreate
 from .workstation import WorkstationBase, WorkstationCreate, WorkstationRead, WorkstationUpdate
 from .fiscal_registrar import FiscalRegistrarBase, FiscalRegistrarCreate, FiscalRegistrarRead, FiscalRegistrarUpdate
+from .job import JobCreate, JobRead, JobResultPageRead, JobResultPageTyped
+from .search import SearchResult, SearchResultType
+from .resolve import IdentifierKind, ResolveMatch, ResolveResult
+from .pagination import CountMode
+from .batch import BatchGetRequest, BatchGetResult, BatchOpType, BatchEntity, BatchOperation, BatchRequest, BatchOperationResult, BatchResponse
+from .history import EntityRevisionRead
+from .bundle import ServerBundle
+from .sync import SyncEntity, SyncItem, DigestBucket, DigestResponse, ReconcileRequest, ReconcileResponse
+from .report import FiscalDriveExpiryItem, FiscalDriveExpiryPage, ExpiryCompanyCount, ExpiryWeekCount, FiscalDriveExpirySummary
 
 # ... импорты для Server, Workstation, FiscalRegistrar ...
 
@@ -15,5 +24,15 @@ __all__ = [
     "ServerBase", "ServerCreate", "ServerRead", "ServerUpdate",
     "WorkstationBase", "WorkstationCreate", "WorkstationRead", "WorkstationUpdate",
     "FiscalRegistrarBase", "FiscalRegistrarBase", "FiscalRegistrarCreate", "FiscalRegistrarRead",
+    "JobCreate", "JobRead", "JobResultPageRead", "JobResultPageTyped",
+    "SearchResult", "SearchResultType",
+    "IdentifierKind", "ResolveMatch", "ResolveResult",
+    "CountMode",
+    "BatchGetRequest", "BatchGetResult",
+    "BatchOpType", "BatchEntity", "BatchOperation", "BatchRequest", "BatchOperationResult", "BatchResponse",
+    "EntityRevisionRead",
+    "ServerBundle",
+    "SyncEntity", "SyncItem", "DigestBucket", "DigestResponse", "ReconcileRequest", "ReconcileResponse",
+    "FiscalDriveExpiryItem", "FiscalDriveExpiryPage", "ExpiryCompanyCount", "ExpiryWeekCount", "FiscalDriveExpirySummary",
     # ...
 ]
\ No newline at end of file
@@ -0,0 +1,56 @@
+# app/schemas/batch.py
+import enum
+import uuid
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Field
+
+ReadSchemaType = TypeVar("ReadSchemaType")
+
+# Запрос POST /<entity>/batch-get
+class BatchGetRequest(SQLModel):
+    ids: List[uuid.UUID] # Лимит - settings.BATCH_GET_MAX_IDS
+
+# Ответ: найденные записи в порядке запроса и ID, которых нет в БД
+class BatchGetResult(BaseModel, Generic[ReadSchemaType]):
+    items: List[ReadSchemaType]
+    missing: List[uuid.UUID]
+
+
+# --- POST /batch: несколько операций в одной транзакции ---
+
+class BatchOpType(str, enum.Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BatchEntity(str, enum.Enum):
+    COMPANY = "company"
+    POINT = "point"
+    SERVER = "server"
+    WORKSTATION = "workstation"
+    FISCAL_REGISTRAR = "fiscal_registrar"
+
+# Одна операция. На объект, созданный ранее в этом же пакете, можно сослаться
+# строкой "$<ref>" в поле id и в значениях data (например, "point_id": "$p1")
+class BatchOperation(SQLModel):
+    op: BatchOpType
+    entity: BatchEntity
+    ref: Optional[str] = Field(default=None, min_length=1, max_length=100) # Имя для ссылок (только create)
+    id: Optional[str] = None # UUID или "$<ref>" (update/delete)
+    data: Optional[Dict[str, Any]] = None # Поля схемы Create/Update сущности
+
+class BatchRequest(SQLModel):
+    operations: List[BatchOperation] # Лимит - settings.BATCH_MAX_OPERATIONS
+
+class BatchOperationResult(SQLModel):
+    index: int
+    op: BatchOpType
+    entity: BatchEntity
+    ref: Optional[str] = None
+    id: uuid.UUID
+    data: Optional[Dict[str, Any]] = None # Состояние записи после операции (кроме delete)
+
+class BatchResponse(SQLModel):
+    results: List[BatchOperationResult]
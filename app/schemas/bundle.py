@@ -0,0 +1,17 @@
+# app/schemas/bundle.py
+from typing import List
+from sqlmodel import SQLModel
+
+from .server import ServerRead
+from .point import PointRead
+from .workstation import WorkstationRead
+from .fiscal_registrar import FiscalRegistrarRead
+
+# Ответ GET /servers/by-uid/{iiko_uid}/bundle: все, что нужно RMS-серверу при синхронизации.
+# revision - максимальная ревизия входящих записей (метка версии пакета)
+class ServerBundle(SQLModel):
+    revision: int
+    server: ServerRead
+    points: List[PointRead] # Точки, привязанные к серверу (point.server_id)
+    workstations: List[WorkstationRead] # Рабочие станции этих точек
+    fiscal_registrars: List[FiscalRegistrarRead] # ФР этих рабочих станций
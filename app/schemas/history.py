@@ -0,0 +1,13 @@
+# app/schemas/history.py
+from datetime import datetime
+from typing import Any, Dict
+from sqlmodel import SQLModel
+
+# Элемент ответа GET /<entity>/{id}/history.
+# changes - новые значения измененных полей; для создания (и начального снимка) - все поля,
+# для удаления - пустой словарь
+class EntityRevisionRead(SQLModel):
+    revision: int
+    op: str # insert / update / delete / snapshot
+    changed_at: datetime
+    changes: Dict[str, Any]
@@ -0,0 +1,44 @@
+# app/schemas/job.py
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, Generic, List, TypeVar
+
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Field
+
+from app.models.enums import JobStatus
+
+ItemSchemaType = TypeVar("ItemSchemaType")
+
+# Схема для постановки задачи в очередь
+class JobCreate(SQLModel):
+    job_type: str = Field(..., max_length=100)
+    params: Optional[Dict[str, Any]] = None
+
+# Схема для чтения статуса задачи
+class JobRead(SQLModel):
+    id: uuid.UUID
+    job_type: str
+    status: JobStatus
+    params: Optional[Dict[str, Any]]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    progress: float
+    progress_message: Optional[str]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+# Страница результата задачи (GET /jobs/{job_id}/result/{page})
+class JobResultPageRead(SQLModel):
+    job_id: uuid.UUID
+    page: int
+    items: List[Dict[str, Any]]
+
+# Та же страница с записями, провалидированными схемой чтения сущности (экспорт):
+# для msgpack/CBOR UUID и даты кодируются как типизированные значения, а не строки JSON
+class JobResultPageTyped(BaseModel, Generic[ItemSchemaType]):
+    job_id: uuid.UUID
+    page: int
+    items: List[ItemSchemaType]
@@ -0,0 +1,9 @@
+# app/schemas/pagination.py
+import enum
+
+
+class CountMode(str, enum.Enum):
+    """Как считать общее число записей для заголовка X-Total-Count."""
+    EXACT = "exact" # count(*) при каждом запросе
+    ESTIMATED = "estimated" # Оценка планировщика (pg_class.reltuples / EXPLAIN), почти бесплатно
+    CACHED = "cached" # Точное значение из кеша, сбрасывается при изменении таблицы
@@ -0,0 +1,43 @@
+# app/schemas/report.py
+import uuid
+from datetime import date
+from typing import List, Optional
+from sqlmodel import SQLModel
+
+# Строка отчета по истечению ФН: регистратор с привязкой к рабочей станции, точке, компании и серверу
+class FiscalDriveExpiryItem(SQLModel):
+    id: uuid.UUID
+    model: str
+    serial_number: str
+    fiscal_drive_number: Optional[str]
+    fiscal_drive_expiry_date: date
+    workstation_id: uuid.UUID
+    workstation_name: Optional[str]
+    point_id: uuid.UUID
+    point_name: str
+    point_address: str
+    company_id: uuid.UUID
+    company_name: str
+    server_id: uuid.UUID
+    server_name: str
+    server_iiko_uid: str
+
+# Страница отчета с курсором для keyset-пагинации
+class FiscalDriveExpiryPage(SQLModel):
+    items: List[FiscalDriveExpiryItem]
+    next_cursor: Optional[str] = None # Передать в ?cursor= для следующей страницы
+
+class ExpiryCompanyCount(SQLModel):
+    company_id: uuid.UUID
+    company_name: str
+    count: int
+
+class ExpiryWeekCount(SQLModel):
+    week_start: date # Понедельник недели
+    count: int
+
+# Сводка для дашборда (из предрасчитанной таблицы)
+class FiscalDriveExpirySummary(SQLModel):
+    total: int
+    by_company: List[ExpiryCompanyCount]
+    by_week: List[ExpiryWeekCount]
@@ -0,0 +1,34 @@
+# app/schemas/resolve.py
+import enum
+from typing import List, Optional
+from sqlmodel import SQLModel
+
+from .company import CompanyRead
+from .point import PointRead
+from .server import ServerRead
+from .workstation import WorkstationRead
+from .fiscal_registrar import FiscalRegistrarRead
+
+# Виды идентификаторов, которые понимает GET /resolve/{identifier}
+class IdentifierKind(str, enum.Enum):
+    INN = "inn" # billing_inn / iiko_inn компании
+    IIKO_UID = "iiko_uid"
+    PARTNER_PORTAL_ID = "partner_portal_id"
+    SERIAL_NUMBER = "serial_number" # ФР
+    REGISTRATION_NUMBER = "registration_number" # РНМ ФР
+    FISCAL_DRIVE_NUMBER = "fiscal_drive_number" # Номер ФН
+
+# Найденная сущность вместе с цепочкой родителей
+class ResolveMatch(SQLModel):
+    kind: IdentifierKind
+    entity: str # company / server / fiscal_registrar
+    company: Optional[CompanyRead] = None
+    point: Optional[PointRead] = None
+    server: Optional[ServerRead] = None
+    workstation: Optional[WorkstationRead] = None
+    fiscal_registrar: Optional[FiscalRegistrarRead] = None
+
+class ResolveResult(SQLModel):
+    identifier: str # Нормализованный идентификатор
+    kinds: List[IdentifierKind] # Виды, подходящие по формату
+    matches: List[ResolveMatch]
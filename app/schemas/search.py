@@ -0,0 +1,19 @@
+# app/schemas/search.py
+import enum
+import uuid
+from typing import Optional
+from sqlmodel import SQLModel
+
+# Типы сущностей в результатах поиска
+class SearchResultType(str, enum.Enum):
+    COMPANY = "company"
+    POINT = "point"
+    SERVER = "server"
+
+# Один найденный объект
+class SearchResult(SQLModel):
+    type: SearchResultType
+    id: uuid.UUID
+    title: str # Имя компании/точки/сервера
+    subtitle: Optional[str] = None # ИНН компании, адрес точки, iiko_uid сервера
+    score: float # Похожесть (pg_trgm), чем больше - тем выше в выдаче
@@ -1,4 +1,5 @@
 # app/schemas/server.py
+import logging
 import uuid
 import re
 from datetime import datetime
@@ -17,12 +18,14 @@ CLOUD_DOMAINS = [".iiko.it", ".syrve.online"]
 DEFAULT_LOCAL_PORT = 8080 # Порт по умолчанию, если не указан для локального RMS
 RESTO_PATH = "/resto" # Стандартный путь
 
+logger = logging.getLogger(__name__)
+
 # --- Схемы ---
 
 class ServerBase(SQLModel):
     name: str = Field(..., min_length=1, max_length=255)
     server_type: ServerType = Field(default=ServerType.RMS)
-    point_id: uuid.UUID
+    # Привязка к точкам - со стороны точки (point.server_id), у сервера point_id нет
     # iiko_uid валидируется ниже
     iiko_uid: str = Field(..., max_length=11)
     license_type: LicenseType = Field(default=LicenseType.CLOUD)
@@ -153,7 +156,10 @@ class ServerBase(SQLModel):
             raise ValueError(f'Connection details required for Lifetime server "{server_name}" (Address: {address})')
         # Предупреждение для Cloud остается
         if license_type == LicenseType.CLOUD and v:
-            print(f"Warning: Connection details provided for Cloud server '{server_name}' (Address: {address}). They might not be applicable.")
+            logger.warning(
+                "Connection details provided for Cloud server '%s' (Address: %s). They might not be applicable.",
+                server_name, address,
+            )
         return v
 
 # --- Остальные схемы (Create, Read, Update) ---
@@ -165,7 +171,6 @@ class ServerCreate(ServerBase):
 class ServerRead(ServerBase):
     id: uuid.UUID
     revision: int
-    point_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
 
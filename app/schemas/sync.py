@@ -0,0 +1,56 @@
+# app/schemas/sync.py
+import enum
+import uuid
+from typing import List, Optional
+from pydantic import model_validator
+from sqlmodel import SQLModel
+
+# Сущности, доступные для проверки синхронизации (/sync)
+class SyncEntity(str, enum.Enum):
+    COMPANY = "company"
+    POINT = "point"
+    SERVER = "server"
+    WORKSTATION = "workstation"
+    FISCAL_REGISTRAR = "fiscal_registrar"
+
+# Пара (id, revision) - то, что клиент синхронизации знает о записи
+class SyncItem(SQLModel):
+    id: uuid.UUID
+    revision: int
+
+# Контрольная сумма диапазона ID: все id, чей hex (без дефисов) начинается с prefix
+class DigestBucket(SQLModel):
+    prefix: str
+    count: int
+    digest: str # 16 hex-символов, XOR 64-битных хешей строк
+
+# Ответ GET /sync/digests/{entity}: сумма диапазона prefix и его поддиапазоны.
+# Если в диапазоне не больше SYNC_DIGEST_LEAF_SIZE записей, вместо поддиапазонов - сами пары
+class DigestResponse(SQLModel):
+    entity: SyncEntity
+    prefix: str
+    count: int
+    digest: str
+    buckets: List[DigestBucket]
+    items: Optional[List[SyncItem]] = None
+
+# Запрос POST /sync/reconcile: все пары (id, revision), известные клиенту, в виде двух
+# параллельных массивов - компактнее списка объектов при сотнях тысяч записей
+class ReconcileRequest(SQLModel):
+    entity: SyncEntity
+    company_id: Optional[uuid.UUID] = None # Набор клиента - только записи этой компании
+    server_id: Optional[uuid.UUID] = None # ... и/или этого сервера
+    ids: List[uuid.UUID] # Лимит - settings.SYNC_RECONCILE_MAX_IDS
+    revisions: List[int]
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "ReconcileRequest":
+        if len(self.ids) != len(self.revisions):
+            raise ValueError("ids and revisions must have the same length")
+        return self
+
+# Что клиенту загрузить (new, changed) и что удалить у себя (deleted)
+class ReconcileResponse(SQLModel):
+    new: List[uuid.UUID]
+    changed: List[uuid.UUID]
+    deleted: List[uuid.UUID]
@@ -0,0 +1,53 @@
+# app/worker.py
+# Отдельный процесс для фоновых задач (рядом с app.main:app).
+# Запуск: python -m app.worker
+# В веб-процессах при этом стоит выставить JOBS_IN_PROCESS=false
+# (python -m app.run с несколькими воркерами делает это сам).
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.run import job_worker_pool_settings
+
+# Пул - из резерва соединений, а не DB_POOL_SIZE веб-воркера; выставляется до импорта
+# app.db.session, где создается engine
+for _name, _value in job_worker_pool_settings().items():
+    setattr(settings, _name, _value)
+
+from app.core.logging import setup_logging, shutdown_logging # noqa: E402
+from app.core.loop_monitor import create_loop_monitor # noqa: E402
+from app.db.session import engine # noqa: E402
+from app.jobs import JobRunner, registered_job_types # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    runner = JobRunner()
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError: # Windows
+            pass
+
+    logger.info("Job worker %s started. Job types: %s", runner.worker_id, ", ".join(registered_job_types()))
+    runner.start()
+    # Обработчики задач тоже работают в event loop: блокирующий код в них задерживает heartbeat
+    loop_monitor = create_loop_monitor() if settings.LOOP_MONITOR_ENABLED else None
+    if loop_monitor:
+        loop_monitor.start()
+    await stop_event.wait()
+    logger.info("Stopping job worker, waiting for running jobs...")
+    await runner.stop()
+    if loop_monitor:
+        await loop_monitor.stop()
+    await engine.dispose()
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
@@ -0,0 +1,355 @@
+# benchmarks/api_load.py
+# Нагрузочный бенчмарк API: каждый эндпоинт прогоняется через ASGI-приложение
+# с заданной параллельностью, в отчете - RPS и перцентили задержки.
+#
+# Запуск из корня проекта против БД с данными (python -m benchmarks.seed):
+#     python -m benchmarks.api_load --output api_load.json
+#     python -m benchmarks.api_load --concurrency 32 --requests 500 --only servers
+#     python -m benchmarks.api_load --baseline api_load.json --output new.json   # сравнение с прошлым запуском
+#     python -m benchmarks.api_load --writes                                     # плюс создание/изменение/удаление
+#
+# Запросы идут через httpx.ASGITransport в том же процессе (с lifespan приложения), без
+# сети и uvicorn: меряется стоимость приложения и БД, но клиент делит event loop с сервером,
+# поэтому абсолютные цифры ниже, чем у отдельного uvicorn, - сравнивать нужно запуски между собой.
+# Параллельность выше лимитов контроля допуска (ADMISSION_*) дает 503 - они видны в "status".
+#
+# Каждый сценарий выполняется отдельно: --warmup запросов без учета, затем --requests
+# запросов в --concurrency потоков. ID для запросов берутся случайной выборкой из БД.
+# С --baseline сценарий считается регрессией, если RPS упал или p95 вырос больше --tolerance
+# процентов либо выросла доля ответов не 2xx/3xx (быстрые 500 - не ускорение).
+# Сценарий с ответами 5xx или исключениями клиента считается сломанным и без --baseline.
+# В обоих случаях код выхода 1; --allow-server-errors оставляет для 5xx только предупреждение
+# (например, 503 контроля допуска при намеренной перегрузке).
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import engine
+from app.main import app
+from app.models.company import Company
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+
+API = settings.API_V1_STR
+SAMPLE_SIZE = 1000 # Случайных ID каждой сущности для запросов
+BATCH_SIZE = 100 # ID в одном batch-get / reconcile
+
+# (метод, путь, аргументы httpx: params/json/data)
+RequestSpec = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[["Dataset", random.Random], RequestSpec]
+    writes: bool = False # Меняет данные: выполняется только с --writes
+
+
+class Dataset:
+    """Случайная выборка существующих записей, из которой строятся запросы."""
+    def __init__(self):
+        self.ids: Dict[str, List[uuid.UUID]] = {}
+        self.iiko_uids: List[str] = []
+        self.inns: List[str] = []
+        self.serials: List[str] = []
+        self.names: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.created: List[uuid.UUID] = [] # Компании, созданные сценарием companies_create
+
+    async def load(self) -> None:
+        models = {
+            "companies": Company, "points": Point, "servers": Server,
+            "workstations": Workstation, "fiscal-registrars": FiscalRegistrar,
+        }
+        async with engine.connect() as conn:
+            for name, model in models.items():
+                self.counts[name] = (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+                result = await conn.execute(select(model.id).order_by(func.random()).limit(SAMPLE_SIZE))
+                self.ids[name] = list(result.scalars())
+            rows = (await conn.execute(
+                select(Server.iiko_uid).order_by(func.random()).limit(SAMPLE_SIZE)
+            )).scalars()
+            self.iiko_uids = list(rows)
+            rows = (await conn.execute(
+                select(Company.billing_inn, Company.name).order_by(func.random()).limit(SAMPLE_SIZE)
+            )).all()
+            self.inns = [inn for inn, _ in rows]
+            self.names = [name for _, name in rows]
+            rows = (await conn.execute(
+                select(FiscalRegistrar.serial_number).order_by(func.random()).limit(SAMPLE_SIZE)
+            )).scalars()
+            self.serials = list(rows)
+        empty = [name for name, ids in self.ids.items() if not ids]
+        if empty:
+            raise SystemExit(f"No data for {', '.join(empty)}: run python -m benchmarks.seed first")
+
+
+def _crud_scenarios(entity: str) -> List[Scenario]:
+    """Список, чтение по ID, batch-get и история для сущности с путем /<entity>."""
+    return [
+        Scenario(f"{entity}_list", lambda d, r: ("GET", f"{API}/{entity}/", {"params": {"limit": 100}})),
+        Scenario(f"{entity}_list_total", lambda d, r: ("GET", f"{API}/{entity}/", {"params": {"limit": 100, "total": "exact"}})),
+        Scenario(f"{entity}_get", lambda d, r: ("GET", f"{API}/{entity}/{r.choice(d.ids[entity])}", {})),
+        Scenario(f"{entity}_batch_get", lambda d, r: (
+            "POST", f"{API}/{entity}/batch-get", {"json": {"ids": [str(i) for i in r.sample(d.ids[entity], min(BATCH_SIZE, len(d.ids[entity])))]}}
+        )),
+        Scenario(f"{entity}_history", lambda d, r: ("GET", f"{API}/{entity}/{r.choice(d.ids[entity])}/history", {})),
+    ]
+
+
+def _search_fragment(d: Dataset, r: random.Random) -> str:
+    name = r.choice(d.names)
+    start = r.randrange(max(1, len(name) - 5))
+    return name[start:start + 5]
+
+
+def _reconcile(d: Dataset, r: random.Random) -> RequestSpec:
+    ids = r.sample(d.ids["workstations"], min(BATCH_SIZE, len(d.ids["workstations"])))
+    return "POST", f"{API}/sync/reconcile", {"json": {
+        "entity": "workstation", "ids": [str(i) for i in ids], "revisions": [1] * len(ids),
+    }}
+
+
+def _company_payload(r: random.Random) -> Dict[str, Any]:
+    n = r.randrange(10 ** 9)
+    return {"name": f"Benchmark {n}", "billing_inn": f"9{n:09d}", "iiko_inn": f"99{n:010d}"}
+
+
+def _update_company(d: Dataset, r: random.Random) -> RequestSpec:
+    company_id = r.choice(d.created or d.ids["companies"])
+    return "PUT", f"{API}/companies/{company_id}", {"json": {"name": f"Benchmark {r.randrange(10 ** 9)}"}}
+
+
+def _delete_company(d: Dataset, r: random.Random) -> RequestSpec:
+    # Удаляются только компании, созданные бенчмарком; когда они кончились - запрос дает 404
+    company_id = d.created.pop() if d.created else uuid.UUID(int=0)
+    return "DELETE", f"{API}/companies/{company_id}", {}
+
+
+def _batch_create(d: Dataset, r: random.Random) -> RequestSpec:
+    operations = [
+        {"op": "create", "entity": "company", "ref": f"c{i}", "data": _company_payload(r)} for i in range(10)
+    ]
+    return "POST", f"{API}/batch/", {"json": {"operations": operations}}
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("root", lambda d, r: ("GET", "/", {})),
+    Scenario("metrics", lambda d, r: ("GET", "/metrics", {})),
+    Scenario("login", lambda d, r: ("POST", f"{API}/auth/login/access-token", {"data": {
+        "username": settings.INITIAL_API_LOGIN, "password": settings.INITIAL_API_PASSWORD,
+    }})),
+    *(scenario for entity in ("companies", "points", "servers", "workstations", "fiscal-registrars")
+      for scenario in _crud_scenarios(entity)),
+    Scenario("servers_filter_license", lambda d, r: ("GET", f"{API}/servers/", {"params": {"license_type": "Lifetime"}})),
+    Scenario("servers_filter_connection", lambda d, r: ("GET", f"{API}/servers/", {"params": {"connection_type": "Anydesk"}})),
+    Scenario("workstations_filter_connection", lambda d, r: ("GET", f"{API}/workstations/", {"params": {"connection_type": "RDP"}})),
+    Scenario("server_bundle", lambda d, r: ("GET", f"{API}/servers/by-uid/{r.choice(d.iiko_uids)}/bundle", {})),
+    Scenario("search", lambda d, r: ("GET", f"{API}/search/", {"params": {"q": _search_fragment(d, r)}})),
+    # Фрагмент есть почти в каждом названии: проверка, что ранжирование не сортирует все совпадения
+    Scenario("search_common", lambda d, r: ("GET", f"{API}/search/", {"params": {"q": "ООО"}})),
+    Scenario("search_inn", lambda d, r: ("GET", f"{API}/search/", {"params": {"q": r.choice(d.inns)[2:8]}})),
+    Scenario("resolve_inn", lambda d, r: ("GET", f"{API}/resolve/{r.choice(d.inns)}", {})),
+    Scenario("resolve_serial", lambda d, r: ("GET", f"{API}/resolve/{r.choice(d.serials)}", {})),
+    Scenario("report_expiry", lambda d, r: ("GET", f"{API}/reports/fiscal-drive-expiry", {})),
+    Scenario("report_expiry_summary", lambda d, r: ("GET", f"{API}/reports/fiscal-drive-expiry/summary", {})),
+    Scenario("sync_digests", lambda d, r: ("GET", f"{API}/sync/digests/workstation", {})),
+    Scenario("sync_reconcile", _reconcile),
+    Scenario("companies_create", lambda d, r: ("POST", f"{API}/companies/", {"json": _company_payload(r)}), writes=True),
+    Scenario("companies_update", _update_company, writes=True),
+    Scenario("companies_delete", _delete_company, writes=True),
+    Scenario("batch_create", _batch_create, writes=True),
+]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, dataset: Dataset, *, requests: int, concurrency: int, rng: random.Random
+) -> Tuple[List[float], Counter, float]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining: # Общий итератор: запросы делятся между воркерами
+            method, path, kwargs = scenario.build(dataset, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                status = str(response.status_code)
+                if scenario.name == "companies_create" and response.status_code == 201:
+                    dataset.created.append(uuid.UUID(response.json()["id"]))
+            except Exception as exc:
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict[str, Any]:
+    ms = sorted(value * 1000 for value in latencies)
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    # 5xx и исключения клиента (в statuses - имя класса исключения): сценарий сломан
+    server_errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3", "4")))
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "error_rate": round(errors / len(ms), 4) if ms else 0.0,
+        "server_errors": server_errors,
+        "status": dict(sorted(statuses.items())),
+        "rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ms), 3) if ms else 0.0,
+            "p50": round(percentile(ms, 50), 3),
+            "p90": round(percentile(ms, 90), 3),
+            "p95": round(percentile(ms, 95), 3),
+            "p99": round(percentile(ms, 99), 3),
+            "max": round(ms[-1], 3) if ms else 0.0,
+        },
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Изменения RPS, p95 и доли ошибок (не 2xx/3xx) относительно базового отчета по общим
+    сценариям. Любой рост доли ошибок - регрессия независимо от скорости.
+    """
+    rows = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous["rps"] or not previous["latency_ms"]["p95"]:
+            continue
+        rps_change = (current["rps"] - previous["rps"]) / previous["rps"] * 100
+        p95_change = (current["latency_ms"]["p95"] - previous["latency_ms"]["p95"]) / previous["latency_ms"]["p95"] * 100
+        error_rate_change = _error_rate(current) - _error_rate(previous)
+        rows.append({
+            "scenario": name,
+            "rps_change_pct": round(rps_change, 1),
+            "p95_change_pct": round(p95_change, 1),
+            "error_rate_change_pp": round(error_rate_change * 100, 2),
+            "regression": rps_change < -tolerance or p95_change > tolerance or error_rate_change > 1e-9,
+        })
+    return rows
+
+
+def _error_rate(result: Dict[str, Any]) -> float:
+    # В отчетах до появления error_rate есть только errors и requests
+    if "error_rate" in result:
+        return result["error_rate"]
+    return result["errors"] / result["requests"] if result["requests"] else 0.0
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    scenarios = [
+        s for s in SCENARIOS
+        if (args.writes or not s.writes) and (not args.only or any(part in s.name for part in args.only))
+    ]
+    dataset = Dataset()
+    token = create_access_token(subject=settings.INITIAL_API_LOGIN)
+    report: Dict[str, Any] = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "scenarios": {},
+    }
+    async with app.router.lifespan_context(app):
+        await dataset.load()
+        report["dataset"] = dataset.counts
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", headers={"Authorization": f"Bearer {token}"}, timeout=None
+        ) as client:
+            for scenario in scenarios:
+                if args.warmup:
+                    await run_scenario(client, scenario, dataset, requests=args.warmup, concurrency=args.concurrency, rng=rng)
+                result = summarize(*await run_scenario(
+                    client, scenario, dataset, requests=args.requests, concurrency=args.concurrency, rng=rng
+                ))
+                report["scenarios"][scenario.name] = result
+                latency = result["latency_ms"]
+                print(
+                    f"{scenario.name:<36} {result['rps']:>9.1f} rps  p50 {latency['p50']:>8.2f}  "
+                    f"p95 {latency['p95']:>8.2f}  p99 {latency['p99']:>8.2f} ms  errors {result['errors']}",
+                    file=sys.stderr,
+                )
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP-level API benchmark through the ASGI app")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", nargs="*", default=None, help="Run scenarios whose name contains any of these")
+    parser.add_argument("--writes", action="store_true", help="Include scenarios that modify data")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None, help="Write JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare with a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed RPS drop / p95 growth, percent")
+    parser.add_argument("--allow-server-errors", action="store_true",
+                        help="Only warn about scenarios with 5xx responses instead of failing")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    report["broken"] = [name for name, result in report["scenarios"].items() if result["server_errors"]]
+    for name in report["broken"]:
+        result = report["scenarios"][name]
+        print(
+            f"{'WARNING' if args.allow_server_errors else 'BROKEN':<10} {name:<36} "
+            f"{result['server_errors']} of {result['requests']} responses are 5xx/exceptions: {result['status']}",
+            file=sys.stderr,
+        )
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = {"file": args.baseline, "started_at": baseline.get("started_at"), "tolerance_pct": args.tolerance}
+        report["comparison"] = compare(report, baseline, args.tolerance)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+        for row in report["comparison"]:
+            print(
+                f"{'REGRESSION' if row['regression'] else 'ok':<10} {row['scenario']:<36} "
+                f"rps {row['rps_change_pct']:+.1f}%  p95 {row['p95_change_pct']:+.1f}%  "
+                f"errors {row['error_rate_change_pp']:+.2f} pp",
+                file=sys.stderr,
+            )
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    if regressions or (report["broken"] and not args.allow_server_errors):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/query_plans.py
+# Проверка планов запросов: каждый фильтр списка серверов должен выполняться через индекс.
+#
+# Запуск из корня проекта против БД с примененными миграциями (нужен .env, как для приложения):
+#     python -m benchmarks.query_plans
+#     python -m benchmarks.query_plans --verbose   # напечатать планы целиком
+#
+# Для каждого фильтра строится тот же запрос, что выполняет GET /servers/
+# (crud.server.filtered_statement), и выполняется EXPLAIN (FORMAT JSON) с
+# enable_seqscan = off: на маленькой таблице планировщик честно выбрал бы
+# последовательное чтение, а нам важно, что подходящий индекс вообще применим.
+# Лучше всего запускать на данных, близких к боевым по объему.
+# Код выхода 1, если хотя бы один фильтр не использует ожидаемый индекс.
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import text
+
+from app import crud
+from app.db.explain import Explain
+from app.db.session import engine
+from app.models.enums import ConnectionType, LicenseType, ServerType
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+# (название проверки, фильтры для filtered_statement, ожидаемые индексы - подходит любой)
+CASES: List[Tuple[str, Dict[str, Any], Tuple[str, ...]]] = [
+    ("server_type", {"server_type": ServerType.CHAIN}, ("ix_server_server_type_id",)),
+    ("license_type", {"license_type": LicenseType.LIFETIME}, ("ix_server_license_type_server_type_id",)),
+    (
+        "license_type + server_type",
+        {"license_type": LicenseType.LIFETIME, "server_type": ServerType.RMS},
+        ("ix_server_license_type_server_type_id",),
+    ),
+    ("partner_portal_id", {"partner_portal_id": "1234567"}, ("ix_server_partner_portal_id",)),
+    ("address", {"address": "example"}, ("ix_server_address_trgm",)),
+    (
+        "updated_since",
+        {"updated_since": datetime.now(timezone.utc) - timedelta(days=1)},
+        ("ix_server_updated_at_id",),
+    ),
+    ("connection_type", {"connection_type": ConnectionType.ANYDESK}, ("ix_server_connection_details_gin",)),
+]
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+async def explain(filters: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    statement = crud.server.filtered_statement(**filters).limit(limit)
+    async with engine.connect() as conn:
+        async with conn.begin():
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+            raw = (await conn.execute(Explain(statement))).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0]["Plan"]
+
+
+async def run(limit: int, verbose: bool) -> bool:
+    ok = True
+    try:
+        for name, filters, expected in CASES:
+            plan = await explain(filters, limit)
+            used = sorted({n["Index Name"] for n in _walk(plan) if n["Node Type"] in INDEX_NODES})
+            passed = any(index in used for index in expected)
+            ok = ok and passed
+            print(f"{'OK  ' if passed else 'FAIL'} {name:<28} indexes used: {', '.join(used) or '-'}")
+            if verbose or not passed:
+                print(json.dumps(plan, indent=2))
+    finally:
+        await engine.dispose()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check that server list filters use indexes")
+    parser.add_argument("--limit", type=int, default=100, help="LIMIT used in the explained query")
+    parser.add_argument("--verbose", action="store_true", help="Print full plans")
+    args = parser.parse_args()
+    if not asyncio.run(run(args.limit, args.verbose)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
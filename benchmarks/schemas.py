@@ -0,0 +1,231 @@
+# benchmarks/schemas.py
+# Микробенчмарки схем: валидаторы ServerBase, проверка iiko_uid, валидация Create-схем
+# и сериализация Read-схем на реалистичных данных (облачные и локальные адреса,
+# ссылки партнерского портала, подключения и оборудование станций).
+#
+# Запуск из корня проекта (БД и .env не нужны, данные синтетические - benchmarks/synthetic.py):
+#     python -m benchmarks.schemas
+#     python -m benchmarks.schemas --only address --repeat 20
+#     python -m benchmarks.schemas --update-thresholds       # после осознанного изменения
+#
+# Все это выполняется на каждый запрос и на каждую строку импорта: Create-схема - на входе,
+# Read-схема - при формировании ответа (FastAPI валидирует ORM-объект в response_model
+# и сериализует его в mode="json"). Валидаторы адреса и partner_portal_id объявлены
+# в ServerBase, поэтому работают и при чтении каждого сервера, не только при записи.
+#
+# Для каждого случая печатается время одной операции (мкс): min и медиана по --repeat
+# прогонам по --size входам. Минимум сравнивается с порогом из schema_thresholds.json;
+# код выхода 1, если хоть один случай медленнее порога - так видна цена изменений
+# валидаторов и обновлений pydantic. Пороги заданы с запасом (--headroom) от замеров
+# на машине разработчика; на заметно более медленной машине их нужно пересчитать.
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import pydantic
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.models.company import Company
+from app.models.enums import LicenseType
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+from app.schemas.server import IIKO_UID_REGEX, ServerBase
+from benchmarks.synthetic import (
+    company_row,
+    fiscal_registrar_row,
+    iiko_uid,
+    point_row,
+    raw_cloud_address,
+    raw_local_address,
+    raw_partner_portal_id,
+    server_row,
+    workstation_row,
+)
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(__file__), "schema_thresholds.json")
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class Case(NamedTuple):
+    name: str
+    inputs: List[Any]
+    op: Callable[[Any], Any]
+
+
+def _stamps(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "revision": rng.randint(1, 20),
+        "created_at": NOW - timedelta(days=rng.randint(0, 900)),
+        "updated_at": NOW - timedelta(minutes=rng.randint(0, 100000)),
+    }
+
+
+def _create_payload(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Тело запроса на создание: без id, значения в том виде, в каком их присылает клиент (JSON)."""
+    return json.loads(json.dumps({k: v for k, v in row.items() if k != "id"}, default=str))
+
+
+def _read_case(name: str, read_schema: Any, objects: List[Any]) -> List[Case]:
+    """
+    Чтение - как в FastAPI с response_model: валидация ORM-объекта (from_attributes)
+    и отдельно сериализация готовой модели в mode="json".
+    """
+    adapter = TypeAdapter(read_schema)
+    models = [adapter.validate_python(obj, from_attributes=True) for obj in objects]
+    return [
+        Case(f"read.{name}", objects, lambda obj: adapter.validate_python(obj, from_attributes=True)),
+        Case(f"dump.{name}", models, lambda model: adapter.dump_python(model, mode="json")),
+    ]
+
+
+def build_cases(size: int, seed: int) -> List[Case]:
+    rng = random.Random(seed)
+    today = date(2026, 1, 1)
+
+    companies = [company_row(rng, i) for i in range(size)]
+    servers = [server_row(rng, i) for i in range(size)]
+    company_ids = [row["id"] for row in companies]
+    server_ids = [row["id"] for row in servers]
+    points = [point_row(rng, i, company_ids, server_ids) for i in range(size)]
+    workstations = [workstation_row(rng, i, points, server_ids) for i in range(size)]
+    workstation_ids = [row["id"] for row in workstations]
+    registrars = [fiscal_registrar_row(rng, i, workstation_ids, today) for i in range(size)]
+
+    # Адреса и ссылки партнерского портала - в том виде, в каком их вводят вручную
+    for i, row in enumerate(servers):
+        cloud = row["license_type"] == LicenseType.CLOUD
+        row["address"] = raw_cloud_address(rng, i) if cloud else raw_local_address(rng)
+        if row["partner_portal_id"]:
+            row["partner_portal_id"] = raw_partner_portal_id(rng)
+
+    cloud_servers = [row for row in servers if row["license_type"] == LicenseType.CLOUD]
+    lifetime_servers = [row for row in servers if row["license_type"] != LicenseType.CLOUD]
+
+    uids = [iiko_uid(rng.randrange(10 ** 9)) for _ in range(size)]
+    # Каждый десятый - опечатка, как при ручном вводе
+    uids = [uid.replace("-", "", 1) if i % 10 == 0 else uid for i, uid in enumerate(uids)]
+
+    cases = [
+        Case("validator.iiko_uid", uids, IIKO_UID_REGEX.match),
+        Case("validator.address_cloud", [raw_cloud_address(rng, i) for i in range(size)],
+             lambda v: ServerBase.normalize_and_validate_address(v, None)),
+        Case("validator.address_local", [raw_local_address(rng) for _ in range(size)],
+             lambda v: ServerBase.normalize_and_validate_address(v, None)),
+        Case("validator.partner_portal_id", [raw_partner_portal_id(rng) for _ in range(size)],
+             ServerBase.extract_and_validate_partner_id),
+        Case("create.company", [_create_payload(row) for row in companies], schemas.CompanyCreate.model_validate),
+        Case("create.server_cloud", [_create_payload(row) for row in cloud_servers], schemas.ServerCreate.model_validate),
+        Case("create.server_lifetime", [_create_payload(row) for row in lifetime_servers],
+             schemas.ServerCreate.model_validate),
+        Case("create.point", [_create_payload(row) for row in points], schemas.PointCreate.model_validate),
+        Case("create.workstation", [_create_payload(row) for row in workstations],
+             schemas.WorkstationCreate.model_validate),
+        Case("create.fiscal_registrar", [_create_payload(row) for row in registrars],
+             schemas.FiscalRegistrarCreate.model_validate),
+    ]
+    # Для чтения адреса берутся уже нормализованные, как они лежат в БД
+    stored_servers = [
+        Server(**{**row, "address": ServerBase.normalize_and_validate_address(row["address"], None),
+                  "partner_portal_id": ServerBase.extract_and_validate_partner_id(row["partner_portal_id"])},
+               **_stamps(rng))
+        for row in servers
+    ]
+    cases += _read_case("company", schemas.CompanyRead, [Company(**row, **_stamps(rng)) for row in companies])
+    cases += _read_case("server", schemas.ServerRead, stored_servers)
+    cases += _read_case("point", schemas.PointRead, [Point(**row, **_stamps(rng)) for row in points])
+    cases += _read_case(
+        "workstation", schemas.WorkstationRead, [Workstation(**row, **_stamps(rng)) for row in workstations],
+    )
+    cases += _read_case(
+        "fiscal_registrar", schemas.FiscalRegistrarRead, [FiscalRegistrar(**row, **_stamps(rng)) for row in registrars],
+    )
+    return cases
+
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    """Время одной операции в микросекундах по прогонам всего списка входов."""
+    op = case.op
+    for value in case.inputs: # Прогрев: ленивые инициализации pydantic и кеши re/urllib
+        op(value)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for value in case.inputs:
+            op(value)
+        timings.append((time.perf_counter() - started) * 1e6 / len(case.inputs))
+    return {"min_us": round(min(timings), 3), "median_us": round(statistics.median(timings), 3)}
+
+
+def check(results: Dict[str, Dict[str, float]], thresholds: Dict[str, float]) -> List[str]:
+    problems = []
+    for name, result in results.items():
+        limit = thresholds.get(name)
+        if limit is None:
+            problems.append(f"{name}: no threshold (run with --update-thresholds)")
+        elif result["min_us"] > limit:
+            problems.append(f"{name}: {result['min_us']:.2f} us/op > threshold {limit:.2f} us/op")
+    return problems
+
+
+def _load_thresholds(path: str) -> Dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)["max_us_per_op"]
+    except FileNotFoundError:
+        return {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Schema validation and serialization micro-benchmarks")
+    parser.add_argument("--size", type=int, default=1000, help="Inputs per case")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over the inputs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this substring")
+    parser.add_argument("--output", default=None, help="Write JSON report to this file")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="Thresholds file (max us/op per case)")
+    parser.add_argument("--update-thresholds", action="store_true",
+                        help="Rewrite the thresholds file from this run instead of checking it")
+    parser.add_argument("--headroom", type=float, default=3.0, help="Threshold = measured min * headroom")
+    args = parser.parse_args()
+
+    cases = [case for case in build_cases(args.size, args.seed) if not args.only or args.only in case.name]
+    results = {case.name: measure(case, args.repeat) for case in cases}
+
+    thresholds = _load_thresholds(args.thresholds)
+    if args.update_thresholds:
+        thresholds.update({name: round(result["min_us"] * args.headroom, 1) for name, result in results.items()})
+        with open(args.thresholds, "w") as f:
+            json.dump({"headroom": args.headroom, "max_us_per_op": dict(sorted(thresholds.items()))}, f, indent=2)
+            f.write("\n")
+        problems: List[str] = []
+    else:
+        problems = check(results, thresholds)
+
+    report: Dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "pydantic": pydantic.VERSION,
+        "size": args.size,
+        "repeat": args.repeat,
+        "cases": results,
+        "regressions": problems,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/seed.py
+# Генератор синтетических данных для нагрузочных бенчмарков (benchmarks/api_load.py).
+#
+# Запуск из корня проекта против БД с примененными миграциями (нужен .env, как для приложения):
+#     python -m benchmarks.seed --truncate
+#     python -m benchmarks.seed --truncate --scale 0.1        # 10% объема для быстрой проверки
+#     python -m benchmarks.seed --companies 1000 --points 5000 --seed 7
+#
+# По умолчанию: 10k компаний, 50k точек, 10k серверов, 200k рабочих станций, 300k ФР.
+# Данные детерминированы (--seed) и похожи на боевые: облачные и локальные серверы,
+# подключения Anydesk/TeamViewer/RDP, оборудование станций, сроки ФН вокруг сегодняшней даты
+# (генераторы строк - benchmarks/synthetic.py).
+# Уникальные поля (ИНН, iiko_uid, номера ФР) строятся из порядкового номера, поэтому
+# загружать нужно в пустую БД или с --truncate.
+#
+# Записи вставляются через Core пачками (--chunk), минуя ORM: история изменений
+# (entityrevision) и уведомления app/db/events.py для них не создаются.
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List
+
+from sqlalchemy import insert, text
+
+from app.db.session import engine
+from app.models.company import Company
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+from benchmarks.synthetic import company_row, fiscal_registrar_row, point_row, server_row, workstation_row
+
+DEFAULT_COUNTS = {
+    "companies": 10000,
+    "points": 50000,
+    "servers": 10000,
+    "workstations": 200000,
+    "fiscal_registrars": 300000,
+}
+
+TABLES = ["fiscalregistrar", "workstation", "point", "server", "company", "entityrevision"]
+
+
+def _rows(count: int, build: Callable[[int], Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield build(i)
+
+
+async def _insert(table, rows: Iterator[Dict[str, Any]], count: int, chunk: int) -> None:
+    started = time.perf_counter()
+    inserted = 0
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk:
+            async with engine.begin() as conn:
+                await conn.execute(insert(table), batch)
+            inserted += len(batch)
+            batch = []
+            print(f"  {table.name}: {inserted}/{count}", end="\r", flush=True)
+    if batch:
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), batch)
+        inserted += len(batch)
+    print(f"  {table.name}: {inserted} rows in {time.perf_counter() - started:.1f}s")
+
+
+async def seed(counts: Dict[str, int], seed_value: int, chunk: int, truncate: bool) -> None:
+    rng = random.Random(seed_value)
+    try:
+        if truncate:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"TRUNCATE {', '.join(TABLES)} CASCADE"))
+            print(f"Truncated {', '.join(TABLES)}")
+
+        companies = [company_row(rng, i) for i in range(counts["companies"])]
+        await _insert(Company.__table__, iter(companies), len(companies), chunk)
+        servers = [server_row(rng, i) for i in range(counts["servers"])]
+        await _insert(Server.__table__, iter(servers), len(servers), chunk)
+
+        company_ids = [row["id"] for row in companies]
+        server_ids = [row["id"] for row in servers]
+        points = [point_row(rng, i, company_ids, server_ids) for i in range(counts["points"])]
+        await _insert(Point.__table__, iter(points), len(points), chunk)
+
+        # Станции и ФР генерируются потоком: в памяти держатся только их ID
+        workstation_ids: List[uuid.UUID] = []
+
+        def workstation(i: int) -> Dict[str, Any]:
+            row = workstation_row(rng, i, points, server_ids)
+            workstation_ids.append(row["id"])
+            return row
+
+        await _insert(Workstation.__table__, _rows(counts["workstations"], workstation), counts["workstations"], chunk)
+        today = date.today()
+        await _insert(
+            FiscalRegistrar.__table__,
+            _rows(counts["fiscal_registrars"], lambda i: fiscal_registrar_row(rng, i, workstation_ids, today)),
+            counts["fiscal_registrars"],
+            chunk,
+        )
+        async with engine.begin() as conn:
+            await conn.execute(text(f"ANALYZE {', '.join(TABLES)}"))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database with a synthetic estate for benchmarks")
+    for name, default in DEFAULT_COUNTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all counts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (the same seed gives the same data)")
+    parser.add_argument("--chunk", type=int, default=5000, help="Rows per INSERT transaction")
+    parser.add_argument("--truncate", action="store_true", help="Empty the entity tables first")
+    args = parser.parse_args()
+
+    counts = {name: max(1, int(getattr(args, name) * args.scale)) for name in DEFAULT_COUNTS}
+    started = time.perf_counter()
+    asyncio.run(seed(counts, args.seed, args.chunk, args.truncate))
+    print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/serialization.py
+# Сравнение JSON с msgpack / CBOR (app/api/codecs.py) на типичных ответах массовых эндпоинтов:
+# время кодирования и декодирования и размер тела.
+#
+# Запуск из корня проекта (БД не нужна, данные синтетические):
+#     python -m benchmarks.serialization
+#     python -m benchmarks.serialization --repeat 20 --scale 2 --output serialization.json
+#
+# Кодирование меряется от валидированной модели ответа до байтов:
+#   - json_fastapi - как по умолчанию отдает FastAPI (jsonable_encoder + json.dumps),
+#   - json_pydantic - model_dump_json() (используется для кеша пакетов сервера),
+#   - msgpack / cbor - model_dump() + кодек (если библиотека установлена).
+# Декодирование - разбор тела в простые значения, без валидации схемой.
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from app import schemas
+from app.api.codecs import CODECS
+from app.models.fiscal_registrar import FiscalRegistrar
+from app.models.point import Point
+from app.models.server import Server
+from app.models.workstation import Workstation
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _stamps(i: int) -> Dict[str, Any]:
+    return {"revision": 1 + i % 7, "created_at": NOW - timedelta(days=i % 900), "updated_at": NOW - timedelta(minutes=i)}
+
+
+def bundle_payload(scale: int) -> Any:
+    """
+    Пакет сервера (GET /servers/by-uid/{iiko_uid}/bundle): 50 точек, 200 станций, 200 ФР на единицу scale.
+    Собирается, как в app/api/bundle.py, из ORM-объектов - так заодно проверяется,
+    что схемы пакета валидируются из моделей таблиц.
+    """
+    server = Server(id=uuid.uuid4(), name="Main RMS", iiko_uid="123-456-789",
+                    address="https://main.iiko.it/resto", connection_details=None, **_stamps(0))
+    points = [
+        Point(id=uuid.uuid4(), name=f"Point {i}", address=f"Street {i}, building {i % 40}",
+              company_id=uuid.uuid4(), server_id=server.id, **_stamps(i))
+        for i in range(50 * scale)
+    ]
+    workstations = [
+        Workstation(id=uuid.uuid4(), name=f"POS-{i}", point_id=points[i % len(points)].id, server_id=server.id,
+                    connection_details=[{"type": "Anydesk", "id": f"{100000000 + i}"}],
+                    extra_equipment={"scanner": "Honeywell 1450g"}, **_stamps(i))
+        for i in range(200 * scale)
+    ]
+    fiscal_registrars = [
+        FiscalRegistrar(id=uuid.uuid4(), model="ATOL 30F", serial_number=f"{10000000 + i}",
+                        registration_number=f"{1000000000000000 + i}", fiscal_drive_number=f"{9960440300000000 + i}",
+                        fiscal_drive_expiry_date=date(2027, 1, 1) + timedelta(days=i % 365),
+                        last_registration_date=NOW - timedelta(days=i % 365),
+                        workstation_id=workstations[i].id, **_stamps(i))
+        for i in range(200 * scale)
+    ]
+    return schemas.ServerBundle.model_validate({
+        "revision": 7, "server": server, "points": points,
+        "workstations": workstations, "fiscal_registrars": fiscal_registrars,
+    })
+
+
+def batch_get_payload(scale: int) -> Any:
+    """Ответ POST /workstations/batch-get на 500 ID на единицу scale."""
+    items = [
+        {"id": uuid.uuid4(), "name": f"POS-{i}", "point_id": uuid.uuid4(), "server_id": uuid.uuid4(),
+         "connection_details": [{"type": "RDP", "id": f"10.0.{i % 250}.{i % 200}"}], **_stamps(i)}
+        for i in range(500 * scale)
+    ]
+    return schemas.BatchGetResult[schemas.WorkstationRead].model_validate({"items": items, "missing": [uuid.uuid4()]})
+
+
+def reconcile_payload(scale: int) -> Any:
+    """Ответ POST /sync/reconcile: 100k ID на единицу scale."""
+    ids = [uuid.uuid4() for _ in range(100000 * scale)]
+    third = len(ids) // 3
+    return schemas.ReconcileResponse(new=ids[:third], changed=ids[third:2 * third], deleted=ids[2 * third:])
+
+
+PAYLOADS: Dict[str, Callable[[int], Any]] = {
+    "bundle": bundle_payload,
+    "batch_get": batch_get_payload,
+    "reconcile": reconcile_payload,
+}
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"min_ms": min(timings), "median_ms": statistics.median(timings)}
+
+
+def measure(model: Any, repeat: int) -> Dict[str, Any]:
+    encoders: Dict[str, Callable[[], bytes]] = {
+        "json_fastapi": lambda: json.dumps(jsonable_encoder(model)).encode(),
+        "json_pydantic": lambda: model.model_dump_json().encode(),
+    }
+    decoders: Dict[str, Callable[[bytes], Any]] = {"json_fastapi": json.loads, "json_pydantic": json.loads}
+    for media_type, codec in CODECS.items():
+        name = media_type.split("/")[1]
+        encoders[name] = lambda codec=codec: codec.encode(model.model_dump())
+        decoders[name] = codec.decode
+
+    report = {}
+    for name, encode in encoders.items():
+        body = encode()
+        report[name] = {
+            "bytes": len(body),
+            "encode": _timed(encode, repeat),
+            "decode": _timed(lambda: decoders[name](body), repeat),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON vs msgpack/CBOR serialization benchmark")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--scale", type=int, default=1, help="Multiply payload sizes")
+    parser.add_argument("--output", default=None, help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    if not CODECS:
+        print("Neither msgpack nor cbor2 is installed: only JSON is measured")
+    report = {
+        "codecs": sorted(CODECS),
+        "payloads": {name: measure(build(args.scale), args.repeat) for name, build in PAYLOADS.items()},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/startup.py
+# Бенчмарк холодного старта: время импорта app.main и время до первого успешного запроса.
+#
+# Запуск из корня проекта (нужен .env или переменные окружения, как для приложения):
+#     python -m benchmarks.startup --runs 5 --output startup.json
+#     python -m benchmarks.startup --path /api/v1/servers/ --token <JWT>
+#
+# Время до первого запроса измеряется на реальном uvicorn в отдельном процессе:
+# от запуска процесса до первого ответа 2xx, то есть включает импорт, lifespan
+# (прогрев пула, построение OpenAPI) и сам запрос.
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure_import(runs: int) -> list[float]:
+    """Каждый прогон - новый интерпретатор, чтобы не было кеша модулей."""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(path: str, token: str | None, timeout: float) -> float:
+    port = _free_port()
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", headers=headers) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    response = client.get(path)
+                    if response.is_success:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+                time.sleep(0.01)
+        raise TimeoutError(f"No successful response from {path} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "runs": len(values),
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/", help="Path requested as the first request")
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated paths")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", default=None, help="Write JSON report to this file")
+    args = parser.parse_args()
+
+    report = {
+        "import_seconds": _summary(measure_import(args.runs)),
+        "first_request_seconds": _summary(
+            [measure_first_request(args.path, args.token, args.timeout) for _ in range(args.runs)]
+        ),
+        "path": args.path,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# benchmarks/synthetic.py
+# Генераторы синтетических, но похожих на боевые данных для бенчмарков:
+# строки таблиц для benchmarks/seed.py и "сырой" пользовательский ввод
+# (адреса серверов, ссылки партнерского портала) для benchmarks/schemas.py.
+# Все функции принимают random.Random, чтобы данные были воспроизводимы.
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.models.enums import ConnectionType, LicenseType, ServerType
+
+LEGAL_FORMS = ["ООО", "ИП", "АО", "ПАО"]
+NAME_WORDS = ["Восток", "Гурман", "Вкусно", "Пицца", "Суши", "Кофе", "Бургер", "Пекарня", "Трапеза", "Шашлык"]
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Екатеринбург", "Новосибирск", "Самара", "Краснодар"]
+STREETS = ["Ленина", "Мира", "Советская", "Гагарина", "Пушкина", "Садовая", "Невский пр."]
+FR_MODELS = ["АТОЛ 30Ф", "АТОЛ 55Ф", "Штрих-М-01Ф", "Эвотор СТ2Ф", "Меркурий-185Ф"]
+EQUIPMENT = {
+    "scanner": ["Honeywell 1450g", "Zebra DS2208", "Mertech 2310"],
+    "printer": ["Epson TM-T20", "Star TSP143", "Xprinter XP-365B"],
+    "scale": ["CAS AP-1", "Масса-К ВТ"],
+    "display": ["Posiflex PD-2800"],
+}
+CLOUD_DOMAINS = [".iiko.it", ".syrve.online"]
+
+
+def random_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def iiko_uid(i: int) -> str:
+    """Уникальный iiko_uid формата XXX-XXX-XXX для порядкового номера."""
+    return f"{i // 1000000 % 1000:03d}-{i // 1000 % 1000:03d}-{i % 1000:03d}"
+
+
+def local_ip(rng: random.Random) -> str:
+    return f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+
+def connection_entry(rng: random.Random) -> Dict[str, Any]:
+    kind = rng.choices(
+        [ConnectionType.ANYDESK, ConnectionType.TEAMVIEWER, ConnectionType.RDP, ConnectionType.LITEMANAGER, ConnectionType.OTHER],
+        weights=[50, 25, 15, 7, 3],
+    )[0]
+    if kind == ConnectionType.ANYDESK:
+        return {"type": kind.value, "id": str(rng.randrange(100000000, 2000000000))}
+    if kind == ConnectionType.TEAMVIEWER:
+        return {"type": kind.value, "id": str(rng.randrange(100000000, 2000000000)), "password": f"{rng.getrandbits(32):08x}"}
+    if kind == ConnectionType.RDP:
+        return {"type": kind.value, "host": local_ip(rng), "port": 3389, "login": "Администратор"}
+    if kind == ConnectionType.LITEMANAGER:
+        return {"type": kind.value, "id": str(rng.randrange(10000, 999999))}
+    return {"type": kind.value, "comment": "VPN через роутер клиента"}
+
+
+def connection_details(rng: random.Random) -> List[Dict[str, Any]]:
+    return [connection_entry(rng) for _ in range(rng.choice((1, 1, 1, 2)))]
+
+
+def extra_equipment(rng: random.Random) -> Optional[Dict[str, Any]]:
+    if rng.random() < 0.4:
+        return None
+    kinds = rng.sample(sorted(EQUIPMENT), rng.randint(1, 3))
+    return {kind: rng.choice(EQUIPMENT[kind]) for kind in kinds}
+
+
+def company_row(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "id": random_uuid(rng),
+        "name": f"{rng.choice(LEGAL_FORMS)} «{rng.choice(NAME_WORDS)} {i}»",
+        "billing_inn": f"{7700000000 + i}", # 10 цифр, как у юрлица
+        "iiko_inn": f"{500100000000 + i}", # 12 цифр
+    }
+
+
+def server_row(rng: random.Random, i: int) -> Dict[str, Any]:
+    lifetime = rng.random() < 0.3
+    if lifetime:
+        address = f"http://{local_ip(rng)}:{rng.choice((8080, 8080, 9080))}/resto"
+    else:
+        address = f"https://rest-{i}{rng.choice(CLOUD_DOMAINS)}/resto"
+    server_type = ServerType.RMS if rng.random() < 0.85 else ServerType.CHAIN
+    return {
+        "id": random_uuid(rng),
+        "name": f"{rng.choice(NAME_WORDS)} {i} {server_type.value}",
+        "server_type": server_type,
+        "iiko_uid": iiko_uid(i),
+        "license_type": LicenseType.LIFETIME if lifetime else LicenseType.CLOUD,
+        "address": address,
+        "connection_details": connection_details(rng) if lifetime else None,
+        "partner_portal_id": str(rng.randrange(1000000, 9999999)) if rng.random() < 0.6 else None,
+    }
+
+
+def point_row(rng: random.Random, i: int, company_ids: List[uuid.UUID], server_ids: List[uuid.UUID]) -> Dict[str, Any]:
+    return {
+        "id": random_uuid(rng),
+        "name": f"{rng.choice(NAME_WORDS)} на {rng.choice(STREETS)} #{i}",
+        "address": f"г. {rng.choice(CITIES)}, ул. {rng.choice(STREETS)}, д. {rng.randint(1, 200)}",
+        "company_id": rng.choice(company_ids),
+        "server_id": rng.choice(server_ids) if rng.random() < 0.9 else None,
+    }
+
+
+def workstation_row(rng: random.Random, i: int, points: List[Dict[str, Any]], server_ids: List[uuid.UUID]) -> Dict[str, Any]:
+    point = rng.choice(points)
+    return {
+        "id": random_uuid(rng),
+        "name": f"{rng.choice(('POS', 'Касса', 'Менеджер'))}-{i}",
+        "connection_details": connection_details(rng),
+        "extra_equipment": extra_equipment(rng),
+        "point_id": point["id"],
+        "server_id": point["server_id"] or rng.choice(server_ids),
+    }
+
+
+def fiscal_registrar_row(rng: random.Random, i: int, workstation_ids: List[uuid.UUID], today: date) -> Dict[str, Any]:
+    registered = datetime.now(timezone.utc) - timedelta(days=rng.randint(0, 1000))
+    return {
+        "id": random_uuid(rng),
+        "model": rng.choice(FR_MODELS),
+        "serial_number": f"00{i:012d}",
+        "registration_number": f"{i:010d}{rng.randrange(10 ** 6):06d}" if rng.random() < 0.95 else None,
+        "registered_entity_name": f"{rng.choice(LEGAL_FORMS)} «{rng.choice(NAME_WORDS)}»",
+        "fiscal_drive_number": f"99604403{i:08d}" if rng.random() < 0.95 else None,
+        "last_registration_date": registered,
+        # Сроки ФН вокруг сегодняшней даты, чтобы отчеты по истечению были не пустыми
+        "fiscal_drive_expiry_date": today + timedelta(days=rng.randint(-60, 480)),
+        "workstation_id": rng.choice(workstation_ids),
+    }
+
+
+# --- Сырой ввод (как его присылают клиенты и файлы импорта) ---
+
+def raw_cloud_address(rng: random.Random, i: int) -> str:
+    """Адрес облачного сервера в одном из встречающихся написаний: со схемой и без, с портом, путем, в другом регистре."""
+    host = f"rest-{i}{rng.choice(CLOUD_DOMAINS)}"
+    return rng.choice((
+        f"https://{host}/resto",
+        f"https://{host}/resto/",
+        f"{host}:443/resto",
+        f"  {host.upper()}  ",
+        f"http://{host}:443",
+        host,
+    ))
+
+
+def raw_local_address(rng: random.Random) -> str:
+    """Адрес локального RMS: IP или имя хоста, с портом или без, с /resto или без."""
+    host = local_ip(rng) if rng.random() < 0.8 else f"rms-{rng.randrange(1000)}.local"
+    return rng.choice((
+        host,
+        f"{host}:{rng.choice((8080, 9080))}",
+        f"http://{host}:8080/resto",
+        f"{host}:9080/resto/",
+    ))
+
+
+def raw_partner_portal_id(rng: random.Random) -> str:
+    """ID партнерского портала: просто цифры или скопированная из браузера ссылка с clientId."""
+    client_id = str(rng.randrange(1000000, 9999999))
+    return rng.choice((
+        client_id,
+        f" {client_id} ",
+        f"https://partners.iiko.ru/ru/clients/card/?clientId={client_id}",
+        f"https://partners.iiko.ru/ru/clients/card/?tab=licenses&clientId={client_id}&lang=ru",
+    ))